@@ -0,0 +1,182 @@
+import asyncio
+import time
+from fastapi import FastAPI, WebSocket
+from pydantic import BaseModel, create_model
+from starlette.types import ASGIApp, Message, Scope
+from typing import Any, Dict, List, Tuple, Type, Union
+
+
+async def receive() -> Message:
+    return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+
+async def send(message: Message) -> None:
+    pass
+
+
+def build_scope(path: str, method: str = 'GET') -> Scope:
+    return {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'root_path': '',
+        'query_string': b'',
+        'headers': [],
+        'server': ('test', 80),
+        'client': ('test', 1234),
+    }
+
+
+def build_route_path(route_index: int, num_path_params: int) -> str:
+    return f'/resource{route_index}' + ''.join(f'/{{param{i}}}' for i in range(num_path_params))
+
+
+def build_request_path(version_prefix: str, route_index: int, num_path_params: int) -> str:
+    return f'{version_prefix}/resource{route_index}' + ''.join(f'/{i}' for i in range(num_path_params))
+
+
+async def call_asgi(app: ASGIApp, scope: Scope) -> Tuple[int, bytes]:
+    """
+    Calls the given ASGI app and returns the response's status and body
+    """
+
+    status = 0
+    body_parts: List[bytes] = []
+
+    async def capture_send(message: Message) -> None:
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif message['type'] == 'http.response.body':
+            body_parts.append(message.get('body', b''))
+
+    await app(dict(scope), receive, capture_send)
+    return status, b''.join(body_parts)
+
+
+def build_synthetic_model(name: str, num_fields: int, depth: int) -> Type[BaseModel]:
+    """
+    Builds a model with the given number of fields, plus a nested model down to the given depth
+    """
+
+    fields: Dict[str, Any] = {f'field{i}': (Union[int, str, None], None) for i in range(num_fields)}
+    if depth > 0:
+        child_model = build_synthetic_model(name=f'{name}Child', num_fields=num_fields, depth=depth - 1)
+        fields['child'] = (List[child_model], [])  # type: ignore
+    return create_model(name, **fields)
+
+
+def build_synthetic_app(
+    num_versions: int,
+    num_routes: int,
+    num_path_params: int = 0,
+    num_websocket_routes: int = 0,
+    num_model_fields: int = 0,
+    model_depth: int = 0,
+    num_changed_routes: Union[int, None] = None,
+    **versionizer_kwargs: Any
+) -> Tuple[FastAPI, Dict[str, Any]]:
+    """
+    Builds (but does not version) an app with the given number of versions and routes.
+    Every route is introduced in v1 and, unless num_changed_routes is given (in which case only that many do),
+    gets a new handler in each version after that.
+    If num_model_fields is given, each handler has its own response model.
+    """
+
+    # Imported here so benchmarks can time the import separately, if needed
+    from fastapi_versionizer.versionizer import api_version
+
+    app = FastAPI()
+    for major in range(1, num_versions + 1):
+        for route_index in range(num_routes if major == 1 or num_changed_routes is None else num_changed_routes):
+            async def endpoint() -> None:
+                return None
+
+            endpoint.__name__ = f'get_resource{route_index}_v{major}'
+            response_model = build_synthetic_model(
+                name=f'Resource{route_index}V{major}',
+                num_fields=num_model_fields,
+                depth=model_depth
+            ) if num_model_fields else None
+            app.get(
+                build_route_path(route_index, num_path_params),
+                response_model=response_model
+            )(api_version(major)(endpoint))
+
+        for route_index in range(num_websocket_routes):
+            async def websocket_endpoint(websocket: WebSocket) -> None:
+                await websocket.close()
+
+            websocket_endpoint.__name__ = f'websocket{route_index}_v{major}'
+            app.websocket(f'/ws{route_index}')(api_version(major)(websocket_endpoint))
+
+    return app, {
+        'prefix_format': '/v{major}',
+        'semantic_version_format': '{major}',
+        **versionizer_kwargs
+    }
+
+
+def time_asgi_requests(app: ASGIApp, scope: Scope, num_requests: int) -> float:
+    """
+    Returns the mean time (in seconds) of calling the given ASGI app with the given scope
+    """
+
+    async def run() -> float:
+        # Warm up
+        for _ in range(min(num_requests, 100)):
+            await app(dict(scope), receive, send)
+
+        start = time.perf_counter()
+        for _ in range(num_requests):
+            await app(dict(scope), receive, send)
+        return (time.perf_counter() - start) / num_requests
+
+    return asyncio.run(run())
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    if not rows:
+        return ''
+
+    columns = list(rows[0].keys())
+    widths = {column: max(len(column), *(len(str(row[column])) for row in rows)) for column in columns}
+    lines = ['  '.join(column.ljust(widths[column]) for column in columns)]
+    for row in rows:
+        lines.append('  '.join(str(row[column]).ljust(widths[column]) for column in columns))
+    return '\n'.join(lines)
+
+
+def find_regressions(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    tolerance: float,
+    key_fields: List[str],
+    value_field: str = 'us_per_request',
+    key_defaults: Union[Dict[str, Any], None] = None
+) -> List[str]:
+    """
+    Returns a description of each result that is slower than its baseline result, beyond the given tolerance.
+    Key fields missing from a result (e.g. from a baseline recorded before they were added) take their default.
+    """
+
+    key_defaults = key_defaults or {}
+
+    def key(result: Dict[str, Any]) -> Any:
+        return tuple(result.get(field, key_defaults.get(field)) for field in key_fields)
+
+    baseline_by_key = {key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        baseline_result = baseline_by_key.get(key(result))
+        if baseline_result is None:
+            continue
+        if result[value_field] > baseline_result[value_field] * (1 + tolerance):
+            regressions.append(
+                f'{key(result)}: {value_field}={result[value_field]} > {baseline_result[value_field]} (baseline)'
+            )
+    return regressions
@@ -0,0 +1,65 @@
+"""
+Measures the per-request overhead of the per-version metrics.
+
+Usage: python -m benchmarks.metrics_overhead [--requests N]
+"""
+import argparse
+import asyncio
+import time
+from fastapi import FastAPI
+from starlette.types import Receive, Scope, Send
+from typing import Any, Union
+
+from benchmarks.common import build_scope, receive, send
+from fastapi_versionizer.metrics import MetricsMiddleware, VersionMetrics
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+
+async def _noop_app(scope: Scope, receive: Receive, send: Send) -> None:
+    pass
+
+
+def _build_app(metrics: Union[VersionMetrics, None]) -> FastAPI:
+    app = FastAPI()
+
+    @api_version(1)
+    @app.get('/items')
+    async def get_items() -> str:
+        return 'Ok'
+
+    Versionizer(app=app, prefix_format='/v{major}', metrics=metrics).versionize()
+    return app
+
+
+async def _time_requests(app: Any, scope: Scope, num_requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(num_requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / num_requests
+
+
+async def main(num_requests: int) -> None:
+    metrics = VersionMetrics()
+    wrapped_noop_app = MetricsMiddleware(
+        app=_noop_app,
+        metrics=metrics,
+        index_by_method={'GET': metrics.register(version='1', route='/items', method='GET')}
+    )
+    scope = build_scope('/v1/items')
+
+    noop_time = await _time_requests(_noop_app, scope, num_requests)
+    wrapped_noop_time = await _time_requests(wrapped_noop_app, scope, num_requests)
+    print(f'middleware overhead: {(wrapped_noop_time - noop_time) * 1e6:.3f} us/request')
+
+    app_time = await _time_requests(_build_app(metrics=None), scope, num_requests)
+    app_with_metrics_time = await _time_requests(_build_app(metrics=VersionMetrics()), scope, num_requests)
+    print(f'app without metrics: {app_time * 1e6:.3f} us/request')
+    print(f'app with metrics: {app_with_metrics_time * 1e6:.3f} us/request')
+    print(f'app overhead: {(app_with_metrics_time - app_time) * 1e6:.3f} us/request')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(num_requests=args.requests))
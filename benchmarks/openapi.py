@@ -0,0 +1,194 @@
+"""
+Measures OpenAPI generation time and output size, for synthetic apps with an increasing number of versions
+and increasingly complex models.
+
+Each configuration is measured for:
+- a per-version schema (i.e. "GET /v{major}/openapi.json"), cold and warm (i.e. repeated)
+- the root schema (i.e. FastAPI's app.openapi()), cold (schema cache cleared) and warm (cached)
+- the deduplicated root schema (i.e. deduplicate_main_openapi=True, without the "latest" alias), cold
+- concurrent requests for every version's schema
+
+Usage:
+    python -m benchmarks.openapi [--versions 1 10] [--routes 20] [--model-fields 5 20] [--model-depth 1]
+                                 [--changed-routes 20] [--concurrency 10] [--repeat 5]
+                                 [--json OUTPUT] [--compare BASELINE]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import sys
+import time
+from fastapi import FastAPI
+from typing import Any, Dict, List, Union
+
+from benchmarks.common import build_scope, build_synthetic_app, call_asgi, find_regressions, format_table
+from fastapi_versionizer.versionizer import Versionizer
+
+
+def _time_root_openapi(app: FastAPI, repeat: int, cold: bool) -> Dict[str, Any]:
+    times = []
+    size = 0
+    for _ in range(repeat):
+        if cold:
+            app.openapi_schema = None
+        start = time.perf_counter()
+        schema = app.openapi()
+        times.append(time.perf_counter() - start)
+        size = len(json.dumps(schema))
+    return {'ms': round(statistics.median(times) * 1e3, 3), 'bytes': size}
+
+
+async def _time_version_openapi(app: FastAPI, path: str, repeat: int) -> Dict[str, Any]:
+    scope = build_scope(path)
+    start = time.perf_counter()
+    _, body = await call_asgi(app, scope)
+    cold_time = time.perf_counter() - start
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, body = await call_asgi(app, scope)
+        times.append(time.perf_counter() - start)
+
+    return {
+        'cold_ms': round(cold_time * 1e3, 3),
+        'warm_ms': round(statistics.median(times) * 1e3, 3),
+        'bytes': len(body)
+    }
+
+
+async def _time_concurrent_openapi(app: FastAPI, paths: List[str], concurrency: int) -> Dict[str, Any]:
+    scopes = [build_scope(path) for path in paths]
+    requests = [scopes[i % len(scopes)] for i in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(call_asgi(app, scope) for scope in requests))
+    elapsed = time.perf_counter() - start
+    return {'ms': round(elapsed * 1e3, 3), 'requests_per_second': round(concurrency / elapsed, 1)}
+
+
+def benchmark_openapi(
+    num_versions: int,
+    num_routes: int,
+    num_model_fields: int,
+    model_depth: int,
+    num_changed_routes: Union[int, None],
+    concurrency: int,
+    repeat: int
+) -> List[Dict[str, Any]]:
+    app, versionizer_kwargs = build_synthetic_app(
+        num_versions=num_versions,
+        num_routes=num_routes,
+        num_model_fields=num_model_fields,
+        model_depth=model_depth,
+        num_changed_routes=num_changed_routes,
+        latest_prefix='/latest'
+    )
+    Versionizer(app=app, **versionizer_kwargs).versionize()
+    openapi_paths = [f'/v{major}/openapi.json' for major in range(1, num_versions + 1)]
+
+    config = {
+        'versions': num_versions,
+        'routes': num_routes,
+        'model_fields': num_model_fields,
+        'model_depth': model_depth,
+        'changed_routes': num_routes if num_changed_routes is None else num_changed_routes
+    }
+
+    async def run() -> List[Dict[str, Any]]:
+        version_result = await _time_version_openapi(app, openapi_paths[-1], repeat)
+        concurrent_result = await _time_concurrent_openapi(app, openapi_paths, concurrency)
+        cold_root_result = _time_root_openapi(app, repeat, cold=True)
+        warm_root_result = _time_root_openapi(app, repeat, cold=False)
+        return [
+            {**config, 'scenario': 'version_cold', 'ms': version_result['cold_ms'], 'bytes': version_result['bytes']},
+            {**config, 'scenario': 'version_warm', 'ms': version_result['warm_ms'], 'bytes': version_result['bytes']},
+            {**config, 'scenario': 'root_cold', **cold_root_result},
+            {**config, 'scenario': 'root_warm', **warm_root_result},
+            {
+                **config,
+                'scenario': f'version_concurrent_{concurrency}',
+                'ms': concurrent_result['ms'],
+                'bytes': version_result['bytes']
+            }
+        ]
+
+    results = asyncio.run(run())
+
+    deduplicated_app, versionizer_kwargs = build_synthetic_app(
+        num_versions=num_versions,
+        num_routes=num_routes,
+        num_model_fields=num_model_fields,
+        model_depth=model_depth,
+        num_changed_routes=num_changed_routes,
+        latest_prefix='/latest'
+    )
+    Versionizer(
+        app=deduplicated_app,
+        deduplicate_main_openapi=True,
+        include_latest_in_main_openapi=False,
+        **versionizer_kwargs
+    ).versionize()
+    results.append({
+        **config,
+        'scenario': 'root_deduplicated_cold',
+        **_time_root_openapi(deduplicated_app, repeat, cold=True)
+    })
+
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--versions', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--routes', type=int, nargs='+', default=[20])
+    parser.add_argument('--model-fields', type=int, nargs='+', default=[5, 20])
+    parser.add_argument('--model-depth', type=int, nargs='+', default=[1])
+    parser.add_argument(
+        '--changed-routes', type=int, help='Number of routes with a new handler in each version (default: all)')
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help='File to write the results to, as JSON')
+    parser.add_argument('--compare', help='JSON file, from a previous run, to compare the results against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown versus the baseline')
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    for num_versions, num_routes, num_model_fields, model_depth in itertools.product(
+        args.versions, args.routes, args.model_fields, args.model_depth
+    ):
+        results.extend(benchmark_openapi(
+            num_versions=num_versions,
+            num_routes=num_routes,
+            num_model_fields=num_model_fields,
+            model_depth=model_depth,
+            num_changed_routes=args.changed_routes,
+            concurrency=args.concurrency,
+            repeat=args.repeat
+        ))
+
+    print(format_table(results))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(
+            results=results,
+            baseline=baseline,
+            tolerance=args.tolerance,
+            key_fields=['versions', 'routes', 'model_fields', 'model_depth', 'changed_routes', 'scenario'],
+            value_field='ms'
+        )
+        if regressions:
+            print('\nRegressions:\n' + '\n'.join(regressions), file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Measures routing latency over ASGI, for synthetic versioned apps of increasing size.
+
+Each configuration is timed for a route in the first, middle and last version, in the "latest" alias,
+and for an unknown version (i.e. a 404), so the cost of each dispatch optimization can be compared.
+Versions are either included in the app's router, or mounted as sub-applications (--mount 1).
+
+Usage:
+    python -m benchmarks.routing [--versions 1 10 50] [--routes 10 50] [--path-params 0 2] [--websockets 0]
+                                 [--mount 0 1] [--requests N] [--json OUTPUT] [--compare BASELINE]
+                                 [--tolerance 0.25]
+"""
+import argparse
+import itertools
+import json
+import sys
+from typing import Any, Dict, List
+
+from benchmarks.common import (
+    build_request_path,
+    build_scope,
+    build_synthetic_app,
+    find_regressions,
+    format_table,
+    time_asgi_requests
+)
+from fastapi_versionizer.versionizer import Versionizer
+
+
+def benchmark_routing(
+    num_versions: int,
+    num_routes: int,
+    num_path_params: int,
+    num_websocket_routes: int,
+    mount_versions: bool,
+    num_requests: int
+) -> List[Dict[str, Any]]:
+    app, versionizer_kwargs = build_synthetic_app(
+        num_versions=num_versions,
+        num_routes=num_routes,
+        num_path_params=num_path_params,
+        num_websocket_routes=num_websocket_routes,
+        latest_prefix='/latest',
+        include_version_docs=False,
+        include_version_openapi_route=False
+    )
+    Versionizer(app=app, mount_versions=mount_versions, **versionizer_kwargs).versionize()
+
+    # The last route of each version is the worst case within that version
+    last_route_index = num_routes - 1
+    targets = {
+        'first': '/v1',
+        'middle': f'/v{(num_versions + 1) // 2}',
+        'last': f'/v{num_versions}',
+        'latest': '/latest',
+        'unknown': f'/v{num_versions + 1}'
+    }
+
+    results = []
+    for target, version_prefix in targets.items():
+        scope = build_scope(build_request_path(version_prefix, last_route_index, num_path_params))
+        # The router is called directly, so only routing (and a trivial endpoint) is timed
+        mean_time = time_asgi_requests(app=app.router, scope=scope, num_requests=num_requests)
+        results.append({
+            'versions': num_versions,
+            'routes': num_routes,
+            'path_params': num_path_params,
+            'websockets': num_websocket_routes,
+            'mounted': int(mount_versions),
+            'target': target,
+            'us_per_request': round(mean_time * 1e6, 3)
+        })
+
+    return results
+
+
+def add_scaling(results: List[Dict[str, Any]]) -> None:
+    """
+    Adds each result's cost relative to the smallest configuration for the same target
+    """
+
+    smallest: Dict[Any, float] = {}
+    for result in results:
+        smallest.setdefault((result['mounted'], result['target']), result['us_per_request'])
+    for result in results:
+        result['relative'] = round(result['us_per_request'] / smallest[(result['mounted'], result['target'])], 2)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--versions', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--routes', type=int, nargs='+', default=[10, 50])
+    parser.add_argument('--path-params', type=int, nargs='+', default=[0, 2])
+    parser.add_argument('--websockets', type=int, nargs='+', default=[0])
+    parser.add_argument('--mount', type=int, nargs='+', default=[0, 1], help='Whether versions are mounted (0 or 1)')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--json', help='File to write the results to, as JSON')
+    parser.add_argument('--compare', help='JSON file, from a previous run, to compare the results against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown versus the baseline')
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    for mount_versions, num_versions, num_routes, num_path_params, num_websocket_routes in itertools.product(
+        args.mount, args.versions, args.routes, args.path_params, args.websockets
+    ):
+        results.extend(benchmark_routing(
+            num_versions=num_versions,
+            num_routes=num_routes,
+            num_path_params=num_path_params,
+            num_websocket_routes=num_websocket_routes,
+            mount_versions=bool(mount_versions),
+            num_requests=args.requests
+        ))
+    add_scaling(results)
+
+    print(format_table(results))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(
+            results=results,
+            baseline=baseline,
+            tolerance=args.tolerance,
+            key_fields=['versions', 'routes', 'path_params', 'websockets', 'mounted', 'target'],
+            # Baselines recorded before versions could be mounted included them
+            key_defaults={'mounted': 0}
+        )
+        if regressions:
+            print('\nRegressions:\n' + '\n'.join(regressions), file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
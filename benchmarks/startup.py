@@ -0,0 +1,212 @@
+"""
+Measures the startup cost of versioning synthetic apps of increasing size.
+
+Each phase of Versionizer.__init__ and versionize() is timed separately, and the memory allocated
+(peak and retained, via tracemalloc) is recorded for each version.
+Timing and memory are measured in separate runs, since tracemalloc slows everything down.
+
+Usage:
+    python -m benchmarks.startup [--versions 1 10 50] [--routes 10 50] [--repeat 3]
+                                 [--json OUTPUT] [--compare BASELINE] [--tolerance 0.25]
+"""
+import argparse
+import itertools
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from fastapi import APIRouter
+from fastapi.routing import APIRoute, APIWebSocketRoute
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
+
+import fastapi_versionizer.versionizer
+from benchmarks.common import build_synthetic_app, find_regressions
+from fastapi_versionizer.versionizer import Versionizer
+
+PHASES = (
+    'init',
+    'strip_routes',
+    'versionize',
+    'get_routes_by_version',
+    'natsort',
+    'add_route_to_router',
+    'add_version_docs',
+    'include_version_router'
+)
+
+
+class _ProfiledVersionizer(Versionizer):
+    """
+    Versionizer that records the time spent in each phase and, if tracemalloc is running,
+    the memory allocated for each version
+    """
+
+    phase_times: Dict[str, float] = {}
+    version_memory: Dict[str, Dict[str, int]] = {}
+
+    @contextmanager
+    def _phase(self, phase: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[phase] = self.phase_times.get(phase, 0.0) + time.perf_counter() - start
+
+    def _strip_routes(self) -> None:
+        with self._phase('strip_routes'):
+            super()._strip_routes()
+
+    def _get_routes_by_version(
+        self
+    ) -> Dict[Tuple[int, int], Dict[Tuple[str, str], Union[APIRoute, APIWebSocketRoute]]]:
+        with self._phase('get_routes_by_version'):
+            return super()._get_routes_by_version()
+
+    def _build_version_router(
+        self,
+        version: Tuple[int, int],
+        version_prefix: str,
+        routes_by_key: Dict[Tuple[str, str], Union[APIRoute, APIWebSocketRoute]]
+    ) -> APIRouter:
+        if tracemalloc.is_tracing():
+            # Memory is measured from here until the version router has been included in the app
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            self.version_memory[version_prefix] = {'start_bytes': tracemalloc.get_traced_memory()[0]}
+
+        return super()._build_version_router(
+            version=version, version_prefix=version_prefix, routes_by_key=routes_by_key)
+
+    def _add_route_to_router(
+        self,
+        route: Union[APIRoute, APIWebSocketRoute],
+        router: APIRouter,
+        version: Tuple[int, int]
+    ) -> None:
+        with self._phase('add_route_to_router'):
+            return super()._add_route_to_router(route=route, router=router, version=version)
+
+    def _add_version_docs(self, router: APIRouter, version: Tuple[int, int], version_prefix: str) -> None:
+        with self._phase('add_version_docs'):
+            return super()._add_version_docs(router=router, version=version, version_prefix=version_prefix)
+
+    def _include_version_router(self, router: APIRouter, version: Tuple[int, int], version_prefix: str) -> None:
+        with self._phase('include_version_router'):
+            super()._include_version_router(router=router, version=version, version_prefix=version_prefix)
+
+        memory = self.version_memory.get(version_prefix)
+        if memory is not None and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            start_bytes = memory.pop('start_bytes')
+            memory['peak_bytes'] = peak - start_bytes
+            memory['retained_bytes'] = current - start_bytes
+
+
+@contextmanager
+def _timed_natsort() -> Iterator[None]:
+    natsorted = getattr(fastapi_versionizer.versionizer, 'natsorted')
+
+    def timed_natsorted(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return natsorted(*args, **kwargs)
+        finally:
+            phase_times = _ProfiledVersionizer.phase_times
+            phase_times['natsort'] = phase_times.get('natsort', 0.0) + time.perf_counter() - start
+
+    setattr(fastapi_versionizer.versionizer, 'natsorted', timed_natsorted)
+    try:
+        yield
+    finally:
+        setattr(fastapi_versionizer.versionizer, 'natsorted', natsorted)
+
+
+def _run_once(build_app: Callable[[], Tuple[Any, Dict[str, Any]]]) -> Dict[str, float]:
+    app, versionizer_kwargs = build_app()
+    _ProfiledVersionizer.phase_times = {}
+    with _timed_natsort():
+        start = time.perf_counter()
+        versionizer = _ProfiledVersionizer(app=app, **versionizer_kwargs)
+        _ProfiledVersionizer.phase_times['init'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        versionizer.versionize()
+        _ProfiledVersionizer.phase_times['versionize'] = time.perf_counter() - start
+
+    return dict(_ProfiledVersionizer.phase_times)
+
+
+def benchmark_startup(num_versions: int, num_routes: int, repeat: int) -> Dict[str, Any]:
+    def build_app() -> Tuple[Any, Dict[str, Any]]:
+        return build_synthetic_app(
+            num_versions=num_versions,
+            num_routes=num_routes,
+            latest_prefix='/latest',
+            sort_routes=True
+        )
+
+    runs = [_run_once(build_app) for _ in range(repeat)]
+    phase_ms = {
+        phase: round(statistics.median(run.get(phase, 0.0) for run in runs) * 1e3, 3)
+        for phase in PHASES
+    }
+
+    _ProfiledVersionizer.version_memory = {}
+    tracemalloc.start()
+    try:
+        _run_once(build_app)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'versions': num_versions,
+        'routes': num_routes,
+        'total_ms': round(phase_ms['init'] + phase_ms['versionize'], 3),
+        'phase_ms': phase_ms,
+        'memory_by_version': dict(_ProfiledVersionizer.version_memory)
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--versions', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--routes', type=int, nargs='+', default=[10, 50])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help='File to write the results to, as JSON (defaults to stdout)')
+    parser.add_argument('--compare', help='JSON file, from a previous run, to compare the results against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown versus the baseline')
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = [
+        benchmark_startup(num_versions=num_versions, num_routes=num_routes, repeat=args.repeat)
+        for num_versions, num_routes in itertools.product(args.versions, args.routes)
+    ]
+
+    output = json.dumps(results, indent=2)
+    if args.json:
+        with open(args.json, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(
+            results=results,
+            baseline=baseline,
+            tolerance=args.tolerance,
+            key_fields=['versions', 'routes'],
+            value_field='total_ms'
+        )
+        if regressions:
+            print('\nRegressions:\n' + '\n'.join(regressions), file=sys.stderr)
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
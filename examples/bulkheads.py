@@ -0,0 +1,61 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+import asyncio
+from fastapi import FastAPI, APIRouter
+
+from fastapi_versionizer.bulkheads import Bulkhead
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+# v1's slow reports can only use one slot, and one more request can wait for it
+v1_bulkhead = Bulkhead(max_concurrent=1, max_queued=1)
+# v2 requests wait at most 50ms for a slot
+v2_bulkhead = Bulkhead(max_concurrent=1, max_queued=1, queue_timeout=0.05, retry_after=None)
+
+app = FastAPI(
+    title='test',
+    docs_url='/swagger',
+    openapi_url='/api_schema.json',
+    redoc_url=None
+)
+items_router = APIRouter(
+    prefix='/items',
+    tags=['Items']
+)
+reports_router = APIRouter(
+    prefix='/reports',
+    tags=['Reports']
+)
+
+
+@api_version(1)
+@items_router.get('/{item_id}')
+async def get_item(item_id: int) -> str:
+    return f'Item {item_id}'
+
+
+@api_version(1)
+@reports_router.get('')
+async def get_report() -> str:
+    await asyncio.sleep(0.2)
+    return 'Report'
+
+
+@api_version(2)
+@items_router.get('/{item_id}')
+async def get_item_v2(item_id: int) -> str:
+    return f'Item {item_id} (v2)'
+
+
+app.include_router(items_router)
+app.include_router(reports_router)
+
+versions = Versionizer(
+    app=app,
+    prefix_format='/v{major}',
+    semantic_version_format='{major}',
+    latest_prefix='/latest',
+    include_version_docs=False,
+    include_version_openapi_route=False,
+    bulkheads={(1, 0): v1_bulkhead, (2, 0): v2_bulkhead}
+).versionize()
@@ -0,0 +1,103 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+import asyncio
+from typing import Dict, List, Tuple, Union
+from fastapi import FastAPI, APIRouter, HTTPException, Response
+from pydantic import BaseModel
+
+from fastapi_versionizer.caching import CacheStore, api_cache
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class ItemV2(BaseModel):
+    id: int
+    name: str
+    cost: int
+
+
+class ExternalCacheStore(CacheStore):
+    """
+    Stand-in for an external store (e.g. Redis) shared between workers
+    """
+
+    def __init__(self) -> None:
+        self.values: Dict[str, Tuple[bytes, float]] = {}
+
+    async def get(self, key: str) -> Union[bytes, None]:
+        value = self.values.get(key)
+        return value[0] if value else None
+
+    async def put(self, key: str, value: bytes, ttl: float) -> None:
+        self.values[key] = (value, ttl)
+
+
+items = {1: ItemV2(id=1, name='laptop', cost=100)}
+calls: Dict[str, int] = {'get_items': 0, 'get_items_v2': 0, 'get_item': 0, 'get_item_offers': 0}
+# Offers are specific to each client, so they must not be shared through the cache
+offers_cache_control = 'private, max-age=60'
+cache_store = ExternalCacheStore()
+app = FastAPI(
+    title='test',
+    docs_url='/swagger',
+    openapi_url='/api_schema.json',
+    redoc_url=None
+)
+items_router = APIRouter(
+    prefix='/items',
+    tags=['Items']
+)
+
+
+@api_version(1)
+@api_cache(ttl=60, vary=['Accept-Language'])
+@items_router.get('')
+async def get_items() -> List[Item]:
+    calls['get_items'] += 1
+    await asyncio.sleep(0.05)
+    return [Item(id=item.id, name=item.name) for item in items.values()]
+
+
+@api_version(1)
+@api_cache(ttl=30)
+@items_router.get('/{item_id}')
+def get_item(item_id: int) -> Item:
+    calls['get_item'] += 1
+    if item_id not in items:
+        raise HTTPException(status_code=404)
+    return Item(id=item_id, name=items[item_id].name)
+
+
+@api_version(1)
+@api_cache(ttl=60)
+@items_router.get('/{item_id}/offers')
+def get_item_offers(item_id: int, client_token: str, response: Response) -> List[str]:
+    calls['get_item_offers'] += 1
+    # Handlers can opt out of the shared cache, e.g. when clients are identified by something other than headers
+    response.headers['Cache-Control'] = offers_cache_control
+    return [f'Offer on item {item_id} for {client_token}']
+
+
+@api_version(2)
+@api_cache(ttl=60, vary=['Accept-Language'])
+@items_router.get('')
+def get_items_v2() -> List[ItemV2]:
+    calls['get_items_v2'] += 1
+    return list(items.values())
+
+
+app.include_router(items_router)
+
+versions = Versionizer(
+    app=app,
+    prefix_format='/v{major}',
+    semantic_version_format='{major}',
+    latest_prefix='/latest',
+    sort_routes=True,
+    cache_store=cache_store
+).versionize()
@@ -0,0 +1,92 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+from typing import List
+from fastapi import FastAPI, APIRouter
+from pydantic import BaseModel
+
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class User(BaseModel):
+    id: int
+    name: str
+
+
+class UserV2(BaseModel):
+    id: int
+    name: str
+    age: int
+
+
+app = FastAPI(
+    title='test',
+    docs_url=None,
+    redoc_url=None
+)
+items_router = APIRouter(
+    prefix='/items',
+    tags=['Items']
+)
+users_router = APIRouter(
+    prefix='/users',
+    tags=['Users']
+)
+
+
+@api_version(1)
+@items_router.get('')
+def get_items() -> List[Item]:
+    return [Item(id=1, name='laptop')]
+
+
+@api_version(1)
+@items_router.get('/{item_id}')
+def get_item(item_id: int) -> Item:
+    return Item(id=item_id, name='laptop')
+
+
+@api_version(1)
+@users_router.get('')
+def get_users() -> List[User]:
+    return [User(id=1, name='alex')]
+
+
+@api_version(1)
+@users_router.post('')
+def create_user(user: User) -> User:
+    return user
+
+
+@api_version(2)
+@users_router.get('')
+def get_users_v2() -> List[UserV2]:
+    return [UserV2(id=1, name='alex', age=30)]
+
+
+@api_version(3)
+@items_router.delete('/{item_id}')
+def delete_item(item_id: int) -> None:
+    return None
+
+
+app.include_router(items_router)
+app.include_router(users_router)
+
+versions = Versionizer(
+    app=app,
+    prefix_format='/v{major}',
+    semantic_version_format='{major}',
+    latest_prefix='/latest',
+    include_version_docs=False,
+    include_version_openapi_route=False,
+    include_versions_route=True,
+    # Paths that are the same in several versions are only generated once, and the "latest" alias is left out
+    deduplicate_main_openapi=True,
+    include_latest_in_main_openapi=False
+).versionize()
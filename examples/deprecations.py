@@ -0,0 +1,61 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+from datetime import datetime, timezone
+from fastapi import FastAPI, APIRouter
+
+from fastapi_versionizer.deprecation import DeprecationTelemetry
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+deprecation_telemetry = DeprecationTelemetry(max_clients_per_route=2, client_header='X-Client-Id')
+app = FastAPI(
+    title='test',
+    docs_url='/swagger',
+    openapi_url='/api_schema.json',
+    redoc_url=None
+)
+items_router = APIRouter(
+    prefix='/items',
+    tags=['Items']
+)
+
+
+@api_version(1, deprecate_in_major=2, remove_in_major=3)
+@items_router.get('')
+def get_items() -> str:
+    return 'Items'
+
+
+@api_version(1)
+@items_router.get('/legacy', deprecated=True)
+def get_legacy_items() -> str:
+    return 'Legacy items'
+
+
+@api_version(1)
+@items_router.get('/{item_id}')
+def get_item(item_id: int) -> str:
+    return f'Item {item_id}'
+
+
+@api_version(3)
+@items_router.get('/{item_id}')
+def get_item_v3(item_id: int) -> str:
+    return f'Item {item_id} (v3)'
+
+
+app.include_router(items_router)
+
+versions = Versionizer(
+    app=app,
+    prefix_format='/v{major}',
+    semantic_version_format='{major}',
+    include_version_docs=False,
+    include_version_openapi_route=False,
+    deprecation_telemetry=deprecation_telemetry,
+    include_deprecations_route=True,
+    include_deprecation_headers=True,
+    deprecation_dates={(1, 0): datetime(2026, 1, 1, tzinfo=timezone.utc)},
+    sunset_dates={(3, 0): datetime(2027, 1, 1, tzinfo=timezone.utc)},
+    deprecation_link='https://example.com/migration-guide'
+).versionize()
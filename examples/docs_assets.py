@@ -0,0 +1,57 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+from typing import List
+from fastapi import FastAPI, APIRouter
+from pydantic import BaseModel
+
+from fastapi_versionizer import DocsAssets
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class ItemV2(BaseModel):
+    id: int
+    name: str
+    cost: int
+
+
+app = FastAPI(
+    title='test'
+)
+items_router = APIRouter(
+    prefix='/items',
+    tags=['Items']
+)
+
+
+@api_version(1)
+@items_router.get('')
+def get_items() -> List[Item]:
+    return [Item(id=1, name='laptop')]
+
+
+@api_version(2)
+@items_router.get('')
+def get_items_v2() -> List[ItemV2]:
+    return [ItemV2(id=1, name='laptop', cost=100)]
+
+
+app.include_router(items_router)
+
+# These are stand-ins. In practice, copy the files from the "swagger-ui-dist" and "redoc" npm packages,
+# or load them from an installed Python package with DocsAssets.from_package().
+# The favicon is missing here, so it is still loaded from the default CDN.
+docs_assets = DocsAssets.from_directory('examples/docs_assets', url_prefix='/docs-assets')
+
+versions = Versionizer(
+    app=app,
+    prefix_format='/v{major}',
+    semantic_version_format='{major}',
+    latest_prefix='/latest',
+    docs_assets=docs_assets
+).versionize()
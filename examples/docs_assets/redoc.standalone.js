@@ -0,0 +1,2 @@
+/* Stand-in for redoc/bundles/redoc.standalone.js */
+window.Redoc = {};
@@ -0,0 +1,2 @@
+/* Stand-in for swagger-ui-dist/swagger-ui-standalone-preset.js */
+window.SwaggerUIStandalonePreset = {};
@@ -0,0 +1,95 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+import asyncio
+from typing import AsyncIterator, Dict, List
+from fastapi import FastAPI, APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class ItemV2(BaseModel):
+    id: int
+    name: str
+    cost: int
+
+
+items: Dict[int, ItemV2] = {1: ItemV2(id=1, name='laptop', cost=100)}
+app = FastAPI(
+    title='test',
+    docs_url='/swagger',
+    openapi_url='/api_schema.json',
+    redoc_url=None
+)
+items_router = APIRouter(
+    prefix='/items',
+    tags=['Items']
+)
+events_router = APIRouter(
+    prefix='/events',
+    tags=['Events']
+)
+
+
+@api_version(1)
+@items_router.get('')
+def get_items() -> List[Item]:
+    return [Item(id=item.id, name=item.name) for item in items.values()]
+
+
+@api_version(1)
+@items_router.get('/{item_id}')
+def get_item(item_id: int, response: Response) -> Item:
+    if item_id not in items:
+        raise HTTPException(status_code=404)
+
+    # Routes can supply their own ETag, e.g. from a row version, instead of it being computed from the body
+    response.headers['ETag'] = f'"item-{item_id}-{items[item_id].cost}"'
+    return Item(id=item_id, name=items[item_id].name)
+
+
+@api_version(1)
+@items_router.post('')
+def create_item(item: ItemV2) -> ItemV2:
+    items[item.id] = item
+    return item
+
+
+@api_version(1)
+@events_router.get('')
+async def get_events() -> StreamingResponse:
+    async def stream_events() -> AsyncIterator[str]:
+        # Event streams never end, so they are sent as they go rather than buffered to compute an ETag
+        event_id = 0
+        while True:
+            event_id += 1
+            yield f'id: {event_id}\ndata: {{}}\n\n'
+            await asyncio.sleep(0.01)
+
+    return StreamingResponse(stream_events(), media_type='text/event-stream')
+
+
+@api_version(2)
+@items_router.get('')
+def get_items_v2() -> List[ItemV2]:
+    return list(items.values())
+
+
+app.include_router(items_router)
+app.include_router(events_router)
+
+versions = Versionizer(
+    app=app,
+    prefix_format='/v{major}',
+    semantic_version_format='{major}',
+    latest_prefix='/latest',
+    sort_routes=True,
+    etag_versions=[(1, 0)]
+).versionize()
@@ -0,0 +1,64 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+from typing import List
+from fastapi import FastAPI, APIRouter, WebSocket
+from pydantic import BaseModel
+
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+app = FastAPI(
+    title='test',
+    docs_url=None,
+    redoc_url=None,
+    openapi_url=None
+)
+items_router = APIRouter(
+    prefix='/items',
+    tags=['Items']
+)
+
+
+@api_version(1, remove_in_major=3)
+@items_router.get('')
+def get_items() -> List[Item]:
+    return [Item(id=1, name='laptop')]
+
+
+@api_version(1, remove_in_major=3)
+@items_router.get('/{item_id}')
+def get_item(item_id: int) -> Item:
+    return Item(id=item_id, name='laptop')
+
+
+@api_version(2)
+@items_router.post('')
+def create_item(item: Item) -> Item:
+    return item
+
+
+@api_version(3)
+@items_router.websocket('/updates')
+async def get_item_updates(websocket: WebSocket) -> None:
+    await websocket.accept()
+    await websocket.send_json({'id': 1, 'name': 'laptop'})
+    await websocket.close()
+
+
+app.include_router(items_router)
+
+# Its route table can be rendered for a gateway, e.g.:
+# fastapi-versionizer gateway examples.gateway:versionizer --format nginx --version-upstream /v1=legacy_pool
+versionizer = Versionizer(
+    app=app,
+    prefix_format='/v{major}',
+    semantic_version_format='{major}',
+    include_versions_route=True
+)
+versions = versionizer.versionize()
@@ -0,0 +1,45 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+from fastapi import FastAPI, APIRouter
+
+from fastapi_versionizer.metrics import VersionMetrics
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+metrics = VersionMetrics(buckets=(0.1, 1.0))
+app = FastAPI(
+    title='test',
+    docs_url='/swagger',
+    openapi_url='/api_schema.json',
+    redoc_url=None
+)
+items_router = APIRouter(
+    prefix='/items',
+    tags=['Items']
+)
+
+
+@api_version(1)
+@items_router.get('/{item_id}')
+def get_item(item_id: int) -> str:
+    return f'Item {item_id}'
+
+
+@api_version(2)
+@items_router.get('/{item_id}')
+async def get_item_v2(item_id: int) -> str:
+    return f'Item {item_id} (v2)'
+
+
+app.include_router(items_router)
+
+versions = Versionizer(
+    app=app,
+    prefix_format='/v{major}',
+    semantic_version_format='{major}',
+    latest_prefix='/latest',
+    include_version_docs=False,
+    include_version_openapi_route=False,
+    metrics=metrics,
+    include_metrics_route=True
+).versionize()
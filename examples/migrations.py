@@ -0,0 +1,88 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+from typing import List, Any, Dict
+from fastapi import FastAPI, APIRouter
+from pydantic import BaseModel
+
+from fastapi_versionizer.migrations import api_migration
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    nickname: str
+
+
+class UserV2(BaseModel):
+    id: int
+    full_name: str
+    age: int
+
+
+class DB:
+    def __init__(self) -> None:
+        self.users: Dict[int, Any] = {}
+
+
+db = DB()
+app = FastAPI(
+    title='test',
+    docs_url='/swagger',
+    openapi_url='/api_schema.json',
+    redoc_url=None
+)
+users_router = APIRouter(
+    prefix='/users',
+    tags=['Users']
+)
+
+
+@api_version(2)
+@api_migration(1, drop=['age'], rename={'full_name': 'name'}, defaults={'nickname': ''}, response_model=List[User])
+@users_router.get('')
+def get_users() -> List[UserV2]:
+    return list(db.users.values())
+
+
+@api_version(2)
+@api_migration(1, drop=['age'], rename={'full_name': 'name'}, defaults={'nickname': ''}, response_model=User)
+@users_router.get('/{user_id}')
+async def get_user(user_id: int) -> UserV2:
+    return db.users[user_id]
+
+
+@api_version(2)
+@api_migration(1, drop=['age'], rename={'full_name': 'name'}, defaults={'nickname': ''}, response_model=User)
+@users_router.get('/{user_id}/record', response_model=UserV2)
+def get_user_record(user_id: int) -> Dict[str, Any]:
+    # Records are returned as stored, including fields outside the response model
+    return {**dict(db.users[user_id]), 'password': 'secret'}
+
+
+@api_version(2)
+@api_migration(
+    1,
+    drop=['age'],
+    rename={'full_name': 'name'},
+    defaults={'nickname': ''},
+    response_model=User,
+    request_model=User,
+    request_converter=lambda user: UserV2(id=user.id, full_name=user.name, age=0)
+)
+@users_router.post('')
+def create_user(user: UserV2) -> UserV2:
+    db.users[user.id] = user
+    return user
+
+
+app.include_router(users_router)
+
+versions = Versionizer(
+    app=app,
+    prefix_format='/v{major}',
+    semantic_version_format='{major}',
+    latest_prefix='/latest',
+    sort_routes=True
+).versionize()
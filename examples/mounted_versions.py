@@ -0,0 +1,86 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+from typing import Awaitable, Callable, List
+from fastapi import FastAPI, APIRouter, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class ItemV2(BaseModel):
+    id: int
+    name: str
+    cost: int
+
+
+class ItemNotFound(Exception):
+    pass
+
+
+app = FastAPI(
+    title='test',
+    redoc_url=None,
+    # Router settings apply to every version's sub-application too
+    redirect_slashes=False
+)
+items_router = APIRouter(
+    prefix='/items',
+    tags=['Items']
+)
+
+
+@app.exception_handler(ItemNotFound)
+async def handle_item_not_found(request: Request, exc: ItemNotFound) -> JSONResponse:
+    return JSONResponse(status_code=404, content={'detail': 'Item not found'})
+
+
+@api_version(1)
+@items_router.get('')
+def get_items() -> List[Item]:
+    return [Item(id=1, name='laptop')]
+
+
+@api_version(1)
+@items_router.get('/{item_id}')
+def get_item(item_id: int) -> Item:
+    if item_id != 1:
+        raise ItemNotFound()
+    return Item(id=1, name='laptop')
+
+
+@api_version(2)
+@items_router.get('')
+def get_items_v2() -> List[ItemV2]:
+    return [ItemV2(id=1, name='laptop', cost=100)]
+
+
+app.include_router(items_router)
+
+versionizer = Versionizer(
+    app=app,
+    prefix_format='/v{major}',
+    semantic_version_format='{major}',
+    latest_prefix='/latest',
+    include_versions_route=True,
+    # Each version is served by its own sub-application, mounted at its prefix
+    mount_versions=True
+)
+versions = versionizer.versionize()
+
+# Middleware can be added to a single version
+v1_app = versionizer.get_version_app('/v1')
+assert v1_app is not None
+
+
+@v1_app.middleware('http')
+async def add_sunset_header(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+    response = await call_next(request)
+    response.headers['Sunset'] = 'Wed, 31 Dec 2025 23:59:59 GMT'
+    return response
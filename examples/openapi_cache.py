@@ -0,0 +1,67 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+import os
+import tempfile
+from enum import Enum
+from typing import List, Tuple
+from fastapi import FastAPI, APIRouter
+from pydantic import BaseModel
+
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+# Shared by every worker on the host, and kept across deploys
+OPENAPI_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'fastapi_versionizer_examples', 'openapi_cache')
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class Category(Enum):
+    HARDWARE = 'hardware'
+    SOFTWARE = 'software'
+
+
+class ItemV2(BaseModel):
+    id: int
+    name: str
+    cost: int
+    category: Category = Category.HARDWARE
+
+
+def create_app(openapi_cache_dir: str = OPENAPI_CACHE_DIR) -> Tuple[FastAPI, List[Tuple[int, int]]]:
+    app = FastAPI(
+        title='test',
+        redoc_url=None
+    )
+    items_router = APIRouter(
+        prefix='/items',
+        tags=['Items']
+    )
+
+    @api_version(1)
+    @items_router.get('')
+    def get_items() -> List[Item]:
+        return [Item(id=1, name='laptop')]
+
+    @api_version(2)
+    @items_router.get('')
+    def get_items_v2() -> List[ItemV2]:
+        return [ItemV2(id=1, name='laptop', cost=100)]
+
+    app.include_router(items_router)
+
+    versions = Versionizer(
+        app=app,
+        prefix_format='/v{major}',
+        semantic_version_format='{major}',
+        # Versions whose routes have not changed since a schema was stored load it, instead of regenerating it
+        openapi_cache_dir=openapi_cache_dir
+    ).versionize()
+
+    return app, versions
+
+
+app, versions = create_app()
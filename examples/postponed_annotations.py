@@ -0,0 +1,57 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+from __future__ import annotations
+
+from fastapi import FastAPI, APIRouter
+from pydantic import BaseModel
+
+from fastapi_versionizer.migrations import api_migration
+from fastapi_versionizer.threadpools import VersionThreadPool
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class LegacyItem(Item):
+    legacy: bool
+
+
+app = FastAPI(
+    title='test',
+    docs_url='/swagger',
+    openapi_url='/api_schema.json',
+    redoc_url=None
+)
+items_router = APIRouter(
+    prefix='/items',
+    tags=['Items']
+)
+
+
+@api_version(1)
+@items_router.post('')
+def create_item(item: Item) -> Item:
+    return item
+
+
+@api_version(2)
+@api_migration(1, defaults={'legacy': True}, response_model=LegacyItem)
+@items_router.put('/{item_id}')
+def update_item(item_id: int, item: Item) -> Item:
+    return item
+
+
+app.include_router(items_router)
+
+versions = Versionizer(
+    app=app,
+    prefix_format='/v{major}',
+    semantic_version_format='{major}',
+    include_version_docs=False,
+    include_version_openapi_route=False,
+    threadpools={(2, 0): VersionThreadPool(name='items', total_tokens=2)}
+).versionize()
@@ -0,0 +1,60 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+import os
+import tempfile
+from typing import List, Tuple
+from fastapi import FastAPI, APIRouter
+from pydantic import BaseModel
+
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+# Shared by every worker on the host
+SHARED_STORE_DIR = os.path.join(tempfile.gettempdir(), 'fastapi_versionizer_examples', 'shared_store')
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class ItemV2(BaseModel):
+    id: int
+    name: str
+    cost: int
+
+
+def create_app(shared_store_dir: str = SHARED_STORE_DIR) -> Tuple[FastAPI, List[Tuple[int, int]]]:
+    app = FastAPI(
+        title='test'
+    )
+    items_router = APIRouter(
+        prefix='/items',
+        tags=['Items']
+    )
+
+    @api_version(1)
+    @items_router.get('')
+    def get_items() -> List[Item]:
+        return [Item(id=1, name='laptop')]
+
+    @api_version(2)
+    @items_router.get('')
+    def get_items_v2() -> List[ItemV2]:
+        return [ItemV2(id=1, name='laptop', cost=100)]
+
+    app.include_router(items_router)
+
+    versions = Versionizer(
+        app=app,
+        prefix_format='/v{major}',
+        semantic_version_format='{major}',
+        include_versions_route=True,
+        # Schemas and docs pages are written once to a file in this directory, which every worker maps into memory
+        shared_store_dir=shared_store_dir
+    ).versionize()
+
+    return app, versions
+
+
+app, versions = create_app()
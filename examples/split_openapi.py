@@ -0,0 +1,93 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+from typing import List
+from typing_extensions import Annotated
+from fastapi import FastAPI, APIRouter, Depends
+from fastapi.security import OAuth2PasswordBearer
+from pydantic import BaseModel
+
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class Order(BaseModel):
+    id: int
+    items: List[Item]
+
+
+class v1:
+    class User(BaseModel):
+        id: int
+        name: str
+
+
+class v2:
+    # Has the same name as v1's model, so each version keeps its own
+    class User(BaseModel):
+        id: int
+        name: str
+        age: int
+
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/token')
+
+app = FastAPI(
+    title='test',
+    redoc_url=None
+)
+items_router = APIRouter(
+    prefix='/items',
+    tags=['Items']
+)
+orders_router = APIRouter(
+    prefix='/orders',
+    tags=['Orders']
+)
+users_router = APIRouter(
+    prefix='/users',
+    tags=['Users']
+)
+
+
+@api_version(1)
+@items_router.get('')
+def get_items() -> List[Item]:
+    return [Item(id=1, name='laptop')]
+
+
+@api_version(1)
+@orders_router.get('')
+def get_orders(token: Annotated[str, Depends(oauth2_scheme)]) -> List[Order]:
+    return [Order(id=1, items=[Item(id=1, name='laptop')])]
+
+
+@api_version(1)
+@users_router.get('')
+def get_users() -> List[v1.User]:
+    return [v1.User(id=1, name='alex')]
+
+
+@api_version(2)
+@users_router.get('')
+def get_users_v2() -> List[v2.User]:
+    return [v2.User(id=1, name='alex', age=30)]
+
+
+app.include_router(items_router)
+app.include_router(orders_router)
+app.include_router(users_router)
+
+versions = Versionizer(
+    app=app,
+    prefix_format='/v{major}',
+    semantic_version_format='{major}',
+    include_main_docs=False,
+    include_main_openapi_route=False,
+    # Shared models are served once, at "/openapi.components.{digest}.json"
+    split_version_openapi=True
+).versionize()
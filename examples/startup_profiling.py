@@ -0,0 +1,50 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+import time
+from typing import Tuple
+from fastapi import FastAPI, APIRouter
+
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+app = FastAPI(
+    title='test',
+    docs_url='/swagger',
+    openapi_url='/api_schema.json',
+    redoc_url=None
+)
+items_router = APIRouter(
+    prefix='/items',
+    tags=['Items']
+)
+
+
+@api_version(1)
+@items_router.get('')
+def get_items() -> str:
+    return 'Items'
+
+
+@api_version(2)
+@items_router.get('/{item_id}')
+def get_item(item_id: int) -> str:
+    return f'Item {item_id}'
+
+
+def callback(router: APIRouter, version: Tuple[int, int], version_prefix: str) -> None:
+    # Simulates an expensive callback in v2
+    if version_prefix == '/v2':
+        time.sleep(0.05)
+
+
+app.include_router(items_router)
+
+versionizer = Versionizer(
+    app=app,
+    prefix_format='/v{major}',
+    semantic_version_format='{major}',
+    latest_prefix='/latest',
+    callback=callback,
+    profile_startup=True
+)
+versions = versionizer.versionize()
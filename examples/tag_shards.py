@@ -0,0 +1,82 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+from typing import List
+from fastapi import FastAPI, APIRouter
+from pydantic import BaseModel
+
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class User(BaseModel):
+    id: int
+    name: str
+
+
+app = FastAPI(
+    title='test',
+    openapi_tags=[
+        {'name': 'Users', 'description': 'Manage users'},
+        {'name': 'Items', 'description': 'Manage items'},
+        {'name': 'Orders', 'description': 'Manage orders'}
+    ]
+)
+items_router = APIRouter(
+    prefix='/items',
+    tags=['Items']
+)
+users_router = APIRouter(
+    prefix='/users',
+    tags=['Users']
+)
+admin_router = APIRouter(
+    prefix='/admin/users',
+    tags=['Admin/Users']
+)
+
+
+@app.get('/status')
+def get_status() -> str:
+    return 'Ok'
+
+
+@api_version(1)
+@items_router.get('')
+def get_items() -> List[Item]:
+    return [Item(id=1, name='laptop')]
+
+
+@api_version(1)
+@items_router.post('')
+def create_item(item: Item) -> Item:
+    return item
+
+
+@api_version(2)
+@users_router.get('')
+def get_users() -> List[User]:
+    return [User(id=1, name='alex')]
+
+
+@api_version(2)
+@admin_router.delete('/{user_id}')
+def delete_user(user_id: int) -> None:
+    return None
+
+
+app.include_router(items_router)
+app.include_router(users_router)
+app.include_router(admin_router)
+
+versions = Versionizer(
+    app=app,
+    prefix_format='/v{major}',
+    semantic_version_format='{major}',
+    # e.g. "GET /v2/openapi/tags.json" and "GET /v2/openapi/tags/Users.json"
+    shard_version_openapi_by_tag=True
+).versionize()
@@ -0,0 +1,69 @@
+# mypy: disable-error-code="no-any-return"
+# flake8: noqa: A003
+
+import time
+from fastapi import FastAPI, APIRouter
+
+from fastapi_versionizer.metrics import VersionMetrics
+from fastapi_versionizer.threadpools import VersionThreadPool
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+# v1 and v2 share a single thread, so their blocking reports can't starve v3
+legacy_threadpool = VersionThreadPool(name='legacy', total_tokens=1)
+current_threadpool = VersionThreadPool(name='current', total_tokens=5)
+
+app = FastAPI(
+    title='test',
+    docs_url='/swagger',
+    openapi_url='/api_schema.json',
+    redoc_url=None
+)
+items_router = APIRouter(
+    prefix='/items',
+    tags=['Items']
+)
+reports_router = APIRouter(
+    prefix='/reports',
+    tags=['Reports']
+)
+
+
+@api_version(1)
+@items_router.get('/{item_id}')
+def get_item(item_id: int) -> str:
+    return f'Item {item_id}'
+
+
+@api_version(3)
+@items_router.get('/{item_id}')
+def get_item_v3(item_id: int) -> str:
+    return f'Item {item_id} (v3)'
+
+
+@api_version(1)
+@reports_router.get('')
+def get_report() -> str:
+    time.sleep(0.2)
+    return 'Report'
+
+
+@api_version(2)
+@reports_router.get('/summary')
+def get_report_summary() -> str:
+    return 'Summary'
+
+
+app.include_router(items_router)
+app.include_router(reports_router)
+
+versions = Versionizer(
+    app=app,
+    prefix_format='/v{major}',
+    semantic_version_format='{major}',
+    latest_prefix='/latest',
+    include_version_docs=False,
+    include_version_openapi_route=False,
+    metrics=VersionMetrics(),
+    include_metrics_route=True,
+    threadpools={(1, 0): legacy_threadpool, (2, 0): legacy_threadpool, (3, 0): current_threadpool}
+).versionize()
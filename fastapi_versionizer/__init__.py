@@ -1,6 +1,22 @@
+from .bulkheads import Bulkhead
+from .caching import CacheStore, LRUCacheStore, api_cache
+from .deprecation import DeprecationTelemetry
+from .docs import DocsAssets
+from .metrics import VersionMetrics
+from .migrations import api_migration
+from .threadpools import VersionThreadPool
 from .versionizer import Versionizer, api_version
 
 __all__ = [
+    'Bulkhead',
+    'CacheStore',
+    'DeprecationTelemetry',
+    'DocsAssets',
+    'LRUCacheStore',
+    'VersionMetrics',
+    'VersionThreadPool',
     'Versionizer',
+    'api_cache',
+    'api_migration',
     'api_version'
 ]
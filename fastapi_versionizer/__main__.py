@@ -0,0 +1,5 @@
+import sys
+
+from fastapi_versionizer.cli import main
+
+sys.exit(main())
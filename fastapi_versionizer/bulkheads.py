@@ -0,0 +1,123 @@
+import anyio
+from collections import deque
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Deque, Union
+
+
+class Bulkhead:
+    """
+    Concurrency limit shared by every route of a version (and its "latest" alias, if any).
+
+    Up to max_concurrent requests run at once, up to max_queued more wait (in order) for one of them to finish,
+    and any others are rejected straight away. Waiting requests are also rejected after queue_timeout seconds.
+    State is only changed on the event loop thread, so no locks are needed.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queued: int = 0,
+        queue_timeout: Union[float, None] = None,
+        retry_after: Union[int, None] = 1
+    ):
+        """
+        :param max_concurrent:
+            Maximum number of requests handled at once
+        :param max_queued:
+            Maximum number of requests waiting for a slot. Requests beyond this are rejected immediately.
+        :param queue_timeout:
+            Maximum number of seconds a request waits for a slot, before being rejected.
+            If this is None, requests wait as long as needed.
+        :param retry_after:
+            Value of the "Retry-After" header (in seconds) of rejected requests. If this is None, it is left out.
+        """
+        if max_concurrent < 1:
+            raise ValueError('max_concurrent must be at least 1')
+        if max_queued < 0:
+            raise ValueError('max_queued must not be negative')
+
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.rejection_response = JSONResponse(
+            content={'detail': 'Service Unavailable'},
+            status_code=503,
+            headers={'Retry-After': str(retry_after)} if retry_after is not None else None
+        )
+        self._active = 0
+        self._waiters: Deque[anyio.Event] = deque()
+        self._rejected = 0
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def rejected(self) -> int:
+        return self._rejected
+
+    async def acquire(self) -> bool:
+        """
+        Waits for a slot, if needed and allowed
+
+        :returns: whether a slot was acquired (if so, release() must be called afterwards)
+        """
+
+        if self._active < self.max_concurrent:
+            self._active += 1
+            return True
+
+        if len(self._waiters) >= self.max_queued:
+            self._rejected += 1
+            return False
+
+        event = anyio.Event()
+        self._waiters.append(event)
+        try:
+            with anyio.move_on_after(self.queue_timeout):
+                await event.wait()
+        except BaseException:
+            # The slot may have been handed over just before the request was cancelled
+            if event.is_set():
+                self.release()
+            else:
+                self._waiters.remove(event)
+            raise
+
+        if event.is_set():
+            return True
+
+        self._waiters.remove(event)
+        self._rejected += 1
+        return False
+
+    def release(self) -> None:
+        # Slots are handed over to the next waiting request directly, so it can't be overtaken
+        if self._waiters:
+            self._waiters.popleft().set()
+        else:
+            self._active -= 1
+
+
+class BulkheadMiddleware:
+    """
+    ASGI wrapper around a single versioned route, which limits it to the concurrency of its version's bulkhead
+    """
+
+    def __init__(self, app: ASGIApp, bulkhead: Bulkhead):
+        self._app = app
+        self._bulkhead = bulkhead
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not await self._bulkhead.acquire():
+            return await self._bulkhead.rejection_response(scope, receive, send)
+
+        try:
+            await self._app(scope, receive, send)
+        finally:
+            self._bulkhead.release()
@@ -0,0 +1,342 @@
+import asyncio
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple, TypeVar, Union
+
+CallableT = TypeVar('CallableT', bound=Callable[..., Any])
+
+
+class _CacheSettings(NamedTuple):
+    ttl: float
+    vary: Tuple[str, ...]
+
+
+def api_cache(ttl: float, vary: Union[Sequence[str], None] = None) -> Callable[[CallableT], CallableT]:
+    """
+    Annotates a GET route as cacheable, in every version it is available in.
+    Cached responses are keyed by version, path, query string and the given request headers.
+    """
+
+    def decorator(func: CallableT) -> CallableT:
+        func._api_cache = _CacheSettings(  # type: ignore
+            ttl=ttl,
+            vary=tuple(header.lower() for header in vary or ())
+        )
+        return func
+
+    return decorator
+
+
+class CacheStore(ABC):
+    """
+    Interface for the store backing the response cache.
+    Implement this to use an external store (e.g. Redis, Memcached) shared between workers.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Union[bytes, None]:
+        """
+        Returns the value stored for the given key, or None if it is missing or expired
+        """
+
+    @abstractmethod
+    async def put(self, key: str, value: bytes, ttl: float) -> None:
+        """
+        Stores the given value, which should expire after ttl seconds
+        """
+
+
+class LRUCacheStore(CacheStore):
+    """
+    In-memory store, bounded by the total size of its values.
+    The least recently used values are evicted first.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self._max_bytes = max_bytes
+        self._num_bytes = 0
+        self._entries: 'OrderedDict[str, Tuple[float, bytes]]' = OrderedDict()
+
+    async def get(self, key: str) -> Union[bytes, None]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def put(self, key: str, value: bytes, ttl: float) -> None:
+        if len(value) > self._max_bytes:
+            return
+
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._num_bytes += len(value)
+        while self._num_bytes > self._max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._num_bytes -= len(entry[1])
+
+
+def etag_matches(if_none_match: Union[bytes, None], etag: bytes) -> bool:
+    """
+    Returns whether the given If-None-Match header value matches the given ETag
+    """
+
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == b'*':
+        return True
+
+    # If-None-Match uses the weak comparison function
+    etag = etag[2:] if etag.startswith(b'W/') else etag
+    for candidate in if_none_match.split(b','):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith(b'W/') else candidate) == etag:
+            return True
+    return False
+
+
+def compute_etag(body: bytes) -> bytes:
+    """
+    Returns a strong ETag for the given body
+    """
+
+    return b'"' + hashlib.blake2b(body, digest_size=16).hexdigest().encode('latin-1') + b'"'
+
+
+class _CachedResponse(NamedTuple):
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+    def encode(self) -> bytes:
+        headers = [[name.decode('latin-1'), value.decode('latin-1')] for name, value in self.headers]
+        return json.dumps([self.status, headers]).encode('latin-1') + b'\n' + self.body
+
+    @classmethod
+    def decode(cls, value: bytes) -> '_CachedResponse':
+        meta, body = value.split(b'\n', 1)
+        status, headers = json.loads(meta)
+        return cls(
+            status=status,
+            headers=[(name.encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+            body=body
+        )
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI wrapper around a single versioned route, which caches its successful GET responses,
+    unless they set a cookie or their Cache-Control header forbids shared caching
+    """
+
+    # Requests with these headers are not cached, unless the route varies on them
+    _PRIVATE_HEADERS = (b'authorization', b'cookie')
+    # Responses with these Cache-Control directives are not cached (e.g. responses specific to a client)
+    _UNCACHEABLE_DIRECTIVES = {b'no-store', b'private', b'no-cache'}
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: CacheStore,
+        version: Tuple[int, int],
+        ttl: float,
+        vary: Sequence[str]
+    ):
+        self._app = app
+        self._store = store
+        self._ttl = ttl
+        self._key_prefix = f'{version[0]}.{version[1]}|'
+        self._vary = tuple(header.encode('latin-1') for header in vary)
+        self._vary_value = b', '.join(self._vary)
+        self._private_headers = tuple(header for header in self._PRIVATE_HEADERS if header not in self._vary)
+        self._inflight: Dict[str, 'asyncio.Future[Union[_CachedResponse, None]]'] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or scope['method'] != 'GET':
+            return await self._app(scope, receive, send)
+
+        headers: Dict[bytes, bytes] = dict(scope['headers'])
+        if any(header in headers for header in self._private_headers):
+            return await self._app(scope, receive, send)
+
+        key = self._build_key(scope=scope, headers=headers)
+        cached_value = await self._store.get(key)
+        if cached_value is not None:
+            return await self._send_cached(_CachedResponse.decode(cached_value), send)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            # Another request is already computing this response, so wait for it rather than stampeding
+            cached_response = await asyncio.shield(inflight)
+            if cached_response is not None:
+                return await self._send_cached(cached_response, send)
+            return await self._app(scope, receive, send)
+
+        future: 'asyncio.Future[Union[_CachedResponse, None]]' = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        cached_response = None
+        try:
+            cached_response = await self._call_and_capture(scope, receive, send)
+            if cached_response is not None:
+                await self._store.put(key, cached_response.encode(), self._ttl)
+        finally:
+            del self._inflight[key]
+            future.set_result(cached_response)
+
+    def _build_key(self, scope: Scope, headers: Dict[bytes, bytes]) -> str:
+        key = f'{self._key_prefix}{scope["path"]}?{scope["query_string"].decode("latin-1")}'
+        for header in self._vary:
+            key += f'|{headers.get(header, b"").decode("latin-1")}'
+        return key
+
+    async def _call_and_capture(self, scope: Scope, receive: Receive, send: Send) -> Union[_CachedResponse, None]:
+        start_message: Dict[str, Any] = {}
+        body_parts: List[bytes] = []
+
+        async def capture_send(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                start_message.update(message)
+                if self._vary:
+                    message['headers'] = self._add_vary(list(message.get('headers', ())))
+            elif message['type'] == 'http.response.body':
+                body_parts.append(message.get('body', b''))
+            await send(message)
+
+        await self._app(scope, receive, capture_send)
+
+        headers = list(start_message.get('headers', ()))
+        if start_message.get('status') != 200 or not self._is_cacheable(headers):
+            return None
+
+        return _CachedResponse(status=200, headers=headers, body=b''.join(body_parts))
+
+    def _is_cacheable(self, headers: List[Tuple[bytes, bytes]]) -> bool:
+        for name, value in headers:
+            name = name.lower()
+            if name == b'set-cookie':
+                return False
+            if name == b'cache-control':
+                # Directives can have arguments, e.g. 'private="set-cookie"'
+                directives = {directive.partition(b'=')[0].strip() for directive in value.lower().split(b',')}
+                if directives & self._UNCACHEABLE_DIRECTIVES:
+                    return False
+        return True
+
+    async def _send_cached(self, cached_response: _CachedResponse, send: Send) -> None:
+        headers = cached_response.headers
+        if self._vary:
+            headers = self._add_vary(list(headers))
+
+        await send({'type': 'http.response.start', 'status': cached_response.status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': cached_response.body})
+
+    def _add_vary(self, headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+        for i, (name, value) in enumerate(headers):
+            if name.lower() == b'vary':
+                headers[i] = (name, value + b', ' + self._vary_value)
+                return headers
+        headers.append((b'vary', self._vary_value))
+        return headers
+
+
+class ETagMiddleware:
+    """
+    ASGI wrapper around a single versioned route, which adds a strong ETag to its successful GET responses
+    and answers matching If-None-Match requests with 304 (Not Modified), without sending the body.
+    If the route sets its own ETag header, it is used instead of hashing the body.
+    Streamed responses (e.g. server-sent events) are passed through untouched, since they can't be buffered.
+    """
+
+    # Headers kept on 304 responses (https://www.rfc-editor.org/rfc/rfc9110#name-304-not-modified)
+    _NOT_MODIFIED_HEADERS = (b'cache-control', b'content-location', b'date', b'etag', b'expires', b'vary')
+
+    def __init__(self, app: ASGIApp):
+        self._app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or scope['method'] != 'GET':
+            return await self._app(scope, receive, send)
+
+        if_none_match = None
+        for name, value in scope['headers']:
+            if name == b'if-none-match':
+                if_none_match = value
+                break
+
+        start_message: Dict[str, Any] = {}
+        # The response start is held back until the ETag of the (single part) body is known,
+        # then either passed through or replaced by a 304
+        state = 'buffering'
+
+        async def etag_send(message: Message) -> None:
+            nonlocal state
+            if state == 'streaming':
+                return await send(message)
+            if state == 'not_modified':
+                return
+
+            if message['type'] == 'http.response.start':
+                start_message.update(message)
+                headers = list(message.get('headers', ()))
+                etag = self._get_header(headers, b'etag')
+                if message['status'] != 200 or etag is not None:
+                    # Either nothing to do, or the route supplied its own ETag so there is no need to buffer
+                    if etag is not None and message['status'] == 200 and etag_matches(if_none_match, etag):
+                        state = 'not_modified'
+                        return await self._send_not_modified(headers, send)
+                    state = 'streaming'
+                    return await send(message)
+                if self._get_header(headers, b'content-length') is None or (
+                    self._get_header(headers, b'content-type') or b''
+                ).startswith(b'text/event-stream'):
+                    # Streamed responses may never end, so they are not buffered
+                    state = 'streaming'
+                    return await send(message)
+                return
+
+            if message['type'] == 'http.response.body':
+                if message.get('more_body', False):
+                    # The body is sent in parts, so it is passed through rather than held back until the last one
+                    state = 'streaming'
+                    await send(start_message)
+                    return await send(message)
+
+                body = message.get('body', b'')
+                etag = compute_etag(body)
+                headers = list(start_message.get('headers', ()))
+                headers.append((b'etag', etag))
+                if etag_matches(if_none_match, etag):
+                    state = 'not_modified'
+                    return await self._send_not_modified(headers, send)
+
+                state = 'streaming'
+                await send({**start_message, 'headers': headers})
+                await send({'type': 'http.response.body', 'body': body})
+
+        await self._app(scope, receive, etag_send)
+
+    @staticmethod
+    def _get_header(headers: List[Tuple[bytes, bytes]], header: bytes) -> Union[bytes, None]:
+        for name, value in headers:
+            if name.lower() == header:
+                return value
+        return None
+
+    async def _send_not_modified(self, headers: List[Tuple[bytes, bytes]], send: Send) -> None:
+        headers = [(name, value) for name, value in headers if name.lower() in self._NOT_MODIFIED_HEADERS]
+        await send({'type': 'http.response.start', 'status': 304, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b''})
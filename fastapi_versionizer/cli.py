@@ -0,0 +1,246 @@
+"""
+Command-line tools for versioned apps.
+
+The target is given as "module:attribute", where the attribute is either a Versionizer or a function
+(without arguments) returning one. versionize() is called on it, if the module has not done so already.
+
+Usage:
+    fastapi-versionizer export TARGET --output DIR [--jobs N] [--no-gzip]
+    fastapi-versionizer gateway TARGET [--format json|nginx|envoy] [--upstream NAME]
+                                       [--version-upstream PREFIX=NAME ...] [--output FILE]
+"""
+import argparse
+import functools
+import gzip
+import importlib
+import inspect
+import json
+import os
+import posixpath
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Mapping, Sequence, Tuple, Union
+
+from fastapi_versionizer.caching import compute_etag
+from fastapi_versionizer.gateway import render_envoy_route_config, render_nginx_locations
+from fastapi_versionizer.versionizer import Versionizer
+
+_EXTENSIONS_BY_CONTENT_TYPE = {'application/json': '.json', 'text/html': '.html', 'text/plain': '.txt'}
+
+# Set in the main process, and in each worker process (inherited when forked, otherwise loaded again)
+_versionizer: Union[Versionizer, None] = None
+
+
+class TargetError(ValueError):
+    """
+    Raised when the target can't be resolved to a Versionizer
+    """
+
+
+def load_versionizer(target: str) -> Versionizer:
+    """
+    Imports the Versionizer given as "module:attribute" (the attribute defaults to "versionizer"),
+    and versions its app if needed
+    """
+
+    module_name, _, attribute = target.partition(':')
+    if not module_name:
+        raise TargetError(f'Invalid target "{target}", expected "module:attribute"')
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    try:
+        module = importlib.import_module(module_name)
+    except ModuleNotFoundError as e:
+        # Only the target's own module is reported as such, rather than modules missing from the app's imports
+        if e.name is None or not (module_name == e.name or module_name.startswith(e.name + '.')):
+            raise
+        raise TargetError(f'Module "{module_name}" of target "{target}" was not found') from e
+
+    attribute = attribute or 'versionizer'
+    if not hasattr(module, attribute):
+        raise TargetError(f'Module "{module_name}" has no attribute "{attribute}"')
+
+    versionizer = getattr(module, attribute)
+    # Only factories are called, as other callables (e.g. the app itself) aren't meant to be called here
+    if inspect.isroutine(versionizer) or isinstance(versionizer, functools.partial):
+        versionizer = versionizer()
+    if not isinstance(versionizer, Versionizer):
+        raise TargetError(f'"{target}" is not a Versionizer, nor a function returning one')
+
+    versionizer.versionize()
+    return versionizer
+
+
+def export_artifacts(
+    target: str,
+    output_dir: str,
+    jobs: Union[int, None] = None,
+    compress: bool = True
+) -> Dict[str, Any]:
+    """
+    Writes every response of the given app that can be computed ahead of time (i.e. the schemas, docs pages
+    and versions route) to the given directory, along with the route plan and a manifest of the files written.
+    Version schemas are rendered in parallel, in separate processes, unless they are generated together
+    (i.e. split into shared components) or already rendered (e.g. loaded from the OpenAPI cache).
+
+    :returns: the manifest
+    """
+
+    global _versionizer
+    _versionizer = load_versionizer(target)
+    route_plan = _versionizer.get_route_plan()
+    version_prefixes = [version_plan['version_prefix'] for version_plan in route_plan['versions']]
+
+    artifacts = _versionizer.render_app_artifacts()
+    # Each worker imports the app again, so workers are only started for schemas rendered independently
+    unrendered_version_prefixes = _versionizer.get_unrendered_version_prefixes()
+    jobs = min(jobs or os.cpu_count() or 1, len(unrendered_version_prefixes))
+    worker_version_prefixes = unrendered_version_prefixes if jobs > 1 else []
+    if worker_version_prefixes:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(target,)) as executor:
+            for version_artifacts in executor.map(_render_version_openapi, worker_version_prefixes):
+                artifacts.update(version_artifacts)
+    for version_prefix in version_prefixes:
+        if version_prefix not in worker_version_prefixes:
+            artifacts.update(_versionizer.render_version_openapi(version_prefix))
+
+    manifest: Dict[str, Any] = {}
+    for path, (content_type, body) in sorted(artifacts.items()):
+        filename = _get_filename(path=path, content_type=content_type)
+        entry = {'file': filename, 'content_type': content_type, 'etag': compute_etag(body).decode('latin-1')}
+        _write_file(output_dir=output_dir, filename=filename, body=body)
+        if compress:
+            entry['gzip_file'] = filename + '.gz'
+            _write_file(
+                output_dir=output_dir,
+                filename=entry['gzip_file'],
+                body=gzip.compress(body, compresslevel=9, mtime=0)
+            )
+        manifest[path] = entry
+
+    _write_file(output_dir=output_dir, filename='routes.json', body=_dump_json(route_plan))
+    _write_file(output_dir=output_dir, filename='manifest.json', body=_dump_json(manifest))
+    return manifest
+
+
+def render_gateway_config(
+    target: str,
+    output_format: str,
+    upstream: str = 'app',
+    version_upstreams: Union[Mapping[str, str], None] = None
+) -> str:
+    """
+    Renders the route table of the given app, either as neutral JSON (i.e. the route plan),
+    nginx "location" blocks or an Envoy RouteConfiguration (as JSON)
+    """
+
+    route_plan = load_versionizer(target).get_route_plan()
+    if output_format == 'nginx':
+        return render_nginx_locations(route_plan=route_plan, upstream=upstream, version_upstreams=version_upstreams)
+    if output_format == 'envoy':
+        return _dump_json(render_envoy_route_config(
+            route_plan=route_plan,
+            cluster=upstream,
+            version_clusters=version_upstreams
+        )).decode('utf-8')
+    return _dump_json(route_plan).decode('utf-8')
+
+
+def _init_worker(target: str) -> None:
+    global _versionizer
+    if _versionizer is None:
+        _versionizer = load_versionizer(target)
+
+
+def _render_version_openapi(version_prefix: str) -> Dict[str, Tuple[str, bytes]]:
+    assert _versionizer is not None
+    return _versionizer.render_version_openapi(version_prefix)
+
+
+def _parse_version_upstream(value: str) -> Tuple[str, str]:
+    version_prefix, separator, upstream = value.partition('=')
+    if not separator or not version_prefix or not upstream:
+        raise argparse.ArgumentTypeError(f'Invalid version upstream "{value}", expected "PREFIX=NAME"')
+    return version_prefix, upstream
+
+
+def _get_filename(path: str, content_type: str) -> str:
+    # Paths can be both a page and a directory (e.g. "/docs" and "/docs/oauth2-redirect"), so pages get an extension
+    filename = path.strip('/') or 'index'
+    if not posixpath.splitext(filename)[1]:
+        filename += _EXTENSIONS_BY_CONTENT_TYPE.get(content_type.partition(';')[0].strip(), '')
+    return filename
+
+
+def _write_file(output_dir: str, filename: str, body: bytes) -> None:
+    path = os.path.join(output_dir, *filename.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as output_file:
+        output_file.write(body)
+
+
+def _dump_json(value: Any) -> bytes:
+    return json.dumps(value, indent=2).encode('utf-8')
+
+
+def main(argv: Union[Sequence[str], None] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='fastapi-versionizer',
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help='Write precomputed responses to a directory')
+    export_parser.add_argument('target', help='Versionizer, as "module:attribute"')
+    export_parser.add_argument('--output', required=True, help='Directory to write the artifacts to')
+    export_parser.add_argument('--jobs', type=int, help='Number of processes (defaults to the number of CPUs)')
+    export_parser.add_argument('--no-gzip', action='store_true', help='Skip the gzipped variants')
+
+    gateway_parser = subparsers.add_parser('gateway', help='Render the route table, for a gateway')
+    gateway_parser.add_argument('target', help='Versionizer, as "module:attribute"')
+    gateway_parser.add_argument('--format', choices=['json', 'nginx', 'envoy'], default='json')
+    gateway_parser.add_argument('--upstream', default='app', help='Upstream (or Envoy cluster) serving every route')
+    gateway_parser.add_argument(
+        '--version-upstream',
+        action='append',
+        default=[],
+        type=_parse_version_upstream,
+        metavar='PREFIX=NAME',
+        help='Upstream serving a specific version (e.g. /v1=legacy_pool)'
+    )
+    gateway_parser.add_argument('--output', help='File to write to (defaults to stdout)')
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == 'export':
+            manifest = export_artifacts(
+                target=args.target,
+                output_dir=args.output,
+                jobs=args.jobs,
+                compress=not args.no_gzip
+            )
+            print(f'Wrote {len(manifest)} artifacts to {args.output}', file=sys.stderr)
+            return 0
+
+        version_upstreams = dict(args.version_upstream)
+        output = render_gateway_config(
+            target=args.target,
+            output_format=args.format,
+            upstream=args.upstream,
+            version_upstreams=version_upstreams
+        )
+    except TargetError as e:
+        # Exits with status 2, like any other invalid argument
+        parser.error(str(e))
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(output)
+    else:
+        print(output, end='')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Any, Dict, List, Tuple, Union
+
+
+class _DeprecatedRouteUsage:
+
+    def __init__(
+        self,
+        version: str,
+        route: str,
+        method: str,
+        deprecated: bool,
+        remove_in_version: Union[str, None]
+    ):
+        self.version = version
+        self.route = route
+        self.method = method
+        self.deprecated = deprecated
+        self.remove_in_version = remove_in_version
+        self.count = 0
+        self.last_seen: Union[float, None] = None
+        self.count_by_client: Dict[str, int] = {}
+
+
+class DeprecationTelemetry:
+    """
+    Records which clients call deprecated (or soon to be removed) routes, in each version.
+
+    Request counts are exact, while clients are sampled (by sample_rate) and only the top clients are kept
+    for each route, using the Space-Saving algorithm, so memory is bounded by max_clients_per_route.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        max_clients_per_route: int = 100,
+        client_header: Union[str, None] = 'user-agent'
+    ):
+        """
+        :param sample_rate:
+            Fraction of requests whose client is recorded
+        :param max_clients_per_route:
+            Maximum number of clients kept for each route. The least frequent clients are evicted first.
+        :param client_header:
+            Request header used to identify clients (e.g. "user-agent" or "x-client-id").
+            If this is None, or the header is missing, the client's address is used instead.
+        """
+        self._sample_rate = sample_rate
+        self._max_clients_per_route = max_clients_per_route
+        self._client_header = client_header.lower().encode('latin-1') if client_header else None
+        self._usages: List[_DeprecatedRouteUsage] = []
+        self._index_by_series: Dict[Tuple[str, str, str], int] = {}
+
+    def register(
+        self,
+        version: str,
+        route: str,
+        method: str,
+        deprecated: bool,
+        remove_in_version: Union[str, None]
+    ) -> int:
+        """
+        Registers a deprecated route (if not already registered) and returns its index
+        """
+
+        series = (version, route, method)
+        index = self._index_by_series.get(series)
+        if index is None:
+            index = len(self._usages)
+            self._usages.append(_DeprecatedRouteUsage(
+                version=version,
+                route=route,
+                method=method,
+                deprecated=deprecated,
+                remove_in_version=remove_in_version
+            ))
+            self._index_by_series[series] = index
+        return index
+
+    def record(self, index: int, scope: Scope) -> None:
+        usage = self._usages[index]
+        usage.count += 1
+        usage.last_seen = time.time()
+        if self._sample_rate < 1.0 and random.random() >= self._sample_rate:
+            return
+
+        client = self._get_client(scope)
+        count_by_client = usage.count_by_client
+        if client in count_by_client:
+            count_by_client[client] += 1
+        elif len(count_by_client) < self._max_clients_per_route:
+            count_by_client[client] = 1
+        else:
+            # The new client takes over the least frequent client's count, which bounds its error
+            min_client = min(count_by_client, key=count_by_client.__getitem__)
+            count_by_client[client] = count_by_client.pop(min_client) + 1
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Returns the usage of every deprecated route that has been called, most called first.
+        Client counts are estimates, from sampled requests.
+        """
+
+        usages = sorted((usage for usage in self._usages if usage.count), key=lambda usage: -usage.count)
+        return [
+            {
+                'version': usage.version,
+                'route': usage.route,
+                'method': usage.method,
+                'deprecated': usage.deprecated,
+                'remove_in_version': usage.remove_in_version,
+                'count': usage.count,
+                'last_seen': usage.last_seen,
+                'clients': [
+                    {'client': client, 'count': count}
+                    for client, count in sorted(usage.count_by_client.items(), key=lambda item: -item[1])
+                ]
+            }
+            for usage in usages
+        ]
+
+    def _get_client(self, scope: Scope) -> str:
+        if self._client_header is not None:
+            for name, value in scope['headers']:
+                if name == self._client_header:
+                    return str(value.decode('latin-1'))
+
+        client = scope.get('client')
+        return str(client[0]) if client else 'unknown'
+
+
+class DeprecationTelemetryMiddleware:
+    """
+    ASGI wrapper around a single deprecated route, which records its usage
+    """
+
+    def __init__(self, app: ASGIApp, telemetry: DeprecationTelemetry, index: int):
+        self._app = app
+        self._telemetry = telemetry
+        self._index = index
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] == 'http':
+            self._telemetry.record(self._index, scope)
+        await self._app(scope, receive, send)
+
+
+def build_deprecation_headers(
+    deprecated: bool,
+    deprecation_date: Union[datetime, None],
+    sunset_date: Union[datetime, None],
+    link: Union[str, None]
+) -> List[Tuple[bytes, bytes]]:
+    """
+    Builds the Deprecation (RFC 9745), Sunset (RFC 8594) and Link headers for a route
+    """
+
+    headers: List[Tuple[bytes, bytes]] = []
+    if deprecated:
+        if deprecation_date is not None:
+            value = f'@{int(_as_utc(deprecation_date).timestamp())}'
+        else:
+            value = 'true'
+        headers.append((b'deprecation', value.encode('latin-1')))
+        if link is not None:
+            headers.append((b'link', f'<{link}>; rel="deprecation"'.encode('latin-1')))
+
+    if sunset_date is not None:
+        headers.append((b'sunset', format_datetime(_as_utc(sunset_date), usegmt=True).encode('latin-1')))
+        if link is not None:
+            headers.append((b'link', f'<{link}>; rel="sunset"'.encode('latin-1')))
+
+    return headers
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class DeprecationHeadersMiddleware:
+    """
+    ASGI wrapper around a single deprecated route, which adds precomputed headers to its responses
+    """
+
+    def __init__(self, app: ASGIApp, headers: List[Tuple[bytes, bytes]]):
+        self._app = app
+        self._headers = headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            return await self._app(scope, receive, send)
+
+        async def send_with_headers(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                message['headers'] = [*message.get('headers', ()), *self._headers]
+            await send(message)
+
+        await self._app(scope, receive, send_with_headers)
@@ -0,0 +1,300 @@
+import gzip
+import hashlib
+import importlib
+import json
+import mimetypes
+import os
+import posixpath
+from fastapi.encoders import jsonable_encoder
+from fastapi.openapi.docs import swagger_ui_default_parameters
+from fastapi.responses import HTMLResponse
+from starlette.types import Receive, Scope, Send
+from typing import Any, Dict, List, Mapping, NamedTuple, Tuple, Union
+
+from fastapi_versionizer.caching import compute_etag, etag_matches
+
+
+class _Representation(NamedTuple):
+    body: Union[bytes, memoryview]
+    etag: bytes
+    headers: List[Tuple[bytes, bytes]]
+    not_modified_headers: List[Tuple[bytes, bytes]]
+
+
+class StaticResponder:
+    """
+    Minimal ASGI app that serves a body rendered ahead of time, with precomputed headers (including a strong ETag),
+    and answers matching If-None-Match requests with 304 (Not Modified).
+    If a gzipped body is also given, it is served to clients that accept it.
+    """
+
+    def __init__(self, body: bytes, content_type: str, cache_control: str, gzip_body: Union[bytes, None] = None):
+        extra_headers = [(b'cache-control', cache_control.encode('latin-1'))]
+        if gzip_body is not None:
+            extra_headers.append((b'vary', b'accept-encoding'))
+
+        self._identity = self._build_representation(body, content_type, extra_headers)
+        self._gzip = None
+        if gzip_body is not None:
+            self._gzip = self._build_representation(
+                gzip_body, content_type, [(b'content-encoding', b'gzip'), *extra_headers])
+
+    @property
+    def body(self) -> Union[bytes, memoryview]:
+        return self._identity.body
+
+    @property
+    def etag(self) -> bytes:
+        return self._identity.etag
+
+    @property
+    def content_type(self) -> str:
+        return self._identity.headers[0][1].decode('latin-1')
+
+    def share_body(self, body: memoryview) -> None:
+        """
+        Replaces the (uncompressed) body with an identical one, e.g. a view of a shared memory mapping
+        """
+
+        if len(body) != len(self._identity.body):
+            raise ValueError('The shared body does not match the original one')
+        self._identity = self._identity._replace(body=body)
+
+    @staticmethod
+    def _build_representation(
+        body: bytes,
+        content_type: str,
+        extra_headers: List[Tuple[bytes, bytes]]
+    ) -> _Representation:
+        etag = compute_etag(body)
+        return _Representation(
+            body=body,
+            etag=etag,
+            headers=[
+                (b'content-type', content_type.encode('latin-1')),
+                (b'content-length', str(len(body)).encode('latin-1')),
+                (b'etag', etag),
+                *extra_headers
+            ],
+            not_modified_headers=[
+                (b'etag', etag),
+                *((name, value) for name, value in extra_headers if name in (b'cache-control', b'vary'))
+            ]
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if_none_match = None
+        accept_encoding = None
+        for name, value in scope['headers']:
+            if name == b'if-none-match':
+                if_none_match = value
+            elif name == b'accept-encoding':
+                accept_encoding = value
+
+        representation = self._identity
+        if self._gzip is not None and accept_encoding is not None and _accepts_gzip(accept_encoding):
+            representation = self._gzip
+
+        if etag_matches(if_none_match, representation.etag):
+            await send({'type': 'http.response.start', 'status': 304, 'headers': representation.not_modified_headers})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        await send({'type': 'http.response.start', 'status': 200, 'headers': representation.headers})
+        await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else representation.body})
+
+
+def _accepts_gzip(accept_encoding: bytes) -> bool:
+    # The header comes from the client, so malformed quality values make an entry unacceptable, instead of failing
+    qualities: Dict[bytes, float] = {}
+    for coding in accept_encoding.lower().split(b','):
+        name, *params = coding.split(b';')
+        name = name.strip()
+        if name not in (b'gzip', b'*') or name in qualities:
+            continue
+
+        quality = 1.0
+        for param in params:
+            param_name, _, value = param.partition(b'=')
+            if param_name.strip() == b'q':
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+                break
+        qualities[name] = quality
+
+    # An explicit gzip entry takes precedence over the wildcard
+    return qualities.get(b'gzip', qualities.get(b'*', 0.0)) > 0
+
+
+class DocsAssets:
+    """
+    Swagger UI and ReDoc assets (e.g. from the "swagger-ui-dist" and "redoc" npm packages), served by the app itself
+    instead of a CDN, and shared by every docs page.
+
+    Each file is served under a content-hashed name, so browsers can cache it indefinitely, and text files
+    are also served precompressed (gzip). Any asset that is missing is still loaded from the default CDN.
+    """
+
+    SWAGGER_JS = 'swagger-ui-bundle.js'
+    SWAGGER_PRESET_JS = 'swagger-ui-standalone-preset.js'
+    SWAGGER_CSS = 'swagger-ui.css'
+    REDOC_JS = 'redoc.standalone.js'
+    FAVICON = 'favicon.png'
+
+    # The favicon is also looked up under the name used by swagger-ui-dist
+    _FILENAMES = {
+        SWAGGER_JS: (SWAGGER_JS,),
+        SWAGGER_PRESET_JS: (SWAGGER_PRESET_JS,),
+        SWAGGER_CSS: (SWAGGER_CSS,),
+        REDOC_JS: (REDOC_JS,),
+        FAVICON: (FAVICON, 'favicon-32x32.png')
+    }
+
+    _TEXT_CONTENT_TYPES = {'.js': 'text/javascript; charset=utf-8', '.css': 'text/css; charset=utf-8'}
+
+    def __init__(self, files: Mapping[str, bytes], url_prefix: str = '/docs-assets'):
+        """
+        :param files:
+            Contents of each asset, by name (e.g. DocsAssets.SWAGGER_JS)
+        :param url_prefix:
+            Path prefix the assets are served under
+        """
+        self.url_prefix = url_prefix.rstrip('/')
+        self.files = dict(files)
+        self._paths: Dict[str, str] = {}
+        for name, body in self.files.items():
+            stem, extension = posixpath.splitext(name)
+            digest = hashlib.blake2b(body, digest_size=16).hexdigest()[:12]
+            self._paths[name] = f'{self.url_prefix}/{stem}.{digest}{extension}'
+
+    @classmethod
+    def from_directory(
+        cls,
+        directory: Union[str, 'os.PathLike[str]'],
+        url_prefix: str = '/docs-assets'
+    ) -> 'DocsAssets':
+        """
+        Loads the assets found in the given directory
+        """
+
+        files: Dict[str, bytes] = {}
+        for name, filenames in cls._FILENAMES.items():
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                if os.path.isfile(path):
+                    with open(path, 'rb') as asset_file:
+                        files[name] = asset_file.read()
+                    break
+
+        if not files:
+            raise ValueError(f'No docs assets found in "{directory}"')
+
+        return cls(files=files, url_prefix=url_prefix)
+
+    @classmethod
+    def from_package(cls, package: str, subdirectory: str = '', url_prefix: str = '/docs-assets') -> 'DocsAssets':
+        """
+        Loads the assets shipped inside the given (installed) Python package, optionally in a subdirectory of it
+        """
+
+        module = importlib.import_module(package)
+        if module.__file__ is None:
+            raise ValueError(f'Package "{package}" has no directory')
+
+        return cls.from_directory(
+            directory=os.path.join(os.path.dirname(module.__file__), subdirectory),
+            url_prefix=url_prefix
+        )
+
+    def get_path(self, name: str) -> Union[str, None]:
+        """
+        Returns the content-hashed path of the given asset, or None if it is missing
+        """
+
+        return self._paths.get(name)
+
+    def build_responders(self) -> List[Tuple[str, StaticResponder]]:
+        """
+        Returns a responder for each asset, by its content-hashed path
+        """
+
+        responders: List[Tuple[str, StaticResponder]] = []
+        for name, body in self.files.items():
+            content_type = self._TEXT_CONTENT_TYPES.get(posixpath.splitext(name)[1])
+            text = content_type is not None
+            responders.append((self._paths[name], StaticResponder(
+                body=body,
+                content_type=content_type or mimetypes.guess_type(name)[0] or 'application/octet-stream',
+                cache_control='public, max-age=31536000, immutable',
+                gzip_body=gzip.compress(body, compresslevel=9, mtime=0) if text else None
+            )))
+        return responders
+
+
+def get_swagger_ui_selector_html(
+    urls: List[Dict[str, str]],
+    primary_name: str,
+    title: str,
+    swagger_js_url: str = 'https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui-bundle.js',
+    swagger_preset_js_url: str = 'https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui-standalone-preset.js',
+    swagger_css_url: str = 'https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui.css',
+    swagger_favicon_url: str = 'https://fastapi.tiangolo.com/img/favicon.png',
+    oauth2_redirect_url: Union[str, None] = None,
+    init_oauth: Union[Dict[str, Any], None] = None,
+    swagger_ui_parameters: Union[Dict[str, Any], None] = None
+) -> HTMLResponse:
+    """
+    Renders a Swagger UI page with a selector (in its top bar) between the given openapi schemas,
+    each given as {"url": ..., "name": ...}
+    """
+
+    parameters = {**swagger_ui_default_parameters, **(swagger_ui_parameters or {})}
+    # The selector is part of the standalone layout, which needs the standalone preset
+    parameters.update({'layout': 'StandaloneLayout', 'urls': urls, 'urls.primaryName': primary_name})
+
+    html = f'''
+    <!DOCTYPE html>
+    <html>
+    <head>
+    <link type="text/css" rel="stylesheet" href="{swagger_css_url}">
+    <link rel="shortcut icon" href="{swagger_favicon_url}">
+    <title>{title}</title>
+    </head>
+    <body>
+    <div id="swagger-ui">
+    </div>
+    <script src="{swagger_js_url}"></script>
+    <script src="{swagger_preset_js_url}"></script>
+    <script>
+    const ui = SwaggerUIBundle({{
+    '''
+
+    for key, value in parameters.items():
+        html += f'{json.dumps(key)}: {json.dumps(jsonable_encoder(value))},\n'
+
+    if oauth2_redirect_url:
+        html += f"oauth2RedirectUrl: window.location.origin + '{oauth2_redirect_url}',"
+
+    html += '''
+    presets: [
+        SwaggerUIBundle.presets.apis,
+        SwaggerUIStandalonePreset
+        ],
+    plugins: [
+        SwaggerUIBundle.plugins.DownloadUrl
+        ],
+    })'''
+
+    if init_oauth:
+        html += f'''
+        ui.initOAuth({json.dumps(jsonable_encoder(init_oauth))})
+        '''
+
+    html += '''
+    </script>
+    </body>
+    </html>
+    '''
+    return HTMLResponse(html)
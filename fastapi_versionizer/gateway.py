@@ -0,0 +1,208 @@
+import re
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Tuple, Union
+
+
+class GatewayRoute(NamedTuple):
+    path: str
+    regex: str
+    # HTTP methods, or None for mounts (which accept any method)
+    methods: Union[Tuple[str, ...], None]
+    websocket: bool
+    upstream: str
+
+    @property
+    def allowed_methods(self) -> Union[Tuple[str, ...], None]:
+        """
+        Methods to let through, including GET for websocket handshakes
+        """
+
+        if self.methods is None or not self.websocket:
+            return self.methods
+        return tuple(sorted({*self.methods, 'GET'}))
+
+    @property
+    def exact(self) -> bool:
+        """
+        Whether the route matches a single path (i.e. has no path parameters)
+        """
+
+        return self.regex == f'^{re.escape(self.path)}$'
+
+
+def iter_gateway_routes(
+    route_plan: Mapping[str, Any],
+    upstream: str,
+    version_upstreams: Union[Mapping[str, str], None] = None
+) -> Iterator[GatewayRoute]:
+    """
+    Yields the routes of the given route plan (from Versionizer.get_route_plan()), with routes sharing a path
+    (e.g. HTTP and websocket routes) merged, and the upstream serving each one
+
+    :param upstream:
+        Upstream serving every route by default
+    :param version_upstreams:
+        Upstreams serving specific versions, by version prefix (e.g. {"/v1": "legacy_pool"})
+    """
+
+    version_upstreams = version_upstreams or {}
+    route_groups = [
+        (version_upstreams.get(version_plan['version_prefix'], upstream), version_plan['routes'])
+        for version_plan in route_plan['versions']
+    ]
+    route_groups.append((upstream, route_plan['unversioned_routes']))
+
+    for group_upstream, routes in route_groups:
+        methods_by_route: Dict[Tuple[str, str], Union[List[str], None]] = {}
+        websocket_routes = set()
+        for route in routes:
+            if route['path'] is None or route['regex'] is None:
+                continue
+
+            key = (route['path'], route['regex'])
+            if route['kind'] == 'mount':
+                methods_by_route[key] = None
+                continue
+            if route['kind'] == 'websocket':
+                websocket_routes.add(key)
+            if key not in methods_by_route or methods_by_route[key] is not None:
+                route_methods = route['methods'] if route['kind'] == 'http' else ()
+                methods_by_route[key] = sorted({*(methods_by_route.get(key) or ()), *route_methods})
+
+        for (path, regex), methods in methods_by_route.items():
+            yield GatewayRoute(
+                path=path,
+                regex=regex,
+                methods=tuple(methods) if methods is not None else None,
+                websocket=(path, regex) in websocket_routes,
+                upstream=group_upstream
+            )
+
+
+def _get_slash_variants(routes: List[GatewayRoute]) -> Dict[str, str]:
+    # With redirect_slashes, the app redirects the other variant of each (HTTP) path, so it is forwarded too
+    exact_paths = {route.path for route in routes if route.exact}
+    slash_variants: Dict[str, str] = {}
+    for route in routes:
+        if route.exact and route.path != '/' and route.methods:
+            slash_variant = route.path[:-1] if route.path.endswith('/') else route.path + '/'
+            if slash_variant not in exact_paths:
+                slash_variants[route.path] = slash_variant
+    return slash_variants
+
+
+def _get_slash_tolerant_regex(regex: str) -> str:
+    if regex.endswith('/$') or not regex.endswith('$'):
+        return regex
+    return regex[:-1] + '/?$'
+
+
+def render_nginx_locations(
+    route_plan: Mapping[str, Any],
+    upstream: str,
+    version_upstreams: Union[Mapping[str, str], None] = None
+) -> str:
+    """
+    Renders nginx "location" blocks (to include in a "server" block), which proxy existing routes to the given
+    upstreams and reject everything else: unknown paths (including removed versions) with 404,
+    and unknown methods with 405. Paths without parameters use exact matches, which nginx checks first.
+
+    :param upstream:
+        Upstream serving every route by default (e.g. "app" for "proxy_pass http://app")
+    :param version_upstreams:
+        Upstreams serving specific versions, by version prefix (e.g. {"/v1": "legacy_pool"})
+    """
+
+    redirect_slashes = route_plan.get('redirect_slashes', False)
+    routes = list(iter_gateway_routes(route_plan=route_plan, upstream=upstream, version_upstreams=version_upstreams))
+    slash_variants = _get_slash_variants(routes) if redirect_slashes else {}
+    lines: List[str] = []
+    for route in routes:
+        directives = []
+        if route.allowed_methods is not None:
+            directives.append(f'if ($request_method !~ ^({"|".join(route.allowed_methods)})$) {{ return 405; }}')
+        if route.websocket:
+            directives.extend([
+                'proxy_http_version 1.1;',
+                'proxy_set_header Upgrade $http_upgrade;',
+                'proxy_set_header Connection $http_connection;'
+            ])
+        directives.append(f'proxy_pass http://{route.upstream};')
+
+        if route.exact:
+            lines.extend(_render_nginx_location(f'= {route.path}', directives))
+            slash_variant = slash_variants.get(route.path)
+            if slash_variant is not None:
+                lines.extend(_render_nginx_location(f'= {slash_variant}', [f'proxy_pass http://{route.upstream};']))
+        else:
+            regex = _get_slash_tolerant_regex(route.regex) if redirect_slashes else route.regex
+            lines.extend(_render_nginx_location(f'~ "{regex}"', directives))
+
+    lines.extend(_render_nginx_location('/', ['return 404;']))
+    return '\n'.join(lines) + '\n'
+
+
+def _render_nginx_location(match: str, directives: List[str]) -> List[str]:
+    return [f'location {match} {{', *(f'    {directive}' for directive in directives), '}']
+
+
+def render_envoy_route_config(
+    route_plan: Mapping[str, Any],
+    cluster: str,
+    version_clusters: Union[Mapping[str, str], None] = None,
+    name: str = 'versioned_routes'
+) -> Dict[str, Any]:
+    """
+    Renders an Envoy RouteConfiguration (as a JSON-compatible dict), which routes existing routes to the given
+    clusters and rejects everything else: unknown paths (including removed versions) with 404,
+    and unknown methods with 405
+
+    :param cluster:
+        Cluster serving every route by default
+    :param version_clusters:
+        Clusters serving specific versions, by version prefix (e.g. {"/v1": "legacy_pool"})
+    """
+
+    redirect_slashes = route_plan.get('redirect_slashes', False)
+    gateway_routes = list(iter_gateway_routes(
+        route_plan=route_plan,
+        upstream=cluster,
+        version_upstreams=version_clusters
+    ))
+    slash_variants = _get_slash_variants(gateway_routes) if redirect_slashes else {}
+    routes: List[Dict[str, Any]] = []
+    for route in gateway_routes:
+        if route.exact:
+            path_match: Dict[str, Any] = {'path': route.path}
+        else:
+            regex = _get_slash_tolerant_regex(route.regex) if redirect_slashes else route.regex
+            path_match = {'safe_regex': {'regex': regex}}
+
+        action: Dict[str, Any] = {'cluster': route.upstream}
+        if route.websocket:
+            action['upgrade_configs'] = [{'upgrade_type': 'websocket'}]
+
+        if route.allowed_methods is None:
+            routes.append({'match': path_match, 'route': action})
+            continue
+
+        routes.append({
+            'match': {
+                **path_match,
+                'headers': [{
+                    'name': ':method',
+                    'string_match': {'safe_regex': {'regex': '|'.join(route.allowed_methods)}}
+                }]
+            },
+            'route': action
+        })
+        routes.append({'match': path_match, 'direct_response': {'status': 405}})
+
+        slash_variant = slash_variants.get(route.path)
+        if slash_variant is not None:
+            routes.append({'match': {'path': slash_variant}, 'route': {'cluster': route.upstream}})
+
+    routes.append({'match': {'prefix': '/'}, 'direct_response': {'status': 404}})
+    return {
+        'name': name,
+        'virtual_hosts': [{'name': name, 'domains': ['*'], 'routes': routes}]
+    }
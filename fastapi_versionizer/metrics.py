@@ -0,0 +1,143 @@
+import bisect
+import time
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def format_labels(labels: Mapping[str, str]) -> str:
+    """
+    Formats Prometheus labels (without the surrounding braces), escaping their values
+    """
+
+    formatted_labels = []
+    for label, value in labels.items():
+        value = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        formatted_labels.append(f'{label}="{value}"')
+    return ','.join(formatted_labels)
+
+
+class VersionMetrics:
+    """
+    Request counters and latency histograms per (version, route, method).
+
+    All series are registered when versionize() is called, so their buckets are preallocated
+    in flat arrays and a request only increments two slots.
+    Increments happen on the event loop thread, so no locks are needed.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = 'versionizer'):
+        self._bounds = tuple(sorted(buckets))
+        self._namespace = namespace
+        self._series: List[Tuple[str, str, str]] = []
+        self._index_by_series: Dict[Tuple[str, str, str], int] = {}
+        # Each series has one slot per bucket, plus one for +Inf
+        self._bucket_counts: List[int] = []
+        self._sums: List[float] = []
+
+    @property
+    def namespace(self) -> str:
+        return self._namespace
+
+    def register(self, version: str, route: str, method: str) -> int:
+        """
+        Registers a series (if not already registered) and returns its index
+        """
+
+        series = (version, route, method)
+        index = self._index_by_series.get(series)
+        if index is None:
+            index = len(self._series)
+            self._series.append(series)
+            self._index_by_series[series] = index
+            self._bucket_counts.extend([0] * (len(self._bounds) + 1))
+            self._sums.append(0.0)
+        return index
+
+    def observe(self, index: int, duration: float) -> None:
+        self._bucket_counts[index * (len(self._bounds) + 1) + bisect.bisect_left(self._bounds, duration)] += 1
+        self._sums[index] += duration
+
+    def collect(self) -> List[Dict[str, Any]]:
+        """
+        Returns a snapshot of all series, for use by custom exporters.
+        Bucket counts are cumulative, as in Prometheus.
+        """
+
+        num_slots = len(self._bounds) + 1
+        snapshot: List[Dict[str, Any]] = []
+        for index, (version, route, method) in enumerate(self._series):
+            counts = self._bucket_counts[index * num_slots:(index + 1) * num_slots]
+            cumulative_counts: List[int] = []
+            total = 0
+            for count in counts:
+                total += count
+                cumulative_counts.append(total)
+
+            snapshot.append({
+                'version': version,
+                'route': route,
+                'method': method,
+                'count': total,
+                'sum': self._sums[index],
+                'buckets': list(zip(self._bounds + (float('inf'),), cumulative_counts))
+            })
+
+        return snapshot
+
+    def render_prometheus(self) -> str:
+        """
+        Renders all series in the Prometheus text exposition format
+        """
+
+        requests_name = f'{self._namespace}_requests_total'
+        duration_name = f'{self._namespace}_request_duration_seconds'
+        snapshot = self.collect()
+
+        lines = [
+            f'# HELP {requests_name} Total number of requests per version, route and method.',
+            f'# TYPE {requests_name} counter'
+        ]
+        for series in snapshot:
+            lines.append(f'{requests_name}{{{self._format_labels(series)}}} {series["count"]}')
+
+        lines.extend([
+            f'# HELP {duration_name} Request latency per version, route and method.',
+            f'# TYPE {duration_name} histogram'
+        ])
+        for series in snapshot:
+            labels = self._format_labels(series)
+            for bound, count in series['buckets']:
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{duration_name}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f'{duration_name}_sum{{{labels}}} {series["sum"]!r}')
+            lines.append(f'{duration_name}_count{{{labels}}} {series["count"]}')
+
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _format_labels(series: Dict[str, Any]) -> str:
+        return format_labels({label: series[label] for label in ('version', 'route', 'method')})
+
+
+class MetricsMiddleware:
+    """
+    ASGI wrapper around a single versioned route, which records its request count and latency
+    """
+
+    def __init__(self, app: ASGIApp, metrics: VersionMetrics, index_by_method: Dict[str, int]):
+        self._app = app
+        self._metrics = metrics
+        self._index_by_method = index_by_method
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        index = self._index_by_method.get(scope.get('method', ''))
+        if index is None:
+            return await self._app(scope, receive, send)
+
+        start = time.perf_counter()
+        try:
+            await self._app(scope, receive, send)
+        finally:
+            self._metrics.observe(index, time.perf_counter() - start)
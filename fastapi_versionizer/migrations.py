@@ -0,0 +1,215 @@
+import asyncio
+import functools
+from fastapi.dependencies.utils import get_typed_signature
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.responses import Response
+import pydantic
+from typing import Any, Callable, List, Mapping, NamedTuple, Sequence, Tuple, TypeVar, Union
+from typing_extensions import Annotated, get_args, get_origin
+
+CallableT = TypeVar('CallableT', bound=Callable[..., Any])
+
+
+class _Migration(NamedTuple):
+    version: Tuple[int, int]
+    drop: Tuple[str, ...]
+    rename: Tuple[Tuple[str, str], ...]
+    defaults: Tuple[Tuple[str, Any], ...]
+    response_model: Any
+    request_model: Any
+    request_converter: Union[Callable[[Any], Any], None]
+
+
+def api_migration(
+    major: int,
+    minor: int = 0,
+    drop: Union[Sequence[str], None] = None,
+    rename: Union[Mapping[str, str], None] = None,
+    defaults: Union[Mapping[str, Any], None] = None,
+    response_model: Any = None,
+    request_model: Any = None,
+    request_converter: Union[Callable[[Any], Any], None] = None
+) -> Callable[[CallableT], CallableT]:
+    """
+    Serves a route in older versions, starting from the given version, by down-converting
+    the responses of its newer handler (instead of registering a separate handler for each version).
+
+    Field operations are applied to the whole response at once, in this order: drop, rename, defaults.
+    If a list is returned, they are applied to every record in the list.
+    They require response_model, which replaces the handler's response model in the older version.
+
+    If request_model is given, the request body is validated against it and then upgraded to the
+    handler's body model by request_converter (by default, the newer model is built from the older one's fields).
+    """
+
+    def decorator(func: CallableT) -> CallableT:
+        migrations: List[_Migration] = list(getattr(func, '_api_migrations', ()))
+        migrations.append(_Migration(
+            version=(major, minor),
+            drop=tuple(drop or ()),
+            rename=tuple((rename or {}).items()),
+            defaults=tuple((defaults or {}).items()),
+            response_model=response_model,
+            request_model=request_model,
+            request_converter=request_converter
+        ))
+        func._api_migrations = sorted(migrations, key=lambda m: m.version)  # type: ignore
+        return func
+
+    return decorator
+
+
+def get_migrations(
+    endpoint: Callable[..., Any],
+    version: Tuple[int, int],
+    route_version: Tuple[int, int]
+) -> List[_Migration]:
+    """
+    Returns the migrations (newest first) needed to serve a route, introduced in route_version,
+    in the given version
+    """
+
+    if version >= route_version:
+        return []
+
+    migrations: List[_Migration] = getattr(endpoint, '_api_migrations', [])
+    served_versions = [migration.version for migration in migrations if migration.version <= version]
+    if not served_versions:
+        return []
+
+    return [migration for migration in reversed(migrations) if max(served_versions) <= migration.version]
+
+
+class _ResponseMigrator:
+
+    def __init__(self, migrations: List[_Migration], source_model: Any, status_code: Union[int, None]):
+        self._status_code = status_code or 200
+
+        # Fields dropped by the first migration are excluded during serialization itself
+        self._exclude = set(migrations[0].drop)
+        self._source_model = source_model
+        self._adapter = None
+        if source_model is not None and hasattr(pydantic, 'TypeAdapter'):
+            self._adapter = pydantic.TypeAdapter(source_model)
+
+        self._operations: List[Tuple[str, str, Any]] = []
+        for i, migration in enumerate(migrations):
+            if i > 0 or self._adapter is None:
+                self._operations.extend(('drop', field, None) for field in migration.drop)
+            self._operations.extend(('rename', old, new) for old, new in migration.rename)
+            self._operations.extend(('default', field, value) for field, value in migration.defaults)
+
+    def __call__(self, content: Any) -> Any:
+        if isinstance(content, Response):
+            return content
+
+        data = self._serialize(content)
+        rows = data if isinstance(data, list) else [data]
+        for operation, field, arg in self._operations:
+            # Each operation is applied column-wise, in a single pass over every record
+            if operation == 'drop':
+                for row in rows:
+                    row.pop(field, None)
+            elif operation == 'rename':
+                for row in rows:
+                    if field in row:
+                        row[arg] = row.pop(field)
+            else:
+                for row in rows:
+                    row.setdefault(field, arg)
+
+        return JSONResponse(content=data, status_code=self._status_code)
+
+    def _serialize(self, content: Any) -> Any:
+        # Content is validated against the response model first, as FastAPI does,
+        # so fields outside of it (e.g. in returned dicts) are never sent
+        if self._source_model is None:
+            return jsonable_encoder(content)
+        if self._adapter is None:
+            return jsonable_encoder(pydantic.parse_obj_as(self._source_model, content))
+
+        content = self._adapter.validate_python(content, from_attributes=True)
+
+        exclude: Any = None
+        if self._exclude:
+            exclude = {'__all__': self._exclude} if isinstance(content, list) else self._exclude
+        return self._adapter.dump_python(content, mode='json', by_alias=True, exclude=exclude, warnings=False)
+
+
+def _identity(content: Any) -> Any:
+    return content
+
+
+def has_response_migration(migrations: List[_Migration]) -> bool:
+    return any(
+        migration.drop or migration.rename or migration.defaults or migration.response_model is not None
+        for migration in migrations
+    )
+
+
+def build_migrated_endpoint(
+    endpoint: Callable[..., Any],
+    migrations: List[_Migration],
+    source_model: Any,
+    status_code: Union[int, None],
+    body_param: Union[str, None]
+) -> Callable[..., Any]:
+    """
+    Wraps a route's endpoint so its body is upgraded from, and its output is down-converted for, an older version.
+    The migrations are compiled once, here, rather than per request.
+    """
+
+    migrate: Callable[[Any], Any] = _identity
+    if has_response_migration(migrations):
+        # The older model replaces the route's response model, so the older version's docs would have no schema
+        if migrations[-1].response_model is None:
+            raise ValueError(
+                f'Response migrations require a response_model, for the endpoint "{endpoint.__name__}" '
+                f'in version {migrations[-1].version}'
+            )
+        migrate = _ResponseMigrator(migrations=migrations, source_model=source_model, status_code=status_code)
+
+    # FastAPI resolves string annotations (e.g. with postponed evaluation) against the wrapper's module,
+    # so the endpoint's annotations are resolved here, against its own module
+    signature = get_typed_signature(endpoint)
+    request_model = migrations[-1].request_model
+    convert: Callable[[Any], Any] = _identity
+    if request_model is not None:
+        if body_param is None:
+            raise ValueError(f'Request migrations require the endpoint "{endpoint.__name__}" to have a single body')
+
+        annotation = signature.parameters[body_param].annotation
+        target_model = annotation
+        if get_origin(annotation) is Annotated:
+            target_model, *metadata = get_args(annotation)
+            request_model = Annotated[(request_model, *metadata)]
+
+        parameters = [
+            parameter.replace(annotation=request_model) if name == body_param else parameter
+            for name, parameter in signature.parameters.items()
+        ]
+        signature = signature.replace(parameters=parameters)
+        convert = migrations[-1].request_converter or (lambda body: target_model(**dict(body)))
+
+    def upgrade(kwargs: Any) -> Any:
+        if request_model is not None:
+            kwargs[body_param] = convert(kwargs[body_param])
+        return kwargs
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            return migrate(await endpoint(*args, **upgrade(kwargs)))
+
+        wrapper: Callable[..., Any] = async_wrapper
+    else:
+        @functools.wraps(endpoint)
+        def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            return migrate(endpoint(*args, **upgrade(kwargs)))
+
+        wrapper = sync_wrapper
+
+    # FastAPI builds the request body validation from this signature, so the older model (if any) is validated
+    setattr(wrapper, '__signature__', signature)
+    return wrapper
@@ -0,0 +1,577 @@
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import urllib.parse
+from collections import defaultdict
+from enum import Enum
+import fastapi
+from fastapi import FastAPI
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.dependencies.utils import get_flat_dependant
+import fastapi.openapi.utils
+from fastapi.routing import APIRoute
+import pydantic
+from starlette.routing import BaseRoute
+from typing import Any, Callable, Dict, Iterator, List, Mapping, NamedTuple, Sequence, Set, Tuple, Union
+from typing_extensions import get_args, is_typeddict
+
+from fastapi_versionizer.caching import compute_etag
+
+logger = logging.getLogger(__name__)
+
+
+class VersionRoutes:
+    """
+    Routes served by a single version router (including the "latest" alias), once included in the app
+    """
+
+    def __init__(self, version: Tuple[int, int], version_prefix: str, routes: List[BaseRoute], latest: bool):
+        self.version = version
+        self.version_prefix = version_prefix
+        self.routes = routes
+        self.latest = latest
+
+
+def get_openapi_params(app: FastAPI) -> Dict[str, Any]:
+    """
+    Returns the parameters FastAPI uses to generate the app's own schema, except for its routes
+    """
+
+    openapi_params: Dict[str, Any] = {
+        'title': app.title,
+        'version': app.version,
+        'openapi_version': app.openapi_version,
+        'description': app.description,
+        'terms_of_service': app.terms_of_service,
+        'contact': app.contact,
+        'license_info': app.license_info,
+        'tags': app.openapi_tags,
+        'servers': app.servers
+    }
+
+    # These are only available in newer FastAPI versions
+    if hasattr(app, 'summary'):
+        openapi_params['summary'] = app.summary
+    if hasattr(app, 'webhooks'):
+        openapi_params['webhooks'] = app.webhooks.routes
+    if hasattr(app, 'separate_input_output_schemas'):
+        openapi_params['separate_input_output_schemas'] = app.separate_input_output_schemas
+
+    return openapi_params
+
+
+def _get_operation_key(route: APIRoute) -> Tuple[Any, ...]:
+    # Routes copied into several versions only differ by what versioning changes (e.g. migrations, deprecation)
+    return (
+        id(route.endpoint),
+        tuple(sorted(route.methods)),
+        bool(route.deprecated),
+        id(route.response_model),
+        route.status_code
+    )
+
+
+def _escape_json_pointer(token: str) -> str:
+    return token.replace('~', '~0').replace('/', '~1')
+
+
+def build_deduplicated_openapi(
+    app: FastAPI,
+    version_routes: Sequence[VersionRoutes],
+    include_latest: bool = True
+) -> Dict[str, Any]:
+    """
+    Generates the app's schema, where each path item that is identical across versions is only generated once.
+    Every other version's path then references it with "$ref" (models are already shared as components),
+    so the generation time and size scale with the number of distinct operations, rather than versions.
+    """
+
+    versioned_route_ids = {id(route) for routes in version_routes for route in routes.routes}
+    schema_routes: List[BaseRoute] = []
+    # Each path, in order, and the path it references (or None if it is generated)
+    path_refs: List[Tuple[str, Union[str, None]]] = []
+    path_by_key: Dict[Tuple[Any, ...], str] = {}
+    for routes in version_routes:
+        if routes.latest and not include_latest:
+            continue
+
+        routes_by_path: Dict[str, List[APIRoute]] = defaultdict(list)
+        for route in routes.routes:
+            if isinstance(route, APIRoute) and route.include_in_schema:
+                routes_by_path[route.path_format].append(route)
+
+        for path, path_routes in routes_by_path.items():
+            key = (
+                path[len(routes.version_prefix):],
+                tuple(sorted(_get_operation_key(route) for route in path_routes))
+            )
+            ref_path = path_by_key.get(key)
+            if ref_path is None:
+                path_by_key[key] = path
+                schema_routes.extend(path_routes)
+            path_refs.append((path, ref_path))
+
+    schema_routes.extend(route for route in app.routes if id(route) not in versioned_route_ids)
+    schema = fastapi.openapi.utils.get_openapi(routes=schema_routes, **get_openapi_params(app))
+
+    generated_paths = schema.get('paths', {})
+    paths: Dict[str, Any] = {}
+    for path, ref_path in path_refs:
+        if ref_path is None:
+            paths[path] = generated_paths.pop(path)
+        else:
+            paths[path] = {'$ref': f'#/paths/{_escape_json_pointer(ref_path)}'}
+    # Unversioned paths (e.g. "/versions") are listed last
+    paths.update(generated_paths)
+    schema['paths'] = paths
+
+    return schema
+
+
+def _iter_refs(value: Any) -> Iterator[str]:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == '$ref' and isinstance(item, str):
+                yield item
+            else:
+                yield from _iter_refs(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_refs(item)
+
+
+def _replace_refs(value: Any, replace: Callable[[str], str]) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: replace(item) if key == '$ref' and isinstance(item, str) else _replace_refs(item, replace)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_replace_refs(item, replace) for item in value]
+    return value
+
+
+# Sections whose components are referenced by "$ref" (security schemes are referenced by name instead,
+# so they must stay in each version's schema)
+_SHARED_COMPONENT_SECTIONS = frozenset({
+    'schemas', 'responses', 'parameters', 'examples', 'requestBodies', 'headers', 'links', 'callbacks', 'pathItems'
+})
+
+
+def split_openapi_components(
+    schemas: Mapping[str, Dict[str, Any]],
+    info: Dict[str, Any],
+    components_url: Callable[[Dict[str, Any]], str]
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    Moves the components shared by the given schemas to a separate components document (with the given info),
+    and references them from each schema by their URL (given by components_url, from the components document).
+    A component is shared unless it differs between schemas, or references a component that does.
+    Only components referenced by "$ref" are shared, so e.g. security schemes stay in each schema.
+
+    :returns: the components document, and each (thinner) schema
+    """
+
+    components: Dict[Tuple[str, str], Any] = {}
+    conflicts: Set[Tuple[str, str]] = set()
+    for schema in schemas.values():
+        for section, section_components in schema.get('components', {}).items():
+            for name, component in section_components.items():
+                key = (section, name)
+                if key in components and components[key] != component:
+                    conflicts.add(key)
+                components.setdefault(key, component)
+
+    refs_by_key = {
+        key: {
+            tuple(ref[len('#/components/'):].split('/', 1))
+            for ref in _iter_refs(component) if ref.startswith('#/components/')
+        }
+        for key, component in components.items()
+    }
+    shared_keys = {key for key in components if key not in conflicts and key[0] in _SHARED_COMPONENT_SECTIONS}
+    changed = True
+    while changed:
+        unshared_keys = {key for key in shared_keys if not refs_by_key[key] <= shared_keys}
+        shared_keys -= unshared_keys
+        changed = bool(unshared_keys)
+
+    shared_components: Dict[str, Dict[str, Any]] = {}
+    for section, name in components:
+        if (section, name) in shared_keys:
+            shared_components.setdefault(section, {})[name] = components[(section, name)]
+
+    components_document = {
+        'openapi': next(iter(schemas.values()), {}).get('openapi', '3.1.0'),
+        'info': info,
+        'paths': {},
+        'components': shared_components
+    }
+    url = components_url(components_document)
+
+    def replace(ref: str) -> str:
+        if ref.startswith('#/components/') and tuple(ref[len('#/components/'):].split('/', 1)) in shared_keys:
+            return f'{url}{ref}'
+        return ref
+
+    split_schemas: Dict[str, Dict[str, Any]] = {}
+    for schema_key, schema in schemas.items():
+        split_schema = {key: value for key, value in schema.items() if key != 'components'}
+        local_components: Dict[str, Dict[str, Any]] = {}
+        for section, section_components in schema.get('components', {}).items():
+            for name, component in section_components.items():
+                if (section, name) not in shared_keys:
+                    local_components.setdefault(section, {})[name] = component
+        if local_components:
+            split_schema['components'] = local_components
+        split_schemas[schema_key] = _replace_refs(split_schema, replace)
+
+    return components_document, split_schemas
+
+
+def dump_openapi(schema: Dict[str, Any]) -> bytes:
+    """
+    Serializes a schema the same way FastAPI's JSONResponse does
+    """
+
+    return json.dumps(schema, ensure_ascii=False, allow_nan=False, indent=None, separators=(',', ':')).encode('utf-8')
+
+
+class SplitOpenAPI(NamedTuple):
+    digest: str
+    components_body: bytes
+    version_bodies: Dict[str, bytes]
+
+
+def build_split_openapi(
+    schemas: Mapping[str, Dict[str, Any]],
+    info: Dict[str, Any],
+    components_url_format: str
+) -> SplitOpenAPI:
+    """
+    Splits every version's schema (by version prefix) into a shared components document and thin per-version
+    documents, all serialized. The components document's URL is given by components_url_format,
+    formatted with the digest of its content.
+    """
+
+    components_body = b''
+    digest = ''
+
+    def components_url(components_document: Dict[str, Any]) -> str:
+        nonlocal components_body, digest
+        components_body = dump_openapi(components_document)
+        digest = hashlib.blake2b(components_body, digest_size=16).hexdigest()[:16]
+        return components_url_format.format(digest=digest)
+
+    _, split_schemas = split_openapi_components(schemas=schemas, info=info, components_url=components_url)
+    return SplitOpenAPI(
+        digest=digest,
+        components_body=components_body,
+        version_bodies={version_prefix: dump_openapi(schema) for version_prefix, schema in split_schemas.items()}
+    )
+
+
+class TagShards:
+    """
+    A version's schema, sharded by tag (routes without tags are in the "default" shard), along with an index
+    listing the shards. Each shard is generated and serialized once, on first use.
+    """
+
+    DEFAULT_TAG = 'default'
+
+    def __init__(
+        self,
+        get_routes: Callable[[], Sequence[BaseRoute]],
+        build_openapi: Callable[[Sequence[BaseRoute], List[Dict[str, Any]]], Dict[str, Any]],
+        openapi_tags: List[Dict[str, Any]],
+        shard_url_format: str
+    ):
+        """
+        :param get_routes:
+            Returns the version's routes. It is only called on first use, once the version router is complete.
+        :param build_openapi:
+            Generates a schema from the given routes and tags
+        :param openapi_tags:
+            Tags metadata of the version
+        :param shard_url_format:
+            Used to build the URL of each shard, formatted with its (quoted) tag
+        """
+        self._get_routes = get_routes
+        self._build_openapi = build_openapi
+        self._openapi_tags_by_name = {openapi_tag['name']: openapi_tag for openapi_tag in openapi_tags}
+        self._shard_url_format = shard_url_format
+        self._routes_by_tag: Union[Dict[str, List[BaseRoute]], None] = None
+        self._index: Union[Tuple[bytes, bytes], None] = None
+        self._shards: Dict[str, Tuple[bytes, bytes]] = {}
+
+    def get_index(self) -> Tuple[bytes, bytes]:
+        """
+        Returns the body and ETag of the index
+        """
+
+        if self._index is None:
+            shards = []
+            for tag, routes in self._get_routes_by_tag().items():
+                shard: Dict[str, Any] = {'name': tag}
+                if 'description' in self._openapi_tags_by_name.get(tag, {}):
+                    shard['description'] = self._openapi_tags_by_name[tag]['description']
+                shard['url'] = self._shard_url_format.format(tag=urllib.parse.quote(tag, safe=''))
+                shard['operations'] = sum(len(getattr(route, 'methods', None) or ()) for route in routes)
+                shards.append(shard)
+            body = dump_openapi({'shards': shards})
+            self._index = (body, compute_etag(body))
+        return self._index
+
+    def get_shard(self, tag: str) -> Union[Tuple[bytes, bytes], None]:
+        """
+        Returns the body and ETag of the given tag's shard, or None if the version has no such tag
+        """
+
+        shard = self._shards.get(tag)
+        if shard is None:
+            routes = self._get_routes_by_tag().get(tag)
+            if routes is None:
+                return None
+            openapi_tags = [self._openapi_tags_by_name[tag]] if tag in self._openapi_tags_by_name else []
+            body = dump_openapi(self._build_openapi(routes, openapi_tags))
+            shard = self._shards[tag] = (body, compute_etag(body))
+        return shard
+
+    def _get_routes_by_tag(self) -> Dict[str, List[BaseRoute]]:
+        if self._routes_by_tag is None:
+            routes_by_tag: Dict[str, List[BaseRoute]] = {}
+            # Tags with metadata are listed first, in the same order
+            for tag in self._openapi_tags_by_name:
+                routes_by_tag[tag] = []
+            for route in self._get_routes():
+                if isinstance(route, APIRoute) and route.include_in_schema:
+                    for tag in route.tags or [self.DEFAULT_TAG]:
+                        tag = tag.value if isinstance(tag, Enum) else tag
+                        routes_by_tag.setdefault(tag, []).append(route)
+            self._routes_by_tag = {tag: routes for tag, routes in routes_by_tag.items() if routes}
+        return self._routes_by_tag
+
+
+# Bumped whenever the fingerprint (or the way schemas are generated from it) changes
+_FINGERPRINT_VERSION = 3
+
+# Addresses in reprs (e.g. of default factories) differ between processes, so they are left out
+_ADDRESS_PATTERN = re.compile(r' at 0x[0-9a-fA-F]+')
+
+
+# Field settings that can change a schema (Pydantic 1 fields also have their settings in "field_info")
+_FIELD_ATTRIBUTES = (
+    'alias', 'serialization_alias', 'default', 'default_factory', 'required', 'title', 'description', 'examples',
+    'json_schema_extra', 'discriminator', 'deprecated', 'metadata', 'field_info'
+)
+
+
+def _stable_repr(value: Any) -> str:
+    text = repr(value)
+    return _ADDRESS_PATTERN.sub('', text) if ' at 0x' in text else text
+
+
+def _describe_field(field: Any) -> List[str]:
+    # Annotations are described separately, as repr(field) formats them too, which is relatively costly
+    description = [_stable_repr(getattr(field, attribute, None)) for attribute in _FIELD_ATTRIBUTES]
+    if hasattr(field, 'is_required'):
+        description.append(repr(field.is_required()))
+    return description
+
+
+def _get_model_fingerprint(model: Any, model_fingerprints: Dict[Any, str]) -> str:
+    fingerprint = model_fingerprints.get(model)
+    if fingerprint is None:
+        # Models are fingerprinted by their definition (rather than their JSON schema, which is nearly as costly
+        # as the schema being cached). Recursive models refer to themselves by name.
+        model_name = f'{model.__module__}.{model.__qualname__}'
+        model_fingerprints[model] = model_name
+        fields = model.model_fields if hasattr(model, 'model_fields') else model.__fields__
+        description: List[Any] = [
+            model_name,
+            model.__doc__,
+            _stable_repr(getattr(model, 'model_config', None) or getattr(model, '__config__', None))
+        ]
+        for name, field in fields.items():
+            annotation = getattr(field, 'annotation', None) or getattr(field, 'outer_type_', None)
+            description.append([
+                name,
+                _describe_field(field),
+                _describe_annotation(annotation, model_fingerprints)
+            ])
+        fingerprint = model_fingerprints[model] = json.dumps(description, default=_stable_repr)
+    return fingerprint
+
+
+def _describe_class(cls: type) -> Tuple[List[Any], List[Any]]:
+    # Returns the values in a class' schema (which aren't part of its repr), along with the annotations it contains
+    if issubclass(cls, Enum):
+        return [cls.__doc__, [(name, member.value) for name, member in cls.__members__.items()]], []
+    if dataclasses.is_dataclass(cls):
+        fields = dataclasses.fields(cls)
+        return (
+            [cls.__doc__, [(field.name, field.default, field.default_factory) for field in fields]],
+            [field.type for field in fields]
+        )
+    if is_typeddict(cls) or (issubclass(cls, tuple) and hasattr(cls, '_fields')):
+        annotations = getattr(cls, '__annotations__', {})
+        required_keys = getattr(cls, '__required_keys__', None)
+        return (
+            [cls.__doc__, list(annotations), sorted(required_keys or ()), getattr(cls, '_field_defaults', None)],
+            list(annotations.values())
+        )
+    return [], []
+
+
+def _describe_annotation(annotation: Any, model_fingerprints: Dict[Any, str]) -> List[str]:
+    description = [_stable_repr(annotation)]
+    stack = [annotation]
+    described_classes: Set[type] = set()
+    while stack:
+        value = stack.pop()
+        if isinstance(value, type) and issubclass(value, pydantic.BaseModel):
+            description.append(_get_model_fingerprint(value, model_fingerprints))
+        elif isinstance(value, type):
+            if value not in described_classes:
+                described_classes.add(value)
+                class_description, annotations = _describe_class(value)
+                if class_description:
+                    description.append(_stable_repr(class_description))
+                stack.extend(annotations)
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        else:
+            stack.extend(get_args(value))
+    return description
+
+
+def _get_response_class_name(response_class: Any) -> str:
+    if isinstance(response_class, DefaultPlaceholder):
+        response_class = response_class.value
+    return f'{response_class.__module__}.{response_class.__qualname__}'
+
+
+def _describe_route(route: BaseRoute, model_fingerprints: Dict[Any, str]) -> List[Any]:
+    if not isinstance(route, APIRoute):
+        return [type(route).__name__, getattr(route, 'path', None)]
+
+    endpoint = route.endpoint
+    description: List[Any] = [
+        route.path_format,
+        sorted(route.methods),
+        f'{endpoint.__module__}.{endpoint.__qualname__}',
+        endpoint.__doc__,
+        route.name,
+        route.unique_id,
+        route.summary,
+        route.description,
+        route.response_description,
+        [tag.value if isinstance(tag, Enum) else tag for tag in route.tags or ()],
+        route.deprecated,
+        route.operation_id,
+        route.include_in_schema,
+        route.status_code,
+        route.openapi_extra,
+        _get_response_class_name(route.response_class),
+        _describe_annotation(route.response_model, model_fingerprints),
+        _describe_annotation(route.responses, model_fingerprints),
+        [getattr(callback, 'path', None) for callback in route.callbacks or ()]
+    ]
+
+    dependant = get_flat_dependant(route.dependant, skip_repeats=True)
+    for params in (
+        dependant.path_params,
+        dependant.query_params,
+        dependant.header_params,
+        dependant.cookie_params,
+        dependant.body_params
+    ):
+        for param in params:
+            description.append([
+                param.name,
+                param.alias,
+                _stable_repr(param.field_info),
+                _describe_annotation(getattr(param, 'type_', None), model_fingerprints)
+            ])
+    for security_requirement in dependant.security_requirements:
+        description.append([
+            repr(security_requirement.security_scheme.model),
+            security_requirement.security_scheme.scheme_name,
+            security_requirement.scopes
+        ])
+
+    return description
+
+
+def fingerprint_openapi(openapi_params: Dict[str, Any], model_fingerprints: Dict[Any, str]) -> str:
+    """
+    Returns a fingerprint of everything a schema is generated from: the given parameters and, for each route,
+    its path, methods, endpoint identity, parameters and models (by their fields and config).
+    Models already fingerprinted, e.g. for another version, are looked up in model_fingerprints.
+    """
+
+    hasher = hashlib.blake2b(digest_size=20)
+
+    def update(value: Any) -> None:
+        hasher.update(repr(value).encode('utf-8'))
+        hasher.update(b'\0')
+
+    update([_FINGERPRINT_VERSION, fastapi.__version__, pydantic.VERSION])
+    for key, value in sorted(openapi_params.items()):
+        if key not in ('routes', 'webhooks'):
+            update([key, value])
+    for key in ('routes', 'webhooks'):
+        for route in openapi_params.get(key) or ():
+            update(_describe_route(route, model_fingerprints))
+
+    return hasher.hexdigest()
+
+
+class OpenAPIFileCache:
+    """
+    Content-addressed store of serialized schemas, as files (named by fingerprint) in a directory,
+    which can be shared by every worker on a host, and kept across deploys.
+    Files are written to a temporary file first, then atomically renamed, so a partial file is never read.
+    """
+
+    def __init__(self, directory: Union[str, 'os.PathLike[str]']):
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, fingerprint: str) -> Union[bytes, None]:
+        """
+        Returns the schema stored for the given fingerprint, or None if there is none
+        """
+
+        try:
+            with open(self._get_path(fingerprint), 'rb') as schema_file:
+                return schema_file.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, fingerprint: str, body: bytes) -> None:
+        """
+        Stores the given schema for the given fingerprint. Failures (e.g. a read-only directory) are only logged.
+        """
+
+        path = self._get_path(fingerprint)
+        try:
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self._directory, prefix=f'.{fingerprint}.', suffix='.tmp')
+            try:
+                with os.fdopen(file_descriptor, 'wb') as temp_file:
+                    temp_file.write(body)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError:
+            logger.warning('Failed to store schema in the OpenAPI cache: %s', path, exc_info=True)
+
+    def _get_path(self, fingerprint: str) -> str:
+        return os.path.join(self._directory, f'{fingerprint}.json')
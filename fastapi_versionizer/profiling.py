@@ -0,0 +1,86 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+
+class StartupProfiler:
+    """
+    Records the wall time and memory allocated (via tracemalloc) while versioning an app,
+    for each version router and each route added to it
+    """
+
+    def __init__(self) -> None:
+        self._versions: List[Dict[str, Any]] = []
+        self._routes: List[Dict[str, Any]] = []
+        self._started_tracing = False
+        self._start_time = 0.0
+        self._start_bytes = 0
+        self._total_seconds = 0.0
+        self._total_allocated_bytes = 0
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._start_bytes = tracemalloc.get_traced_memory()[0]
+        self._start_time = time.perf_counter()
+
+    def stop(self) -> None:
+        self._total_seconds = time.perf_counter() - self._start_time
+        self._total_allocated_bytes = tracemalloc.get_traced_memory()[0] - self._start_bytes
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def measure_version(self, version: str, version_prefix: str) -> Iterator[Dict[str, Any]]:
+        """
+        Measures the building of a version router. The yielded entry can be updated with extra details.
+        """
+
+        entry: Dict[str, Any] = {'version': version, 'version_prefix': version_prefix}
+        with self._measure(entry):
+            yield entry
+        self._versions.append(entry)
+
+    @contextmanager
+    def measure_route(self, version: str, version_prefix: str, path: str, methods: str) -> Iterator[None]:
+        entry: Dict[str, Any] = {'version': version, 'version_prefix': version_prefix, 'path': path, 'methods': methods}
+        with self._measure(entry):
+            yield
+        self._routes.append(entry)
+
+    @contextmanager
+    def measure(self, entry: Dict[str, Any], key: str) -> Iterator[None]:
+        """
+        Adds the time spent in the block to the given entry, under the given key
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry[key] = entry.get(key, 0.0) + time.perf_counter() - start
+
+    def report(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Returns a report with the slowest versions and routes, slowest first
+        """
+
+        return {
+            'total_seconds': self._total_seconds,
+            'total_allocated_bytes': self._total_allocated_bytes,
+            'slowest_versions': sorted(self._versions, key=lambda entry: -entry['seconds'])[:top],
+            'slowest_routes': sorted(self._routes, key=lambda entry: -entry['seconds'])[:top]
+        }
+
+    @contextmanager
+    def _measure(self, entry: Dict[str, Any]) -> Iterator[None]:
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry['seconds'] = time.perf_counter() - start
+            entry['allocated_bytes'] = tracemalloc.get_traced_memory()[0] - start_bytes
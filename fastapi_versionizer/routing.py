@@ -0,0 +1,38 @@
+from starlette.datastructures import URLPath
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Any, Dict, Tuple
+
+try:
+    from starlette._utils import get_route_path
+except ImportError:  # pragma: no cover
+    # Before Starlette 0.33, paths were already relative to the root path
+    def get_route_path(scope: Scope) -> str:
+        return str(scope['path'])
+
+
+class VersionMount(BaseRoute):
+    """
+    Route serving every path under a version prefix with a separate ASGI app (e.g. a FastAPI sub-application).
+
+    Unlike Starlette's Mount, the scope is passed through unchanged, so the app's routes keep their prefixed paths
+    (i.e. they are matched, and build URLs, exactly as if they had been included in the parent app).
+    """
+
+    def __init__(self, prefix: str, app: ASGIApp):
+        self.path = prefix
+        self.app = app
+        self._prefix_with_slash = prefix + '/'
+
+    def matches(self, scope: Scope) -> Tuple[Match, Dict[str, Any]]:
+        if scope['type'] in ('http', 'websocket'):
+            route_path = get_route_path(scope)
+            if route_path == self.path or route_path.startswith(self._prefix_with_slash):
+                return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params: Any) -> URLPath:
+        return self.app.router.url_path_for(name, **path_params)  # type: ignore[attr-defined, no-any-return]
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.app(scope, receive, send)
@@ -0,0 +1,83 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+from typing import Callable, Dict, Mapping, Tuple, Union
+
+_MAGIC = b'FVSTORE1'
+_HEADER = struct.Struct('<8sI')
+
+
+class SharedStore:
+    """
+    Pre-serialized artifacts (e.g. schemas and docs pages), written once to a single file and memory-mapped,
+    so every worker on a host serves the same pages (through the OS page cache), instead of its own copy.
+
+    Files are named by a key identifying their content, so workers (and restarts) with the same artifacts reuse
+    the same file, and only the first one builds it. Files are written to a temporary file, then atomically renamed.
+    """
+
+    def __init__(self, directory: Union[str, 'os.PathLike[str]']):
+        self._directory = directory
+        self._mmap: Union[mmap.mmap, None] = None
+        self._index: Dict[str, Tuple[int, int]] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self, key: str, build: Callable[[], Mapping[str, bytes]]) -> bool:
+        """
+        Maps the file for the given key, after building and writing it (with build) if it does not exist yet.
+
+        :returns: whether the file already existed
+        """
+
+        path = os.path.join(self._directory, f'{key}.store')
+        existed = os.path.exists(path)
+        if not existed:
+            self._write(path, build())
+
+        with open(path, 'rb') as store_file:
+            self._mmap = mmap.mmap(store_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, index_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            raise ValueError(f'Invalid shared store file: {path}')
+        data_offset = _HEADER.size + index_length
+        self._index = {
+            name: (data_offset + offset, length)
+            for name, (offset, length) in json.loads(self._mmap[_HEADER.size:data_offset]).items()
+        }
+        return existed
+
+    def get(self, name: str) -> Union[memoryview, None]:
+        """
+        Returns a view of the given artifact, backed by the mapped file (i.e. without copying it), or None if missing
+        """
+
+        location = self._index.get(name)
+        if location is None or self._mmap is None:
+            return None
+
+        offset, length = location
+        return memoryview(self._mmap)[offset:offset + length]
+
+    def _write(self, path: str, artifacts: Mapping[str, bytes]) -> None:
+        # The index maps names to offsets from the start of the data, which follows the header and the index
+        locations: Dict[str, Tuple[int, int]] = {}
+        offset = 0
+        for name, body in artifacts.items():
+            locations[name] = (offset, len(body))
+            offset += len(body)
+        index = json.dumps(locations).encode('utf-8')
+
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self._directory, prefix='.store.', suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as temp_file:
+                temp_file.write(_HEADER.pack(_MAGIC, len(index)))
+                temp_file.write(index)
+                for body in artifacts.values():
+                    temp_file.write(body)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
@@ -0,0 +1,114 @@
+import anyio
+import anyio.to_thread
+import functools
+from fastapi.dependencies.utils import get_typed_signature
+from typing import Any, Callable, Dict, List, Mapping, Sequence, TypeVar, Union
+
+from fastapi_versionizer.metrics import format_labels
+
+T = TypeVar('T')
+
+
+class VersionThreadPool:
+    """
+    Worker threads dedicated to the sync endpoints of one or more versions, instead of AnyIO's default limiter
+    (40 threads), which every other sync endpoint and dependency shares.
+
+    The same pool can be given for several versions (e.g. a range of legacy versions), which then share its threads.
+    The limiter is created on first use, since AnyIO limiters can only be created inside an event loop.
+    """
+
+    def __init__(self, name: str, total_tokens: int = 10):
+        """
+        :param name:
+            Name of the pool, used in its metrics
+        :param total_tokens:
+            Maximum number of endpoint calls running (in threads) at once. Further calls wait for one to finish.
+        """
+        if total_tokens < 1:
+            raise ValueError('total_tokens must be at least 1')
+
+        self.name = name
+        self.total_tokens = total_tokens
+        self._limiter: Union[anyio.CapacityLimiter, None] = None
+        self._calls = 0
+        self._saturated_calls = 0
+
+    @property
+    def limiter(self) -> anyio.CapacityLimiter:
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.total_tokens)
+        return self._limiter
+
+    async def run_sync(self, func: Callable[[], T]) -> T:
+        limiter = self.limiter
+        self._calls += 1
+        if limiter.available_tokens < 1:
+            self._saturated_calls += 1
+        return await anyio.to_thread.run_sync(func, limiter=limiter)
+
+    def collect(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the pool's usage, for use by custom exporters
+        """
+
+        statistics = self._limiter.statistics() if self._limiter is not None else None
+        return {
+            'name': self.name,
+            'total_tokens': self.total_tokens,
+            'borrowed_tokens': statistics.borrowed_tokens if statistics is not None else 0,
+            'tasks_waiting': statistics.tasks_waiting if statistics is not None else 0,
+            'calls': self._calls,
+            'saturated_calls': self._saturated_calls
+        }
+
+
+def build_threadpool_endpoint(endpoint: Callable[..., Any], threadpool: VersionThreadPool) -> Callable[..., Any]:
+    """
+    Wraps a sync endpoint, so FastAPI awaits it in the given pool rather than the default one.
+    Since the wrapper is async, FastAPI serializes (and validates) its response on the event loop,
+    rather than in a worker thread.
+    """
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await threadpool.run_sync(functools.partial(endpoint, *args, **kwargs))
+
+    # FastAPI resolves string annotations (e.g. with postponed evaluation) against the wrapper's module,
+    # so the endpoint's annotations are resolved here, against its own module
+    setattr(wrapper, '__signature__', get_typed_signature(endpoint))
+    return wrapper
+
+
+def render_threadpool_prometheus(
+    threadpools: Mapping[VersionThreadPool, Sequence[str]],
+    namespace: str = 'versionizer'
+) -> str:
+    """
+    Renders the usage of the given pools (with the versions using each one) in the Prometheus text exposition format
+    """
+
+    metric_definitions = [
+        ('threadpool_tokens', 'gauge', 'Number of threads of each pool.', 'total_tokens'),
+        ('threadpool_borrowed_tokens', 'gauge', 'Number of threads in use in each pool.', 'borrowed_tokens'),
+        ('threadpool_waiting_tasks', 'gauge', 'Number of calls waiting for a thread in each pool.', 'tasks_waiting'),
+        ('threadpool_calls_total', 'counter', 'Total number of calls run in each pool.', 'calls'),
+        (
+            'threadpool_saturated_calls_total',
+            'counter',
+            'Total number of calls which found every thread of their pool in use.',
+            'saturated_calls'
+        )
+    ]
+    snapshot = [
+        (format_labels({'pool': threadpool.name, 'versions': ','.join(versions)}), threadpool.collect())
+        for threadpool, versions in threadpools.items()
+    ]
+
+    lines: List[str] = []
+    for name, metric_type, description, field in metric_definitions:
+        lines.extend([f'# HELP {namespace}_{name} {description}', f'# TYPE {namespace}_{name} {metric_type}'])
+        for labels, series in snapshot:
+            lines.append(f'{namespace}_{name}{{{labels}}} {series[field]}')
+
+    return '\n'.join(lines) + '\n'
@@ -1,16 +1,66 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import re
 from collections import defaultdict
+from contextlib import nullcontext
+from datetime import datetime
 from enum import Enum
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, HTTPException, Request
 from fastapi.openapi.docs import get_redoc_html
 from fastapi.openapi.docs import get_swagger_ui_html, get_swagger_ui_oauth2_redirect_html
 import fastapi.openapi.utils
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from fastapi.routing import APIRoute, APIWebSocketRoute
 from natsort import natsorted
-from typing import Any, Callable, Dict, List, Tuple, TypeVar, Union, cast, Set
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import BaseRoute, Mount, WebSocketRoute
+from typing import (
+    Any, Awaitable, Callable, Collection, ContextManager, Dict, List, Mapping, Sequence, Tuple, TypeVar, Union, cast,
+    Set
+)
+
+from fastapi_versionizer.bulkheads import Bulkhead, BulkheadMiddleware
+from fastapi_versionizer.caching import (
+    CacheStore, ETagMiddleware, LRUCacheStore, ResponseCacheMiddleware, etag_matches
+)
+from fastapi_versionizer.deprecation import (
+    DeprecationHeadersMiddleware,
+    DeprecationTelemetry,
+    DeprecationTelemetryMiddleware,
+    build_deprecation_headers
+)
+from fastapi_versionizer.docs import DocsAssets, StaticResponder, get_swagger_ui_selector_html
+from fastapi_versionizer.metrics import MetricsMiddleware, VersionMetrics
+from fastapi_versionizer.migrations import build_migrated_endpoint, get_migrations, has_response_migration
+from fastapi_versionizer.openapi import (
+    OpenAPIFileCache, SplitOpenAPI, TagShards, VersionRoutes, build_deduplicated_openapi, build_split_openapi,
+    dump_openapi, fingerprint_openapi, get_openapi_params as get_app_openapi_params
+)
+from fastapi_versionizer.profiling import StartupProfiler
+from fastapi_versionizer.routing import VersionMount
+from fastapi_versionizer.shared_store import SharedStore
+from fastapi_versionizer.threadpools import (
+    VersionThreadPool, build_threadpool_endpoint, render_threadpool_prometheus
+)
 
 CallableT = TypeVar('CallableT', bound=Callable[..., Any])
 
+logger = logging.getLogger(__name__)
+
+
+class _BytesResponse(Response):
+    """
+    Serves a body that is already serialized as is, including memoryviews (e.g. of a shared memory mapping),
+    which Response.render() doesn't accept on older Starlette versions (e.g. 0.27)
+    """
+
+    def render(self, content: Any) -> Union[bytes, memoryview]:
+        return cast(Union[bytes, memoryview], content)
+
 
 def api_version(
     major: int,
@@ -51,7 +101,30 @@ class Versionizer:
         include_version_openapi_route: bool = True,
         include_versions_route: bool = False,
         sort_routes: bool = False,
-        callback: Union[Callable[[APIRouter, Tuple[int, int], str], None], None] = None
+        callback: Union[Callable[[APIRouter, Tuple[int, int], str], None], None] = None,
+        cache_store: Union[CacheStore, None] = None,
+        etag_versions: Union[bool, Collection[Tuple[int, int]]] = False,
+        metrics: Union[VersionMetrics, None] = None,
+        include_metrics_route: bool = False,
+        deprecation_telemetry: Union[DeprecationTelemetry, None] = None,
+        include_deprecations_route: bool = False,
+        include_deprecation_headers: bool = False,
+        deprecation_dates: Union[Mapping[Tuple[int, int], datetime], None] = None,
+        sunset_dates: Union[Mapping[Tuple[int, int], datetime], None] = None,
+        deprecation_link: Union[str, None] = None,
+        profile_startup: bool = False,
+        docs_cache_max_age: int = 3600,
+        version_docs_url: Union[str, None] = None,
+        docs_assets: Union[DocsAssets, None] = None,
+        deduplicate_main_openapi: bool = False,
+        include_latest_in_main_openapi: bool = True,
+        split_version_openapi: bool = False,
+        shard_version_openapi_by_tag: bool = False,
+        openapi_cache_dir: Union[str, 'os.PathLike[str]', None] = None,
+        shared_store_dir: Union[str, 'os.PathLike[str]', None] = None,
+        mount_versions: bool = False,
+        bulkheads: Union[Mapping[Tuple[int, int], Bulkhead], None] = None,
+        threadpools: Union[Mapping[Tuple[int, int], VersionThreadPool], None] = None
     ):
         """
         :param app:
@@ -87,6 +160,90 @@ class Versionizer:
                 - Version router
                 - Version (in tuple form)
                 - Version path prefix
+        :param cache_store:
+            Store used to cache the responses of routes annotated with @api_cache.
+            Defaults to an in-memory LRUCacheStore.
+        :param etag_versions:
+            If True, GET routes in all versions will respond with strong ETags and support conditional requests
+            (i.e. "If-None-Match"). A collection of versions (in tuple form) can also be given instead.
+            ETags are computed from the response body, unless the route sets its own ETag header.
+        :param metrics:
+            If this is given, request counts and latencies will be recorded for each (version, route, method).
+        :param include_metrics_route:
+            If True (and metrics is given), a "GET /metrics" route will be added, which exposes the metrics
+            in the Prometheus text format
+        :param deprecation_telemetry:
+            If this is given, calls to deprecated routes (and routes marked for removal) will be recorded,
+            along with the clients that made them, for each version
+        :param include_deprecations_route:
+            If True (and deprecation_telemetry is given), a "GET /deprecations" route will be added,
+            which reports the usage of deprecated routes
+        :param include_deprecation_headers:
+            If True, responses from deprecated routes will include a "Deprecation" header, and responses
+            from routes marked for removal will include a "Sunset" header (if a sunset date is given)
+        :param deprecation_dates:
+            Dates used in the "Deprecation" header, by the version (in tuple form) routes are deprecated in.
+            If a date is not given, the header's value is "true".
+        :param sunset_dates:
+            Dates used in the "Sunset" header, by the version (in tuple form) routes are removed in
+        :param deprecation_link:
+            If this is given, a "Link" header pointing to it (e.g. a migration guide) will be added
+            alongside the "Deprecation" and "Sunset" headers
+        :param profile_startup:
+            If True, versionize() will record the wall time and memory allocated for each version router
+            (including the callback) and each route. The report, listing the slowest versions and routes,
+            is logged and available via the "startup_report" attribute.
+        :param docs_cache_max_age:
+            Max age (in seconds) of the "Cache-Control" header for version docs pages.
+            These pages are rendered once, when versionize() is called, and also served with an ETag.
+        :param version_docs_url:
+            If this is given, a single docs page will be served at this path, with a selector listing
+            every version's openapi route, instead of docs pages for each version.
+            This requires include_version_openapi_route to be True.
+        :param docs_assets:
+            If this is given, docs pages (including the main docs pages) will load Swagger UI and ReDoc
+            from these assets, served by the app itself, instead of a CDN
+        :param deduplicate_main_openapi:
+            If True, the root schema will be generated by the versionizer rather than FastAPI. Each path
+            that is identical across versions is only generated once, and referenced (with "$ref") by the others.
+        :param include_latest_in_main_openapi:
+            If False (and deduplicate_main_openapi is True), the "latest" alias' routes will be left out of
+            the root schema, since they duplicate the latest version's routes
+        :param split_version_openapi:
+            If True, the components (e.g. models) shared by versions will be served in a separate document,
+            whose URL contains a hash of its content, and each version's openapi route will only include
+            its paths (and components specific to it), referencing the shared components by URL.
+            The documents are generated once, on first use.
+        :param shard_version_openapi_by_tag:
+            If True, each version's schema will also be served in shards, one per tag
+            (e.g. "GET /v1/openapi/tags/Users.json"), along with an index listing them ("GET /v1/openapi/tags.json").
+            Each shard is generated once, on first use.
+        :param openapi_cache_dir:
+            If this is given, each version's schema will be stored in this directory, as a file named by a
+            fingerprint of everything it is generated from (e.g. paths, methods, endpoints and models).
+            When versionize() is called, versions whose fingerprint matches a stored file load it instead
+            of being regenerated. The directory can be shared by several workers, and kept across deploys.
+        :param shared_store_dir:
+            If this is given, each version's schema and the docs pages will be written once to a single file
+            in this directory, named by a fingerprint of their content, and served from a memory mapping of it.
+            Workers on the same host use the same file, so they share its pages (through the OS page cache),
+            instead of each keeping its own copy.
+        :param mount_versions:
+            If True, each version will be served by its own sub-application, mounted at the version prefix,
+            instead of including every version's routes in the app's router. Requests are then matched against
+            the version prefixes first, and only the requested version's routes after that
+            (so paths under a version prefix never reach routes added to the app afterwards).
+            Each sub-application has its own middleware stack (see get_version_app()), a copy of the app's
+            exception handlers (as of calling versionize()), and caches its own schema.
+        :param bulkheads:
+            Concurrency limits, by version (in tuple form). Every HTTP route of a version (including its
+            "latest" alias) shares the version's limit, and requests beyond it (and its queue) get a 503 response,
+            so a saturated version can't exhaust the capacity of the others.
+        :param threadpools:
+            Thread pools for sync endpoints, by version (in tuple form). The same pool can be given for several
+            versions, which then share it. Sync endpoints of these versions (including the "latest" alias)
+            run in their version's pool, rather than AnyIO's default one, so blocking endpoints in one version
+            can't starve the others. If the metrics route is included, each pool's usage is also exposed there.
         """
         self._app = app
         self._original_app_routes = app.routes
@@ -101,45 +258,283 @@ class Versionizer:
         self._include_versions_route = include_versions_route
         self._sort_routes = sort_routes
         self._callback = callback
+        self._cache_store = cache_store
+        self._etag_versions = etag_versions
+        self._metrics = metrics
+        self._include_metrics_route = include_metrics_route
+        self._deprecation_telemetry = deprecation_telemetry
+        self._include_deprecations_route = include_deprecations_route
+        self._include_deprecation_headers = include_deprecation_headers
+        self._deprecation_dates = deprecation_dates or {}
+        self._sunset_dates = sunset_dates or {}
+        self._deprecation_link = deprecation_link
+        self._profile_startup = profile_startup
+        self._docs_cache_max_age = docs_cache_max_age
+        self._version_docs_url = version_docs_url
+        self._docs_assets = docs_assets
+        self._deduplicate_main_openapi = deduplicate_main_openapi
+        self._include_latest_in_main_openapi = include_latest_in_main_openapi
+        self._split_version_openapi = split_version_openapi
+        self._shard_version_openapi_by_tag = shard_version_openapi_by_tag
+        self._version_routes: List[VersionRoutes] = []
+        self._version_openapi_builders: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._split_openapi: Union[SplitOpenAPI, None] = None
+        self._openapi_cache = OpenAPIFileCache(openapi_cache_dir) if openapi_cache_dir is not None else None
+        self._version_openapi_params: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._version_openapi_fingerprints: Dict[str, str] = {}
+        self._version_openapi_bodies: Dict[str, Union[bytes, memoryview]] = {}
+        # Versions whose schema was generated, but not written to the OpenAPI cache yet
+        self._unstored_openapi_prefixes: Set[str] = set()
+        self._shared_store = SharedStore(shared_store_dir) if shared_store_dir is not None else None
+        self._static_responders: Dict[str, StaticResponder] = {}
+        self._versions: Union[List[Tuple[int, int]], None] = None
+        self._mount_versions = mount_versions
+        self._bulkheads = bulkheads or {}
+        self._threadpools = threadpools or {}
+        # Wrapped endpoints, by (endpoint, pool), so versions sharing a pool keep sharing each endpoint
+        self._threadpool_endpoints: Dict[Tuple[Callable[..., Any], VersionThreadPool], Callable[..., Any]] = {}
+        self._version_apps: Dict[str, FastAPI] = {}
+        # Prefixed routes served by each version's mount, by the mount's id
+        self._version_mounts: Dict[int, List[BaseRoute]] = {}
+        self._profiler: Union[StartupProfiler, None] = None
+        self.startup_report: Union[Dict[str, Any], None] = None
 
         self._strip_routes()
 
     def versionize(self) -> List[Tuple[int, int]]:
         """
-        Versions your FastAPI application, in place.
+        Versions your FastAPI application, in place. Calling this again has no effect.
 
         :returns: list of all versions (each in tuple form)
         """
 
+        if self._versions is not None:
+            return self._versions
+
+        if self._profile_startup:
+            self._profiler = StartupProfiler()
+            self._profiler.start()
+
+        # Profiling (i.e. tracemalloc) is stopped even if versioning fails, as it slows down every allocation
+        try:
+            versions = self._versionize()
+        finally:
+            profiler, self._profiler = self._profiler, None
+            if profiler is not None:
+                profiler.stop()
+
+        if profiler is not None:
+            self.startup_report = profiler.report()
+            self._log_startup_report(startup_report=self.startup_report)
+
+        self._versions = versions
+        return versions
+
+    def _versionize(self) -> List[Tuple[int, int]]:
         version, routes_by_key = None, None
         routes_by_version = self._get_routes_by_version()
         versions = list(routes_by_version.keys())
         for version, routes_by_key in routes_by_version.items():
             major, minor = version
             version_prefix = self._prefix_format.format(major=major, minor=minor)
+            self._add_version(version=version, version_prefix=version_prefix, routes_by_key=routes_by_key)
+
+        if self._latest_prefix is not None and routes_by_key and version:
+            self._add_version(version=version, version_prefix=self._latest_prefix, routes_by_key=routes_by_key)
+
+        if self._version_docs_url is not None:
+            self._add_version_docs_selector(versions=versions)
+
+        if self._docs_assets is not None:
+            self._add_docs_assets(docs_assets=self._docs_assets)
+
+        if self._openapi_cache is not None or self._shared_store is not None:
+            self._fingerprint_version_openapi()
+
+        if self._openapi_cache is not None:
+            self._load_cached_openapi(openapi_cache=self._openapi_cache)
+
+        if self._split_version_openapi and self._version_openapi_builders:
+            self._add_openapi_components_route()
+
+        if self._deduplicate_main_openapi:
+            self._app.openapi_schema = None
+            self._app.openapi = self._get_main_openapi  # type: ignore[method-assign]
+        elif self._mount_versions:
+            self._app.openapi_schema = None
+            self._app.openapi = self._get_mounted_main_openapi  # type: ignore[method-assign]
+
+        if self._include_versions_route:
+            self._add_versions_route(versions=versions)
+
+        if self._include_metrics_route and self._metrics is not None:
+            self._add_metrics_route(metrics=self._metrics)
+
+        if self._include_deprecations_route and self._deprecation_telemetry is not None:
+            self._add_deprecations_route(deprecation_telemetry=self._deprecation_telemetry)
+
+        if self._shared_store is not None:
+            self._open_shared_store(shared_store=self._shared_store)
+
+        return versions
+
+    def get_route_plan(self) -> Dict[str, Any]:
+        """
+        Returns the routes served by each version (including the "latest" alias), and the unversioned routes,
+        in a JSON-compatible form. versionize() must be called first.
+
+        Each route's regex is portable (i.e. without named groups), so gateways can use this as a route table
+        (see fastapi_versionizer.gateway).
+        """
+
+        versioned_routes: Set[int] = set()
+        version_plans = []
+        for version_routes in self._version_routes:
+            versioned_routes.update(id(route) for route in version_routes.routes)
+            version_plans.append({
+                'version': self._semantic_version_format.format(
+                    major=version_routes.version[0], minor=version_routes.version[1]),
+                'version_prefix': version_routes.version_prefix,
+                'latest': version_routes.latest,
+                'routes': [self._get_route_plan_entry(route) for route in version_routes.routes]
+            })
+
+        return {
+            'redirect_slashes': self._app.router.redirect_slashes,
+            'versions': version_plans,
+            'unversioned_routes': [
+                self._get_route_plan_entry(route)
+                for route in self._app.router.routes
+                if id(route) not in versioned_routes and id(route) not in self._version_mounts
+            ]
+        }
+
+    @staticmethod
+    def _get_route_plan_entry(route: BaseRoute) -> Dict[str, Any]:
+        if isinstance(route, WebSocketRoute):
+            kind, methods = 'websocket', None
+        elif isinstance(route, Mount):
+            kind, methods = 'mount', None
+        else:
+            kind, methods = 'http', sorted(getattr(route, 'methods', None) or ())
+        path_regex = getattr(route, 'path_regex', None)
+        return {
+            'path': getattr(route, 'path', None),
+            'regex': re.sub(r'\(\?P<\w+>', '(', path_regex.pattern) if path_regex is not None else None,
+            'name': getattr(route, 'name', None),
+            'kind': kind,
+            'methods': methods,
+            'deprecated': bool(getattr(route, 'deprecated', False)),
+            'include_in_schema': bool(getattr(route, 'include_in_schema', False))
+        }
+
+    def get_version_app(self, version_prefix: str) -> Union[FastAPI, None]:
+        """
+        Returns the sub-application serving the given version, if mount_versions is True.
+        Middleware added to it (before the app is started) only applies to that version.
+        """
+
+        return self._version_apps.get(version_prefix)
+
+    def get_unrendered_version_prefixes(self) -> List[str]:
+        """
+        Returns the versions whose schema render_version_openapi() still has to generate on its own, i.e. the
+        versions worth rendering in parallel. Split schemas are generated together instead, and schemas can also
+        have been loaded (from the OpenAPI cache) or rendered already (e.g. into the shared store).
+        """
+
+        if self._split_version_openapi:
+            return []
+        return [
+            version_prefix for version_prefix in self._version_openapi_builders
+            if version_prefix not in self._version_openapi_bodies
+        ]
+
+    def render_version_openapi(self, version_prefix: str) -> Dict[str, Tuple[str, bytes]]:
+        """
+        Renders the schema served by the given version (if any), as {path: (content type, body)}.
+        This is where most of the work is, so versions can be rendered in parallel (e.g. by separate processes).
+        """
+
+        if version_prefix not in self._version_openapi_builders:
+            return {}
+
+        if self._split_version_openapi:
+            body = self._get_split_openapi().version_bodies[version_prefix]
+        else:
+            body = bytes(self._get_version_openapi_body(version_prefix))
+        self._store_generated_openapi()
+        return {version_prefix + cast(str, self._app.openapi_url): ('application/json', body)}
+
+    def render_app_artifacts(self) -> Dict[str, Tuple[str, bytes]]:
+        """
+        Renders every other response that can be computed ahead of time (i.e. the root schema, the docs pages,
+        the versions route and shared components), as {path: (content type, body)}
+        """
+
+        artifacts = {
+            path: (responder.content_type, bytes(responder.body))
+            for path, responder in self._static_responders.items()
+        }
+        if self._include_main_openapi_route and self._app.openapi_url is not None:
+            artifacts[self._app.openapi_url] = ('application/json', dump_openapi(self._app.openapi()))
+        if self._split_version_openapi and self._version_openapi_builders:
+            split_openapi = self._get_split_openapi()
+            artifacts[self._get_openapi_components_path().format(digest=split_openapi.digest)] = (
+                'application/json', split_openapi.components_body)
+            self._store_generated_openapi()
+        return artifacts
+
+    def _add_version(
+        self,
+        version: Tuple[int, int],
+        version_prefix: str,
+        routes_by_key: Dict[Tuple[str, str], Union[APIRoute, APIWebSocketRoute]]
+    ) -> None:
+        profiler = self._profiler
+        version_str = self._semantic_version_format.format(major=version[0], minor=version[1])
+        measure_version: ContextManager[Dict[str, Any]] = \
+            profiler.measure_version(version_str, version_prefix) if profiler else nullcontext({})
+        with measure_version as entry:
             version_router = self._build_version_router(
                 version=version,
                 version_prefix=version_prefix,
                 routes_by_key=routes_by_key
             )
             if self._callback:
-                self._callback(version_router, version, version_prefix)
-            self._app.include_router(router=version_router)
+                measure_callback: ContextManager[None] = \
+                    profiler.measure(entry, 'callback_seconds') if profiler else nullcontext()
+                with measure_callback:
+                    self._callback(version_router, version, version_prefix)
+            self._include_version_router(router=version_router, version=version, version_prefix=version_prefix)
+            entry['num_routes'] = len(version_router.routes)
 
-        if self._latest_prefix is not None and routes_by_key and version:
-            latest_router = self._build_version_router(
-                version=version,
-                version_prefix=self._latest_prefix,
-                routes_by_key=routes_by_key
+    @staticmethod
+    def _log_startup_report(startup_report: Dict[str, Any]) -> None:
+        logger.info(
+            'Versioned app in %.3fs (%d bytes allocated)',
+            startup_report['total_seconds'],
+            startup_report['total_allocated_bytes']
+        )
+        for entry in startup_report['slowest_versions']:
+            logger.info(
+                'Version %s (%s): %.3fs, %d bytes allocated, %d routes, %.3fs in callback',
+                entry['version'],
+                entry['version_prefix'],
+                entry['seconds'],
+                entry['allocated_bytes'],
+                entry['num_routes'],
+                entry.get('callback_seconds', 0.0)
+            )
+        for entry in startup_report['slowest_routes']:
+            logger.info(
+                'Route %s %s%s: %.3fs, %d bytes allocated',
+                entry['methods'],
+                entry['version_prefix'],
+                entry['path'],
+                entry['seconds'],
+                entry['allocated_bytes']
             )
-            if self._callback:
-                self._callback(latest_router, version, self._latest_prefix)
-            self._app.include_router(router=latest_router)
-
-        if self._include_versions_route:
-            self._add_versions_route(versions=versions)
-
-        return versions
 
     def _build_api_url(self, version_prefix: str, path: str) -> str:
         root_path = (self._app.root_path or '').rstrip('/')
@@ -156,7 +551,14 @@ class Versionizer:
         )
         routes_by_key = dict(natsorted(routes_by_key.items())) if self._sort_routes else routes_by_key
         for route in routes_by_key.values():
-            self._add_route_to_router(route=route, router=router, version=version)
+            measure_route: ContextManager[None] = self._profiler.measure_route(
+                version=self._semantic_version_format.format(major=version[0], minor=version[1]),
+                version_prefix=version_prefix,
+                path=route.path,
+                methods=','.join(sorted(getattr(route, 'methods', None) or ()))
+            ) if self._profiler else nullcontext()
+            with measure_route:
+                self._add_route_to_router(route=route, router=router, version=version)
 
         self._add_version_docs(
             router=router,
@@ -166,6 +568,119 @@ class Versionizer:
 
         return router
 
+    def _include_version_router(self, router: APIRouter, version: Tuple[int, int], version_prefix: str) -> None:
+        num_routes = len(self._app.router.routes)
+        self._app.include_router(router=router)
+
+        # Routes are re-created when included, so they are wrapped afterwards
+        for route in self._app.router.routes[num_routes:]:
+            if isinstance(route, APIRoute):
+                self._wrap_route(route=route, version=version, version_prefix=version_prefix)
+
+        routes = self._app.router.routes[num_routes:]
+        self._version_routes.append(VersionRoutes(
+            version=version,
+            version_prefix=version_prefix,
+            routes=routes,
+            latest=version_prefix == self._latest_prefix
+        ))
+
+        if self._mount_versions:
+            # Routes are still included first, so they are built exactly as usual (e.g. with the app's dependencies)
+            del self._app.router.routes[num_routes:]
+            self._mount_version_app(routes=routes, version_prefix=version_prefix)
+
+    def _mount_version_app(self, routes: List[BaseRoute], version_prefix: str) -> None:
+        version_app = FastAPI(
+            openapi_url=None,
+            docs_url=None,
+            redoc_url=None,
+            exception_handlers=dict(self._app.exception_handlers)
+        )
+        # Endpoints see the sub-application as request.app
+        version_app.state = self._app.state
+        version_app.router.routes = routes
+        # Unmatched requests (e.g. with a trailing slash) are handled as the app's own router would
+        version_app.router.redirect_slashes = self._app.router.redirect_slashes
+        version_app.router.default = self._app.router.default
+
+        build_openapi = self._version_openapi_builders.get(version_prefix)
+        if build_openapi is not None:
+            def get_version_openapi() -> Dict[str, Any]:
+                if not version_app.openapi_schema:
+                    version_app.openapi_schema = build_openapi()
+                return version_app.openapi_schema
+
+            version_app.openapi = get_version_openapi  # type: ignore[method-assign]
+
+        mount = VersionMount(prefix=version_prefix, app=version_app)
+        self._app.router.routes.append(mount)
+        self._version_apps[version_prefix] = version_app
+        self._version_mounts[id(mount)] = routes
+
+    def _wrap_route(self, route: APIRoute, version: Tuple[int, int], version_prefix: str) -> None:
+        # Applied first, so only requests reaching the endpoint (e.g. not cached responses) take a slot
+        bulkhead = self._bulkheads.get(version)
+        if bulkhead is not None:
+            route.app = BulkheadMiddleware(app=route.app, bulkhead=bulkhead)
+
+        cache_settings = getattr(route.endpoint, '_api_cache', None)
+        if cache_settings is not None and 'GET' in route.methods:
+            if self._cache_store is None:
+                self._cache_store = LRUCacheStore()
+            route.app = ResponseCacheMiddleware(
+                app=route.app,
+                store=self._cache_store,
+                version=version,
+                ttl=cache_settings.ttl,
+                vary=cache_settings.vary
+            )
+
+        if 'GET' in route.methods and (
+            self._etag_versions is True or
+            (not isinstance(self._etag_versions, bool) and version in self._etag_versions)
+        ):
+            route.app = ETagMiddleware(app=route.app)
+
+        version_str = self._semantic_version_format.format(major=version[0], minor=version[1])
+        path = route.path[len(version_prefix):]
+        remove_in_version = getattr(route.endpoint, '_remove_in_version', None)
+        if self._include_deprecation_headers and (route.deprecated or remove_in_version is not None):
+            deprecate_in_version = getattr(
+                route.endpoint, '_deprecate_in_version', getattr(route.endpoint, '_api_version', self._default_version))
+            headers = build_deprecation_headers(
+                deprecated=bool(route.deprecated),
+                deprecation_date=self._deprecation_dates.get(deprecate_in_version),
+                sunset_date=self._sunset_dates.get(remove_in_version) if remove_in_version is not None else None,
+                link=self._deprecation_link
+            )
+            if headers:
+                route.app = DeprecationHeadersMiddleware(app=route.app, headers=headers)
+        if self._deprecation_telemetry is not None and (route.deprecated or remove_in_version is not None):
+            route.app = DeprecationTelemetryMiddleware(
+                app=route.app,
+                telemetry=self._deprecation_telemetry,
+                index=self._deprecation_telemetry.register(
+                    version=version_str,
+                    route=path,
+                    method=','.join(sorted(route.methods)),
+                    deprecated=bool(route.deprecated),
+                    remove_in_version=self._semantic_version_format.format(
+                        major=remove_in_version[0], minor=remove_in_version[1]
+                    ) if remove_in_version is not None else None
+                )
+            )
+
+        if self._metrics is not None:
+            route.app = MetricsMiddleware(
+                app=route.app,
+                metrics=self._metrics,
+                index_by_method={
+                    method: self._metrics.register(version=version_str, route=path, method=method)
+                    for method in route.methods
+                }
+            )
+
     def _get_routes_by_version(
         self
     ) -> Dict[Tuple[int, int], Dict[Tuple[str, str], Union[APIRoute, APIWebSocketRoute]]]:
@@ -175,6 +690,13 @@ class Versionizer:
                 version = getattr(route.endpoint, '_api_version', self._default_version)
                 routes_by_start_version[version].append(route)
 
+        routes_by_migration_version: Dict[Tuple[int, int], List[Union[APIRoute, APIWebSocketRoute]]] = \
+            defaultdict(list)
+        for route in self._original_app_routes:
+            if isinstance(route, APIRoute):
+                for migration in getattr(route.endpoint, '_api_migrations', ()):
+                    routes_by_migration_version[migration.version].append(route)
+
         routes_by_end_version: Dict[Tuple[int, int], List[Union[APIRoute, APIWebSocketRoute]]] = defaultdict(list)
         for route in self._original_app_routes:
             if isinstance(route, (APIRoute, APIWebSocketRoute)):
@@ -182,10 +704,15 @@ class Versionizer:
                 if version:
                     routes_by_end_version[version].append(route)
 
-        versions = sorted(set(routes_by_start_version.keys()))
+        versions = sorted(set(routes_by_start_version.keys()) | set(routes_by_migration_version.keys()))
         routes_by_version: Dict[Tuple[int, int], Dict[Tuple[str, str], Union[APIRoute, APIWebSocketRoute]]] = {}
         curr_version_routes_by_key: Dict[Tuple[str, str], Union[APIRoute, APIWebSocketRoute]] = {}
         for version in versions:
+            # Routes served through migrations are overridden by any handler explicitly added in the same version
+            for route in routes_by_migration_version[version]:
+                route_keys = self._get_route_keys(route=route)
+                curr_version_routes_by_key.update(route_keys)
+
             for route in routes_by_start_version[version]:
                 route_keys = self._get_route_keys(route=route)
                 curr_version_routes_by_key.update(route_keys)
@@ -237,88 +764,456 @@ class Versionizer:
                         versioned_tags.append(openapi_tag)
 
         if self._include_version_openapi_route and self._app.openapi_url is not None:
-            @router.get(self._app.openapi_url, include_in_schema=False)
-            async def get_openapi() -> Any:
+            def get_openapi_params(
+                routes: Union[Sequence[BaseRoute], None] = None,
+                tags: Union[List[Dict[str, Any]], None] = None
+            ) -> Dict[str, Any]:
                 openapi_params: Dict[str, Any] = {
                     'title': title,
                     'version': version_str,
-                    'routes': router.routes,
+                    'routes': router.routes if routes is None else routes,
                     'description': self._app.description,
                     'terms_of_service': self._app.terms_of_service,
                     'contact': self._app.contact,
                     'license_info': self._app.license_info,
                     'servers': self._app.servers,
-                    'tags': versioned_tags,
+                    'tags': versioned_tags if tags is None else tags,
                 }
 
                 if hasattr(self._app, 'summary'):
                     # Available since OpenAPI 3.1.0, FastAPI 0.99.0
                     openapi_params['summary'] = self._app.summary
 
-                return fastapi.openapi.utils.get_openapi(**openapi_params)
+                return openapi_params
+
+            def build_openapi(
+                routes: Union[Sequence[BaseRoute], None] = None,
+                tags: Union[List[Dict[str, Any]], None] = None
+            ) -> Dict[str, Any]:
+                return fastapi.openapi.utils.get_openapi(**get_openapi_params(routes=routes, tags=tags))
+
+            self._version_openapi_params[version_prefix] = get_openapi_params
+            self._version_openapi_builders[version_prefix] = build_openapi
+
+            @router.get(self._app.openapi_url, include_in_schema=False)
+            async def get_openapi() -> Any:
+                if self._split_version_openapi:
+                    response = Response(
+                        content=self._get_split_openapi().version_bodies[version_prefix],
+                        media_type='application/json'
+                    )
+                    await self._store_generated_openapi_in_threadpool()
+                    return response
+                if self._openapi_cache is not None or self._shared_store is not None:
+                    response = _BytesResponse(
+                        content=self._get_version_openapi_body(version_prefix),
+                        media_type='application/json'
+                    )
+                    await self._store_generated_openapi_in_threadpool()
+                    return response
+                version_app = self._version_apps.get(version_prefix)
+                return version_app.openapi() if version_app is not None else build_openapi()
+
+            if self._shard_version_openapi_by_tag:
+                self._add_version_openapi_shards(
+                    router=router,
+                    version_prefix=version_prefix,
+                    tag_shards=TagShards(
+                        get_routes=lambda: router.routes,
+                        build_openapi=build_openapi,
+                        openapi_tags=versioned_tags,
+                        shard_url_format=self._build_api_url(version_prefix, self._get_openapi_shard_path('{tag}'))
+                    )
+                )
+
+        # Docs pages are fully determined at this point, so they are rendered once and served as immutable bytes
+        if self._version_docs_url is not None:
+            # Versions share a single docs page instead
+            return
 
         if self._include_version_docs and self._app.docs_url is not None and self._app.openapi_url is not None:
             openapi_url = self._build_api_url(version_prefix, self._app.openapi_url)
             oauth2_redirect_url = self._build_api_url(
                 version_prefix, cast(str, self._app.swagger_ui_oauth2_redirect_url))
 
-            @router.get(self._app.docs_url, include_in_schema=False)
-            async def get_docs() -> HTMLResponse:
-                return get_swagger_ui_html(
+            self._add_static_route(
+                router=router,
+                path=self._app.docs_url,
+                name='get_docs',
+                response=get_swagger_ui_html(
                     openapi_url=openapi_url,
                     title=title,
                     swagger_ui_parameters=self._app.swagger_ui_parameters,
                     init_oauth=self._app.swagger_ui_init_oauth,
-                    oauth2_redirect_url=oauth2_redirect_url
+                    oauth2_redirect_url=oauth2_redirect_url,
+                    **self._get_swagger_asset_params()
                 )
+            )
 
             if self._app.swagger_ui_oauth2_redirect_url:
-                @router.get(self._app.swagger_ui_oauth2_redirect_url, include_in_schema=False)
-                async def get_oauth2_redirect() -> HTMLResponse:
-                    return get_swagger_ui_oauth2_redirect_html()
+                self._add_static_route(
+                    router=router,
+                    path=self._app.swagger_ui_oauth2_redirect_url,
+                    name='get_oauth2_redirect',
+                    response=get_swagger_ui_oauth2_redirect_html()
+                )
 
         if self._include_version_docs and self._app.redoc_url is not None and self._app.openapi_url is not None:
-            @router.get(self._app.redoc_url, include_in_schema=False)
-            async def get_redoc() -> HTMLResponse:
-                openapi_url = self._build_api_url(version_prefix, cast(str, self._app.openapi_url))
-                return get_redoc_html(
-                    openapi_url=openapi_url,
-                    title=title
+            self._add_static_route(
+                router=router,
+                path=self._app.redoc_url,
+                name='get_redoc',
+                response=get_redoc_html(
+                    openapi_url=self._build_api_url(version_prefix, self._app.openapi_url),
+                    title=title,
+                    **self._get_redoc_asset_params()
+                )
+            )
+
+    def _add_version_docs_selector(self, versions: List[Tuple[int, int]]) -> None:
+        if not self._include_version_openapi_route or self._app.openapi_url is None or not versions:
+            return
+
+        version_docs_url = cast(str, self._version_docs_url)
+        urls: List[Dict[str, str]] = []
+        for (major, minor) in versions:
+            version_prefix = self._prefix_format.format(major=major, minor=minor)
+            urls.append({
+                'url': self._build_api_url(version_prefix, self._app.openapi_url),
+                'name': f'v{self._semantic_version_format.format(major=major, minor=minor)}'
+            })
+
+        oauth2_redirect_url = None
+        if self._app.swagger_ui_oauth2_redirect_url:
+            oauth2_redirect_url = self._build_api_url('', self._app.swagger_ui_oauth2_redirect_url)
+            if not self._include_main_docs or self._app.docs_url is None:
+                # Otherwise, the main docs' redirect route is reused
+                self._add_static_route(
+                    router=self._app.router,
+                    path=self._app.swagger_ui_oauth2_redirect_url,
+                    name='get_version_docs_oauth2_redirect',
+                    response=get_swagger_ui_oauth2_redirect_html()
                 )
 
+        self._add_static_route(
+            router=self._app.router,
+            path=version_docs_url,
+            name='get_version_docs',
+            response=get_swagger_ui_selector_html(
+                urls=urls,
+                primary_name=urls[-1]['name'],
+                title=self._app.title,
+                oauth2_redirect_url=oauth2_redirect_url,
+                init_oauth=self._app.swagger_ui_init_oauth,
+                swagger_ui_parameters=self._app.swagger_ui_parameters,
+                **self._get_swagger_asset_params(include_preset=True)
+            )
+        )
+
+    def _get_swagger_asset_params(self, include_preset: bool = False) -> Dict[str, str]:
+        asset_urls: Dict[str, str] = {}
+        if self._docs_assets is not None:
+            names = [
+                ('swagger_js_url', DocsAssets.SWAGGER_JS),
+                ('swagger_css_url', DocsAssets.SWAGGER_CSS),
+                ('swagger_favicon_url', DocsAssets.FAVICON)
+            ]
+            if include_preset:
+                names.append(('swagger_preset_js_url', DocsAssets.SWAGGER_PRESET_JS))
+            for param, name in names:
+                path = self._docs_assets.get_path(name)
+                if path is not None:
+                    asset_urls[param] = self._build_api_url('', path)
+        return asset_urls
+
+    def _get_redoc_asset_params(self) -> Dict[str, Any]:
+        asset_urls: Dict[str, Any] = {}
+        if self._docs_assets is not None:
+            # Fonts are also loaded from a CDN otherwise
+            asset_urls['with_google_fonts'] = False
+            for param, name in (('redoc_js_url', DocsAssets.REDOC_JS), ('redoc_favicon_url', DocsAssets.FAVICON)):
+                path = self._docs_assets.get_path(name)
+                if path is not None:
+                    asset_urls[param] = self._build_api_url('', path)
+        return asset_urls
+
+    def _add_docs_assets(self, docs_assets: DocsAssets) -> None:
+        for path, responder in docs_assets.build_responders():
+            self._app.router.add_route(
+                path,
+                cast(Callable[[Request], Awaitable[Response]], responder),
+                methods=['GET'],
+                include_in_schema=False
+            )
+
+        if not self._include_main_docs or self._app.openapi_url is None:
+            return
+
+        # The main docs pages are added by FastAPI itself, so they are replaced to use the assets too
+        openapi_url = self._build_api_url('', self._app.openapi_url)
+        main_docs_routes: Dict[str, Tuple[str, Response]] = {}
+        if self._app.docs_url is not None:
+            oauth2_redirect_url = self._app.swagger_ui_oauth2_redirect_url
+            main_docs_routes[self._app.docs_url] = ('swagger_ui_html', get_swagger_ui_html(
+                openapi_url=openapi_url,
+                title=f'{self._app.title} - Swagger UI',
+                swagger_ui_parameters=self._app.swagger_ui_parameters,
+                init_oauth=self._app.swagger_ui_init_oauth,
+                oauth2_redirect_url=self._build_api_url('', oauth2_redirect_url) if oauth2_redirect_url else None,
+                **self._get_swagger_asset_params()
+            ))
+        if self._app.redoc_url is not None:
+            main_docs_routes[self._app.redoc_url] = ('redoc_html', get_redoc_html(
+                openapi_url=openapi_url,
+                title=f'{self._app.title} - ReDoc',
+                **self._get_redoc_asset_params()
+            ))
+
+        self._app.router.routes = [
+            route for route in self._app.router.routes if getattr(route, 'path', None) not in main_docs_routes
+        ]
+        for path, (name, response) in main_docs_routes.items():
+            self._add_static_route(router=self._app.router, path=path, name=name, response=response)
+
+    def _fingerprint_version_openapi(self) -> None:
+        model_fingerprints: Dict[Any, str] = {}
+        for version_prefix, get_openapi_params in self._version_openapi_params.items():
+            self._version_openapi_fingerprints[version_prefix] = fingerprint_openapi(
+                openapi_params=get_openapi_params(),
+                model_fingerprints=model_fingerprints
+            )
+
+    def _load_cached_openapi(self, openapi_cache: OpenAPIFileCache) -> None:
+        for version_prefix, fingerprint in self._version_openapi_fingerprints.items():
+            body = openapi_cache.get(fingerprint)
+            if body is not None:
+                self._version_openapi_bodies[version_prefix] = body
+        logger.debug(
+            'Loaded %d of %d version schemas from the OpenAPI cache',
+            len(self._version_openapi_bodies),
+            len(self._version_openapi_params)
+        )
+
+    def _open_shared_store(self, shared_store: SharedStore) -> None:
+        # Docs pages are cheap to hash, while schemas are identified by their fingerprint, without generating them
+        key_hash = hashlib.blake2b(digest_size=20)
+        for path, responder in self._static_responders.items():
+            key_hash.update(f'static:{path}\0'.encode('utf-8') + responder.etag + b'\0')
+        for version_prefix, fingerprint in self._version_openapi_fingerprints.items():
+            key_hash.update(f'openapi:{version_prefix}\0{fingerprint}\0'.encode('utf-8'))
+
+        def build_artifacts() -> Dict[str, bytes]:
+            artifacts = {f'static:{path}': bytes(responder.body) for path, responder in self._static_responders.items()}
+            for version_prefix in self._version_openapi_fingerprints:
+                artifacts[f'openapi:{version_prefix}'] = bytes(self._get_version_openapi_body(version_prefix))
+            return artifacts
+
+        existed = shared_store.load(key=key_hash.hexdigest(), build=build_artifacts)
+        if self._openapi_cache is not None:
+            self._store_generated_openapi()
+        for path, responder in self._static_responders.items():
+            responder.share_body(cast(memoryview, shared_store.get(f'static:{path}')))
+        for version_prefix in self._version_openapi_fingerprints:
+            self._version_openapi_bodies[version_prefix] = cast(
+                memoryview, shared_store.get(f'openapi:{version_prefix}'))
+        logger.debug('%s the shared store', 'Opened' if existed else 'Created')
+
+    def _get_version_openapi_body(self, version_prefix: str) -> Union[bytes, memoryview]:
+        body = self._version_openapi_bodies.get(version_prefix)
+        if body is None:
+            body = dump_openapi(self._version_openapi_builders[version_prefix]())
+            fingerprint = self._version_openapi_fingerprints.get(version_prefix)
+            self._version_openapi_bodies[version_prefix] = body
+            if self._openapi_cache is not None and fingerprint is not None:
+                # Written by _store_generated_openapi(), so requests can do it outside the event loop
+                self._unstored_openapi_prefixes.add(version_prefix)
+        return body
+
+    def _store_generated_openapi(self) -> None:
+        openapi_cache = cast(OpenAPIFileCache, self._openapi_cache)
+        while True:
+            try:
+                version_prefix = self._unstored_openapi_prefixes.pop()
+            except KeyError:
+                return
+            openapi_cache.put(
+                self._version_openapi_fingerprints[version_prefix],
+                bytes(self._version_openapi_bodies[version_prefix])
+            )
+
+    async def _store_generated_openapi_in_threadpool(self) -> None:
+        if self._unstored_openapi_prefixes:
+            await run_in_threadpool(self._store_generated_openapi)
+
+    def _get_openapi_components_path(self) -> str:
+        stem, extension = posixpath.splitext(cast(str, self._app.openapi_url))
+        return f'{stem}.components.{{digest}}{extension or ".json"}'
+
+    def _get_openapi_shards_path(self) -> str:
+        stem, extension = posixpath.splitext(cast(str, self._app.openapi_url))
+        return f'{stem}/tags{extension or ".json"}'
+
+    def _get_openapi_shard_path(self, tag: str) -> str:
+        stem, extension = posixpath.splitext(cast(str, self._app.openapi_url))
+        return f'{stem}/tags/{tag}{extension or ".json"}'
+
+    def _add_version_openapi_shards(self, router: APIRouter, version_prefix: str, tag_shards: TagShards) -> None:
+        @router.get(self._get_openapi_shards_path(), include_in_schema=False)
+        async def get_openapi_shards(request: Request) -> Response:
+            body, etag = tag_shards.get_index()
+            return self._build_json_bytes_response(request=request, body=body, etag=etag)
+
+        # Tags can contain slashes (which the index quotes, but are decoded in the request's path)
+        @router.get(self._get_openapi_shard_path('{tag:path}'), include_in_schema=False)
+        async def get_openapi_shard(tag: str, request: Request) -> Response:
+            shard = tag_shards.get_shard(tag)
+            if shard is None:
+                raise HTTPException(status_code=404)
+            body, etag = shard
+            return self._build_json_bytes_response(request=request, body=body, etag=etag)
+
+    @staticmethod
+    def _build_json_bytes_response(request: Request, body: bytes, etag: bytes) -> Response:
+        headers = {'ETag': etag.decode('latin-1'), 'Cache-Control': 'no-cache'}
+        if etag_matches(request.headers.get('if-none-match', '').encode('latin-1') or None, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type='application/json', headers=headers)
+
+    def _get_split_openapi(self) -> SplitOpenAPI:
+        if self._split_openapi is None:
+            self._split_openapi = build_split_openapi(
+                schemas={
+                    version_prefix: json.loads(bytes(self._get_version_openapi_body(version_prefix)))
+                    if self._openapi_cache is not None or self._shared_store is not None else build_openapi()
+                    for version_prefix, build_openapi in self._version_openapi_builders.items()
+                },
+                info={'title': f'{self._app.title} - Components', 'version': self._app.version},
+                components_url_format=self._build_api_url('', self._get_openapi_components_path())
+            )
+        return self._split_openapi
+
+    def _add_openapi_components_route(self) -> None:
+        @self._app.get(self._get_openapi_components_path(), include_in_schema=False)
+        async def get_openapi_components(digest: str) -> Response:
+            split_openapi = self._get_split_openapi()
+            await self._store_generated_openapi_in_threadpool()
+            if digest != split_openapi.digest:
+                raise HTTPException(status_code=404)
+
+            # The URL changes whenever the content does, so it can be cached indefinitely
+            return Response(
+                content=split_openapi.components_body,
+                media_type='application/json',
+                headers={'Cache-Control': 'public, max-age=31536000, immutable'}
+            )
+
+    def _get_main_openapi(self) -> Dict[str, Any]:
+        if not self._app.openapi_schema:
+            self._app.openapi_schema = build_deduplicated_openapi(
+                app=self._app,
+                version_routes=self._version_routes,
+                include_latest=self._include_latest_in_main_openapi
+            )
+        return self._app.openapi_schema
+
+    def _get_mounted_main_openapi(self) -> Dict[str, Any]:
+        if not self._app.openapi_schema:
+            # Version mounts are replaced by their (prefixed) routes, in place, as if they had been included
+            routes: List[BaseRoute] = []
+            for route in self._app.routes:
+                routes.extend(self._version_mounts.get(id(route), (route,)))
+            self._app.openapi_schema = fastapi.openapi.utils.get_openapi(
+                routes=routes,
+                **get_app_openapi_params(self._app)
+            )
+        return self._app.openapi_schema
+
+    def _add_static_route(self, router: APIRouter, path: str, name: str, response: Response) -> None:
+        responder = StaticResponder(
+            body=bytes(response.body),
+            content_type=response.headers['content-type'],
+            cache_control=f'public, max-age={self._docs_cache_max_age}'
+        )
+        self._static_responders[router.prefix + path] = responder
+        # Unlike API routes, plain routes are not given the router's prefix when added
+        router.add_route(
+            router.prefix + path,
+            cast(Callable[[Request], Awaitable[Response]], responder),
+            methods=['GET'],
+            name=name,
+            include_in_schema=False
+        )
+
     def _add_versions_route(self, versions: List[Tuple[int, int]]) -> None:
+        version_models: List[Dict[str, Any]] = []
+        for (major, minor) in versions:
+            version_prefix = self._prefix_format.format(major=major, minor=minor)
+            version_str = self._semantic_version_format.format(major=major, minor=minor)
+
+            version_model = {
+                'version': version_str,
+            }
+
+            if self._include_version_openapi_route and self._app.openapi_url is not None:
+                version_model['openapi_url'] = self._build_api_url(version_prefix, self._app.openapi_url)
+
+            if self._include_version_docs and self._version_docs_url is None and self._app.docs_url is not None:
+                version_model['swagger_url'] = self._build_api_url(version_prefix, self._app.docs_url)
+
+            if self._include_version_docs and self._version_docs_url is None and self._app.redoc_url is not None:
+                version_model['redoc_url'] = self._build_api_url(version_prefix, self._app.redoc_url)
+
+            version_models.append(version_model)
+
         @self._app.get(
             '/versions',
             tags=['Versions'],
             response_class=JSONResponse
         )
         def get_versions() -> Dict[str, Any]:
-            version_models: List[Dict[str, Any]] = []
-            for (major, minor) in versions:
-                version_prefix = self._prefix_format.format(major=major, minor=minor)
-                version_str = self._semantic_version_format.format(major=major, minor=minor)
-
-                version_model = {
-                    'version': version_str,
-                }
-
-                if self._include_version_openapi_route and self._app.openapi_url is not None:
-                    version_model['openapi_url'] = self._build_api_url(version_prefix, self._app.openapi_url)
+            return {
+                'versions': version_models
+            }
 
-                if self._include_version_docs and self._app.docs_url is not None:
-                    version_model['swagger_url'] = self._build_api_url(version_prefix, self._app.docs_url)
+        # The response never changes once versioned, so it is rendered once and served directly (with an ETag),
+        # skipping the endpoint. The route is kept for its OpenAPI schema.
+        route = cast(APIRoute, self._app.router.routes[-1])
+        route.app = self._static_responders['/versions'] = StaticResponder(
+            body=bytes(JSONResponse(content=get_versions()).body),
+            content_type='application/json',
+            cache_control='no-cache'
+        )
 
-                if self._include_version_docs and self._app.redoc_url is not None:
-                    version_model['redoc_url'] = self._build_api_url(version_prefix, self._app.redoc_url)
+    def _add_metrics_route(self, metrics: VersionMetrics) -> None:
+        @self._app.get('/metrics', include_in_schema=False)
+        async def get_metrics() -> PlainTextResponse:
+            content = metrics.render_prometheus()
+            if self._threadpools:
+                content += render_threadpool_prometheus(
+                    threadpools=self._get_threadpool_versions(),
+                    namespace=metrics.namespace
+                )
+            return PlainTextResponse(
+                content=content,
+                media_type='text/plain; version=0.0.4; charset=utf-8'
+            )
 
-                version_models.append(version_model)
+    def _get_threadpool_versions(self) -> Dict[VersionThreadPool, List[str]]:
+        threadpool_versions: Dict[VersionThreadPool, List[str]] = defaultdict(list)
+        for version, threadpool in sorted(self._threadpools.items()):
+            threadpool_versions[threadpool].append(self._semantic_version_format.format(
+                major=version[0],
+                minor=version[1]
+            ))
+        return threadpool_versions
 
-            return {
-                'versions': version_models
-            }
+    def _add_deprecations_route(self, deprecation_telemetry: DeprecationTelemetry) -> None:
+        @self._app.get('/deprecations', include_in_schema=False)
+        async def get_deprecations() -> JSONResponse:
+            return JSONResponse(content={'routes': deprecation_telemetry.report()})
 
-    @staticmethod
     def _add_route_to_router(
+        self,
         route: Union[APIRoute, APIWebSocketRoute],
         router: APIRouter,
         version: Tuple[int, int]
@@ -334,6 +1229,30 @@ class Versionizer:
             ):
                 kwargs['deprecated'] = True
 
+        if isinstance(route, APIRoute):
+            route_version = getattr(route.endpoint, '_api_version', self._default_version)
+            migrations = get_migrations(endpoint=route.endpoint, version=version, route_version=route_version)
+            if migrations:
+                body_params = route.dependant.body_params
+                kwargs['endpoint'] = build_migrated_endpoint(
+                    endpoint=route.endpoint,
+                    migrations=migrations,
+                    source_model=route.response_model,
+                    status_code=route.status_code,
+                    body_param=body_params[0].name if len(body_params) == 1 else None
+                )
+                if has_response_migration(migrations):
+                    kwargs['response_model'] = migrations[-1].response_model
+
+            threadpool = self._threadpools.get(version)
+            endpoint = kwargs['endpoint']
+            if threadpool is not None and not asyncio.iscoroutinefunction(endpoint):
+                threadpool_endpoint = self._threadpool_endpoints.get((endpoint, threadpool))
+                if threadpool_endpoint is None:
+                    threadpool_endpoint = build_threadpool_endpoint(endpoint=endpoint, threadpool=threadpool)
+                    self._threadpool_endpoints[(endpoint, threadpool)] = threadpool_endpoint
+                kwargs['endpoint'] = threadpool_endpoint
+
         for _ in range(10000):
             try:
                 if isinstance(route, APIRoute):
@@ -36,5 +36,8 @@ setup(
         'Programming Language :: Python :: 3.13'
     ],
     install_requires=requirements_list,
+    entry_points={
+        'console_scripts': ['fastapi-versionizer=fastapi_versionizer.cli:main']
+    },
     python_requires='>=3.8'
 )
@@ -0,0 +1,64 @@
+import asyncio
+import httpx
+
+from unittest import TestCase
+from examples.bulkheads import app, versions, v1_bulkhead, v2_bulkhead
+from fastapi_versionizer.bulkheads import Bulkhead
+
+
+class TestBulkheadsExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_bulkheads_example(self) -> None:
+        self.assertListEqual([(1, 0), (2, 0)], versions)
+
+        async def wait_for(bulkhead: Bulkhead, active: int, queued: int) -> None:
+            while (bulkhead.active, bulkhead.queued) != (active, queued):
+                await asyncio.sleep(0)
+
+        async def saturate_v1() -> None:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                running = asyncio.ensure_future(client.get('/v1/reports'))
+                await wait_for(v1_bulkhead, active=1, queued=0)
+                queued = asyncio.ensure_future(client.get('/v1/reports'))
+                await wait_for(v1_bulkhead, active=1, queued=1)
+
+                # The queue is full, so the request is rejected straight away
+                rejected = await client.get('/v1/reports')
+                self.assertEqual(503, rejected.status_code)
+                self.assertEqual('1', rejected.headers['retry-after'])
+                self.assertDictEqual({'detail': 'Service Unavailable'}, rejected.json())
+
+                # Other versions are not affected
+                self.assertEqual('Item 1 (v2)', (await client.get('/v2/items/1')).json())
+                self.assertEqual(1, v1_bulkhead.active)
+
+                responses = await asyncio.gather(running, queued)
+                self.assertListEqual(['Report', 'Report'], [response.json() for response in responses])
+
+        asyncio.run(saturate_v1())
+        self.assertEqual((0, 0, 1), (v1_bulkhead.active, v1_bulkhead.queued, v1_bulkhead.rejected))
+        self.assertEqual((0, 0, 0), (v2_bulkhead.active, v2_bulkhead.queued, v2_bulkhead.rejected))
+
+        async def time_out_v2() -> None:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                running = asyncio.ensure_future(client.get('/v2/reports'))
+                await wait_for(v2_bulkhead, active=1, queued=0)
+
+                # The latest alias shares its version's bulkhead, and waiting requests time out
+                timed_out = await client.get('/latest/items/1')
+                self.assertEqual(503, timed_out.status_code)
+                self.assertNotIn('retry-after', timed_out.headers)
+                self.assertEqual(0, v2_bulkhead.queued)
+
+                self.assertEqual('Report', (await running).json())
+
+        asyncio.run(time_out_v2())
+        self.assertEqual((0, 0, 1), (v2_bulkhead.active, v2_bulkhead.queued, v2_bulkhead.rejected))
+
+        with self.assertRaises(ValueError):
+            Bulkhead(max_concurrent=0)
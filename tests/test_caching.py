@@ -0,0 +1,111 @@
+import asyncio
+import httpx
+from fastapi.testclient import TestClient
+
+from unittest import TestCase
+from unittest.mock import patch
+
+import examples.caching
+from examples.caching import app, versions, calls, cache_store
+from fastapi_versionizer.caching import LRUCacheStore
+
+
+class TestCachingExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+        cache_store.values.clear()
+        for name in calls:
+            calls[name] = 0
+
+    def test_caching_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (2, 0)], versions)
+
+        for _ in range(3):
+            response = test_client.get('/v1/items')
+            self.assertListEqual([{'id': 1, 'name': 'laptop'}], response.json())
+            self.assertEqual('accept-language', response.headers['vary'])
+        self.assertEqual(1, calls['get_items'])
+
+        # Keyed by query and vary headers
+        test_client.get('/v1/items?page=2')
+        test_client.get('/v1/items', headers={'Accept-Language': 'fr'})
+        test_client.get('/v1/items', headers={'Accept-Language': 'fr'})
+        self.assertEqual(3, calls['get_items'])
+
+        # Private requests are not cached
+        test_client.get('/v1/items', headers={'Authorization': 'Bearer token'})
+        self.assertEqual(4, calls['get_items'])
+
+        # Keyed by version
+        for _ in range(2):
+            self.assertListEqual([{'id': 1, 'name': 'laptop', 'cost': 100}], test_client.get('/v2/items').json())
+            self.assertListEqual([{'id': 1, 'name': 'laptop', 'cost': 100}], test_client.get('/latest/items').json())
+        self.assertEqual(2, calls['get_items_v2'])
+
+        # Errors are not cached
+        self.assertEqual(404, test_client.get('/v1/items/2').status_code)
+        self.assertEqual(404, test_client.get('/v1/items/2').status_code)
+        self.assertEqual(1, test_client.get('/v1/items/1').json()['id'])
+        self.assertEqual(1, test_client.get('/v1/items/1').json()['id'])
+        self.assertEqual(3, calls['get_item'])
+
+        # Per-route TTLs
+        self.assertEqual(30, cache_store.values['1.0|/v1/items/1?'][1])
+        self.assertEqual(60, cache_store.values['1.0|/v1/items?|'][1])
+
+        # Non-GET requests are not cached
+        self.assertEqual(405, test_client.post('/v1/items').status_code)
+
+    def test_caching_stampede(self) -> None:
+        async def get_concurrently() -> None:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                responses = await asyncio.gather(*(client.get('/v1/items') for _ in range(5)))
+                for response in responses:
+                    self.assertListEqual([{'id': 1, 'name': 'laptop'}], response.json())
+
+        asyncio.run(get_concurrently())
+        self.assertEqual(1, calls['get_items'])
+
+    def test_caching_cache_control(self) -> None:
+        test_client = TestClient(app)
+
+        # Responses whose Cache-Control forbids shared caching are not cached
+        for cache_control in ('private, max-age=60', 'no-store', 'No-Cache', 'max-age=0, private="set-cookie"'):
+            calls['get_item_offers'] = 0
+            with patch.object(examples.caching, 'offers_cache_control', cache_control):
+                for _ in range(2):
+                    response = test_client.get('/v1/items/1/offers?client_token=abc')
+                    self.assertListEqual(['Offer on item 1 for abc'], response.json())
+                    self.assertEqual(cache_control, response.headers['cache-control'])
+            self.assertEqual(2, calls['get_item_offers'])
+        self.assertDictEqual({}, cache_store.values)
+
+        with patch.object(examples.caching, 'offers_cache_control', 'public, max-age=60'):
+            for _ in range(2):
+                test_client.get('/v1/items/1/offers?client_token=abc')
+        self.assertEqual(3, calls['get_item_offers'])
+
+    def test_lru_cache_store(self) -> None:
+        async def use_store() -> None:
+            store = LRUCacheStore(max_bytes=10)
+            await store.put('a', b'12345', 60)
+            await store.put('b', b'12345', 60)
+            self.assertEqual(b'12345', await store.get('a'))
+
+            # "b" is now the least recently used
+            await store.put('c', b'1', 60)
+            self.assertIsNone(await store.get('b'))
+            self.assertEqual(b'12345', await store.get('a'))
+            self.assertEqual(b'1', await store.get('c'))
+
+            await store.put('d', b'12345678901', 60)
+            self.assertIsNone(await store.get('d'))
+
+            await store.put('e', b'1', -1)
+            self.assertIsNone(await store.get('e'))
+
+        asyncio.run(use_store())
@@ -0,0 +1,57 @@
+import fastapi.openapi.utils
+from fastapi.testclient import TestClient
+
+from unittest import TestCase
+from examples.deduplicated_openapi import app, versions
+
+
+class TestDeduplicatedOpenAPIExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_deduplicated_openapi_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (2, 0), (3, 0)], versions)
+
+        schema = test_client.get('/openapi.json').json()
+        self.assertDictEqual(app.openapi(), schema)
+        self.assertIs(app.openapi(), app.openapi())
+
+        paths = schema['paths']
+        self.assertListEqual(
+            [
+                '/v1/items', '/v1/items/{item_id}', '/v1/users',
+                '/v2/items', '/v2/items/{item_id}', '/v2/users',
+                '/v3/items', '/v3/items/{item_id}', '/v3/users',
+                '/versions'
+            ],
+            list(paths)
+        )
+
+        # Identical paths are only generated once
+        self.assertDictEqual({'$ref': '#/paths/~1v1~1items'}, paths['/v2/items'])
+        self.assertDictEqual({'$ref': '#/paths/~1v1~1items'}, paths['/v3/items'])
+        self.assertDictEqual({'$ref': '#/paths/~1v1~1items~1{item_id}'}, paths['/v2/items/{item_id}'])
+        self.assertDictEqual({'$ref': '#/paths/~1v2~1users'}, paths['/v3/users'])
+        self.assertListEqual(['get', 'post'], list(paths['/v2/users']))
+        self.assertEqual('get_users_v2_v2_users_get', paths['/v2/users']['get']['operationId'])
+        self.assertListEqual(['get', 'delete'], list(paths['/v3/items/{item_id}']))
+
+        # Models are shared as components
+        self.assertListEqual(
+            ['HTTPValidationError', 'Item', 'User', 'UserV2', 'ValidationError'],
+            list(schema['components']['schemas'])
+        )
+
+        # Once references are resolved, the same operations are documented as in FastAPI's own schema
+        full_schema = fastapi.openapi.utils.get_openapi(title=app.title, version=app.version, routes=app.routes)
+        self.assertIn('/latest/users', full_schema['paths'])
+        for path, path_item in paths.items():
+            if '$ref' in path_item:
+                path_item = paths[path_item['$ref'][len('#/paths/'):].replace('~1', '/').replace('~0', '~')]
+            self.assertListEqual(list(full_schema['paths'][path]), list(path_item))
+            for method, operation in path_item.items():
+                self.assertEqual(full_schema['paths'][path][method]['summary'], operation['summary'])
+        self.assertDictEqual(full_schema['components'], schema['components'])
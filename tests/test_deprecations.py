@@ -0,0 +1,77 @@
+from fastapi.testclient import TestClient
+
+from unittest import TestCase
+from examples.deprecations import app, versions
+
+
+class TestDeprecationsExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_deprecations_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (3, 0)], versions)
+
+        for _ in range(3):
+            test_client.get('/v1/items', headers={'X-Client-Id': 'mobile-app'})
+        test_client.get('/v1/items', headers={'X-Client-Id': 'web-app'})
+        test_client.get('/v3/items/legacy', headers={'X-Client-Id': 'web-app'})
+        test_client.get('/v3/items/legacy')
+
+        # The least frequent client is evicted
+        test_client.get('/v1/items', headers={'X-Client-Id': 'cron'})
+
+        # Routes that are not deprecated are not recorded
+        test_client.get('/v1/items/1', headers={'X-Client-Id': 'mobile-app'})
+        test_client.get('/v3/items/1', headers={'X-Client-Id': 'mobile-app'})
+
+        # Deprecation headers
+        response = test_client.get('/v1/items')
+        self.assertNotIn('deprecation', response.headers)
+        self.assertEqual('Fri, 01 Jan 2027 00:00:00 GMT', response.headers['sunset'])
+        self.assertEqual('<https://example.com/migration-guide>; rel="sunset"', response.headers['link'])
+
+        response = test_client.get('/v3/items/legacy')
+        self.assertEqual('@1767225600', response.headers['deprecation'])
+        self.assertNotIn('sunset', response.headers)
+        self.assertEqual('<https://example.com/migration-guide>; rel="deprecation"', response.headers['link'])
+
+        response = test_client.get('/v3/items/1')
+        self.assertNotIn('deprecation', response.headers)
+        self.assertNotIn('sunset', response.headers)
+
+        report = test_client.get('/deprecations').json()['routes']
+        for route in report:
+            self.assertIsInstance(route.pop('last_seen'), float)
+
+        self.assertListEqual(
+            [
+                {
+                    'version': '1',
+                    'route': '/items',
+                    'method': 'GET',
+                    'deprecated': False,
+                    'remove_in_version': '3',
+                    'count': 6,
+                    'clients': [
+                        {'client': 'mobile-app', 'count': 3},
+                        {'client': 'testclient', 'count': 3}
+                    ]
+                },
+                {
+                    'version': '3',
+                    'route': '/items/legacy',
+                    'method': 'GET',
+                    'deprecated': True,
+                    'remove_in_version': None,
+                    'count': 3,
+                    'clients': [
+                        {'client': 'testclient', 'count': 2},
+                        {'client': 'web-app', 'count': 1}
+                    ]
+                }
+            ],
+            report
+        )
@@ -0,0 +1,91 @@
+import gzip
+
+from fastapi.testclient import TestClient
+
+from unittest import TestCase
+from examples.docs_assets import app, docs_assets, versions
+from fastapi_versionizer import DocsAssets
+
+
+class TestDocsAssetsExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_docs_assets_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (2, 0)], versions)
+
+        swagger_js_path = docs_assets.get_path(DocsAssets.SWAGGER_JS)
+        swagger_css_path = docs_assets.get_path(DocsAssets.SWAGGER_CSS)
+        redoc_js_path = docs_assets.get_path(DocsAssets.REDOC_JS)
+        self.assertRegex(str(swagger_js_path), r'^/docs-assets/swagger-ui-bundle\.[0-9a-f]{12}\.js$')
+        self.assertRegex(str(swagger_css_path), r'^/docs-assets/swagger-ui\.[0-9a-f]{12}\.css$')
+        self.assertIsNone(docs_assets.get_path(DocsAssets.FAVICON))
+
+        # Every docs page, including the main ones, loads the same assets
+        for docs_url in ('/docs', '/v1/docs', '/v2/docs', '/latest/docs'):
+            html = test_client.get(docs_url).text
+            self.assertIn(f'<script src="{swagger_js_path}">', html)
+            self.assertIn(f'href="{swagger_css_path}"', html)
+            self.assertIn('https://fastapi.tiangolo.com/img/favicon.png', html)
+            self.assertNotIn('cdn.jsdelivr.net', html)
+        for redoc_url in ('/redoc', '/v1/redoc', '/v2/redoc', '/latest/redoc'):
+            html = test_client.get(redoc_url).text
+            self.assertIn(f'<script src="{redoc_js_path}">', html)
+            self.assertNotIn('cdn.jsdelivr.net', html)
+            self.assertNotIn('fonts.googleapis.com', html)
+        self.assertIn("url: '/openapi.json'", test_client.get('/docs').text)
+        self.assertEqual(200, test_client.get('/docs/oauth2-redirect').status_code)
+
+        # Assets are immutable, and precompressed
+        with open('examples/docs_assets/swagger-ui-bundle.js', 'rb') as asset_file:
+            swagger_js = asset_file.read()
+        response = test_client.get(str(swagger_js_path), headers={'Accept-Encoding': 'identity'})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(swagger_js, response.content)
+        self.assertEqual('text/javascript; charset=utf-8', response.headers['content-type'])
+        self.assertEqual('public, max-age=31536000, immutable', response.headers['cache-control'])
+        self.assertEqual('accept-encoding', response.headers['vary'])
+        self.assertNotIn('content-encoding', response.headers)
+
+        response = test_client.get(str(swagger_js_path), headers={'Accept-Encoding': 'gzip, deflate'})
+        self.assertEqual('gzip', response.headers['content-encoding'])
+        self.assertEqual(swagger_js, response.content)
+        gzip_etag = response.headers['etag']
+
+        with test_client.stream('GET', str(swagger_js_path), headers={'Accept-Encoding': 'gzip'}) as response:
+            raw_body = b''.join(response.iter_raw())
+        self.assertEqual(swagger_js, gzip.decompress(raw_body))
+        self.assertEqual(str(len(raw_body)), response.headers['content-length'])
+
+        response = test_client.get(
+            str(swagger_js_path), headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzip_etag})
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(gzip_etag, response.headers['etag'])
+        self.assertEqual('accept-encoding', response.headers['vary'])
+        self.assertEqual(
+            200,
+            test_client.get(
+                str(swagger_js_path), headers={'Accept-Encoding': 'gzip;q=0', 'If-None-Match': gzip_etag}
+            ).status_code
+        )
+
+        # Quality values are parsed leniently, and malformed ones only make their entry unacceptable
+        for accept_encoding, content_encoding in [
+            ('GZIP; Q = 0.5', 'gzip'),
+            ('gzip;q=1;level=x', 'gzip'),
+            ('deflate, *', 'gzip'),
+            ('*;q=0, gzip', 'gzip'),
+            ('gzip;q=abc', None),
+            ('gzip;level=1;q=0', None),
+            ('gzip;q=', None),
+            ('gzip;q=0, *', None)
+        ]:
+            response = test_client.get(str(swagger_js_path), headers={'Accept-Encoding': accept_encoding})
+            self.assertEqual(200, response.status_code)
+            self.assertEqual(content_encoding, response.headers.get('content-encoding'))
+            self.assertEqual(swagger_js, response.content)
+
+        self.assertEqual(404, test_client.get('/docs-assets/swagger-ui-bundle.js').status_code)
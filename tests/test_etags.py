@@ -0,0 +1,105 @@
+import asyncio
+from typing import List
+from fastapi.testclient import TestClient
+from starlette.types import Message
+
+from unittest import TestCase
+from examples.etags import app, versions
+
+
+class TestETagsExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_etags_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (2, 0)], versions)
+
+        # ETag computed from the body
+        response = test_client.get('/v1/items')
+        self.assertEqual(200, response.status_code)
+        self.assertListEqual([{'id': 1, 'name': 'laptop'}], response.json())
+        etag = response.headers['etag']
+        self.assertRegex(etag, r'^"[0-9a-f]{32}"$')
+
+        response = test_client.get('/v1/items', headers={'If-None-Match': etag})
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(b'', response.content)
+        self.assertEqual(etag, response.headers['etag'])
+        self.assertNotIn('content-type', response.headers)
+
+        self.assertEqual(304, test_client.get('/v1/items', headers={'If-None-Match': f'"x", W/{etag}'}).status_code)
+        self.assertEqual(304, test_client.get('/v1/items', headers={'If-None-Match': '*'}).status_code)
+        self.assertEqual(200, test_client.get('/v1/items', headers={'If-None-Match': '"x"'}).status_code)
+
+        # ETag supplied by the route
+        response = test_client.get('/v1/items/1')
+        self.assertEqual('"item-1-100"', response.headers['etag'])
+        response = test_client.get('/v1/items/1', headers={'If-None-Match': '"item-1-100"'})
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(b'', response.content)
+
+        # Changed data means a new ETag
+        test_client.post('/v1/items', json={'id': 1, 'name': 'laptop', 'cost': 200})
+        self.assertEqual(200, test_client.get('/v1/items/1', headers={'If-None-Match': '"item-1-100"'}).status_code)
+        response = test_client.get('/v1/items', headers={'If-None-Match': etag})
+        self.assertEqual(304, response.status_code)
+        test_client.post('/v1/items', json={'id': 2, 'name': 'phone', 'cost': 10})
+        response = test_client.get('/v1/items', headers={'If-None-Match': etag})
+        self.assertEqual(200, response.status_code)
+        self.assertNotEqual(etag, response.headers['etag'])
+
+        # Errors and non-GET routes have no ETags
+        self.assertNotIn('etag', test_client.get('/v1/items/3').headers)
+        self.assertNotIn('etag', test_client.post('/v1/items', json={'id': 3, 'name': 'tv', 'cost': 1}).headers)
+
+        # Not enabled for v2
+        self.assertNotIn('etag', test_client.get('/v2/items').headers)
+        self.assertNotIn('etag', test_client.get('/latest/items').headers)
+
+    def test_etags_streaming(self) -> None:
+        async def get_first_events() -> List[Message]:
+            # Called directly, since test clients wait for the whole body, and this stream never ends
+            messages: List[Message] = []
+            received_events = asyncio.Event()
+
+            async def receive() -> Message:
+                await asyncio.Event().wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message: Message) -> None:
+                messages.append(message)
+                if len(messages) == 3:
+                    received_events.set()
+
+            scope = {
+                'type': 'http',
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': '/v1/events',
+                'raw_path': b'/v1/events',
+                'root_path': '',
+                'query_string': b'',
+                'headers': [],
+                'server': ('test', 80)
+            }
+            task = asyncio.ensure_future(app(scope, receive, send))
+            try:
+                await asyncio.wait_for(received_events.wait(), timeout=5)
+            finally:
+                task.cancel()
+            return messages
+
+        start_message, *body_messages = asyncio.run(get_first_events())[:3]
+        self.assertEqual(200, start_message['status'])
+        headers = dict(start_message['headers'])
+        self.assertEqual(b'text/event-stream; charset=utf-8', headers[b'content-type'])
+        self.assertNotIn(b'etag', headers)
+        self.assertListEqual(
+            [b'id: 1\ndata: {}\n\n', b'id: 2\ndata: {}\n\n'],
+            [message['body'] for message in body_messages]
+        )
+        self.assertTrue(all(message['more_body'] for message in body_messages))
@@ -0,0 +1,146 @@
+import gzip
+import json
+import os
+import tempfile
+from typing import List
+from unittest import TestCase
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from examples.export import app, versionizer, versions
+from fastapi_versionizer.cli import main
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+
+def create_split_versionizer() -> Versionizer:
+    split_app = FastAPI(title='test')
+
+    @api_version(1)
+    @split_app.get('/items')
+    def get_items() -> List[str]:
+        return ['laptop']
+
+    @api_version(2)
+    @split_app.get('/items')
+    def get_items_v2() -> List[str]:
+        return ['laptop', 'phone']
+
+    return Versionizer(
+        app=split_app,
+        prefix_format='/v{major}',
+        semantic_version_format='{major}',
+        split_version_openapi=True
+    )
+
+
+class TestExportExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_export_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (2, 0)], versions)
+        self.assertListEqual(versions, versionizer.versionize())
+
+        # Exported in parallel first, as schemas rendered by the main process are kept for later exports
+        for jobs in ('2', '1'):
+            with tempfile.TemporaryDirectory() as output_dir:
+                render_version_openapi = Versionizer.render_version_openapi
+                with patch.object(
+                    Versionizer, 'render_version_openapi', autospec=True, side_effect=render_version_openapi
+                ) as render_mock:
+                    exit_code = main(['export', 'examples.export:versionizer', '--output', output_dir, '--jobs', jobs])
+                self.assertEqual(0, exit_code)
+
+                # Schemas rendered by workers aren't rendered again by the main process
+                self.assertEqual(0 if jobs == '2' else 3, render_mock.call_count)
+
+                with open(os.path.join(output_dir, 'manifest.json'), 'r') as manifest_file:
+                    manifest = json.load(manifest_file)
+                self.assertListEqual(
+                    [
+                        '/latest/docs',
+                        '/latest/docs/oauth2-redirect',
+                        '/latest/openapi.json',
+                        '/latest/redoc',
+                        '/openapi.json',
+                        '/v1/docs',
+                        '/v1/docs/oauth2-redirect',
+                        '/v1/openapi.json',
+                        '/v1/redoc',
+                        '/v2/docs',
+                        '/v2/docs/oauth2-redirect',
+                        '/v2/openapi.json',
+                        '/v2/redoc',
+                        '/versions'
+                    ],
+                    sorted(manifest)
+                )
+                self.assertDictEqual(
+                    {
+                        'file': 'v1/docs.html',
+                        'gzip_file': 'v1/docs.html.gz',
+                        'content_type': 'text/html; charset=utf-8',
+                        'etag': test_client.get('/v1/docs').headers['etag']
+                    },
+                    manifest['/v1/docs']
+                )
+
+                # Every artifact is exactly what the app serves
+                for path, entry in manifest.items():
+                    with open(os.path.join(output_dir, entry['file']), 'rb') as artifact_file:
+                        body = artifact_file.read()
+                    with open(os.path.join(output_dir, entry['gzip_file']), 'rb') as artifact_file:
+                        self.assertEqual(body, gzip.decompress(artifact_file.read()))
+                    response = test_client.get(path)
+                    self.assertEqual(response.content, body, path)
+                    self.assertEqual(response.headers['content-type'], entry['content_type'], path)
+
+                with open(os.path.join(output_dir, 'routes.json'), 'r') as routes_file:
+                    route_plan = json.load(routes_file)
+                self.assertListEqual(
+                    [('1', '/v1', False), ('2', '/v2', False), ('2', '/latest', True)],
+                    [
+                        (version_plan['version'], version_plan['version_prefix'], version_plan['latest'])
+                        for version_plan in route_plan['versions']
+                    ]
+                )
+                self.assertDictEqual(
+                    {
+                        'path': '/v2/items',
+                        'regex': '^/v2/items$',
+                        'name': 'get_items_v2',
+                        'kind': 'http',
+                        'methods': ['GET'],
+                        'deprecated': False,
+                        'include_in_schema': True
+                    },
+                    route_plan['versions'][1]['routes'][0]
+                )
+                self.assertIn('/versions', [route['path'] for route in route_plan['unversioned_routes']])
+
+    def test_export_split_openapi(self) -> None:
+        # Split schemas are generated together, so no worker is started for them
+        with tempfile.TemporaryDirectory() as output_dir:
+            with patch('fastapi_versionizer.cli.ProcessPoolExecutor', side_effect=AssertionError) as executor_mock:
+                exit_code = main([
+                    'export', 'tests.test_export:create_split_versionizer', '--output', output_dir, '--jobs', '2'
+                ])
+            self.assertEqual(0, exit_code)
+            self.assertEqual(0, executor_mock.call_count)
+
+            with open(os.path.join(output_dir, 'manifest.json'), 'r') as manifest_file:
+                manifest = json.load(manifest_file)
+            self.assertIn('/v1/openapi.json', manifest)
+            self.assertIn('/v2/openapi.json', manifest)
+
+    def test_export_invalid_target(self) -> None:
+        with tempfile.TemporaryDirectory() as output_dir:
+            for target in ('examples.missing:versionizer', 'examples.export:missing', 'examples.export:app', ':app'):
+                with self.assertRaises(SystemExit) as context:
+                    main(['export', target, '--output', output_dir])
+                self.assertEqual(2, context.exception.code, target)
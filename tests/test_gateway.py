@@ -0,0 +1,145 @@
+import json
+import os
+import re
+import tempfile
+from unittest import TestCase
+
+from fastapi.testclient import TestClient
+
+from examples.gateway import app, versionizer, versions
+from fastapi_versionizer.cli import main
+from fastapi_versionizer.gateway import render_envoy_route_config, render_nginx_locations
+
+
+class TestGatewayExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_gateway_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (2, 0), (3, 0)], versions)
+        self.assertEqual(200, test_client.get('/v1/items/1').status_code)
+        self.assertEqual(404, test_client.get('/v3/items/1').status_code)
+
+        route_plan = versionizer.get_route_plan()
+        self.assertTrue(route_plan['redirect_slashes'])
+        self.assertListEqual(
+            [
+                ('/v1/items', '^/v1/items$', 'http', ['GET']),
+                ('/v1/items/{item_id}', '^/v1/items/([^/]+)$', 'http', ['GET'])
+            ],
+            [
+                (route['path'], route['regex'], route['kind'], route['methods'])
+                for route in route_plan['versions'][0]['routes']
+            ]
+        )
+        self.assertDictEqual(
+            {
+                'path': '/v3/items/updates',
+                'regex': '^/v3/items/updates$',
+                'name': 'get_item_updates',
+                'kind': 'websocket',
+                'methods': None,
+                'deprecated': False,
+                'include_in_schema': False
+            },
+            route_plan['versions'][2]['routes'][1]
+        )
+
+        # Route regexes match exactly the paths the app serves
+        for version_plan in route_plan['versions']:
+            for route in version_plan['routes']:
+                path = route['path'].replace('{item_id}', '5')
+                self.assertRegex(path, route['regex'])
+                self.assertIsNone(re.match(route['regex'], path + '/extra'))
+
+        self.assertEqual(
+            '\n'.join([
+                'location = /v1/items {',
+                '    if ($request_method !~ ^(GET)$) { return 405; }',
+                '    proxy_pass http://legacy_pool;',
+                '}',
+                'location = /v1/items/ {',
+                '    proxy_pass http://legacy_pool;',
+                '}',
+                'location ~ "^/v1/items/([^/]+)/?$" {',
+                '    if ($request_method !~ ^(GET)$) { return 405; }',
+                '    proxy_pass http://legacy_pool;',
+                '}',
+                'location = /v2/items {',
+                '    if ($request_method !~ ^(GET|POST)$) { return 405; }',
+                '    proxy_pass http://app;',
+                '}',
+                'location = /v2/items/ {',
+                '    proxy_pass http://app;',
+                '}',
+                'location ~ "^/v2/items/([^/]+)/?$" {',
+                '    if ($request_method !~ ^(GET)$) { return 405; }',
+                '    proxy_pass http://app;',
+                '}',
+                'location = /v3/items {',
+                '    if ($request_method !~ ^(POST)$) { return 405; }',
+                '    proxy_pass http://app;',
+                '}',
+                'location = /v3/items/ {',
+                '    proxy_pass http://app;',
+                '}',
+                'location = /v3/items/updates {',
+                '    if ($request_method !~ ^(GET)$) { return 405; }',
+                '    proxy_http_version 1.1;',
+                '    proxy_set_header Upgrade $http_upgrade;',
+                '    proxy_set_header Connection $http_connection;',
+                '    proxy_pass http://app;',
+                '}',
+                'location = /versions {',
+                '    if ($request_method !~ ^(GET)$) { return 405; }',
+                '    proxy_pass http://app;',
+                '}',
+                'location = /versions/ {',
+                '    proxy_pass http://app;',
+                '}',
+                'location / {',
+                '    return 404;',
+                '}',
+                ''
+            ]),
+            render_nginx_locations(route_plan=route_plan, upstream='app', version_upstreams={'/v1': 'legacy_pool'})
+        )
+
+        envoy_config = render_envoy_route_config(route_plan=route_plan, cluster='app', version_clusters={'/v1': 'v1'})
+        envoy_routes = envoy_config['virtual_hosts'][0]['routes']
+        self.assertDictEqual(
+            {
+                'match': {
+                    'safe_regex': {'regex': '^/v2/items/([^/]+)/?$'},
+                    'headers': [{'name': ':method', 'string_match': {'safe_regex': {'regex': 'GET'}}}]
+                },
+                'route': {'cluster': 'app'}
+            },
+            envoy_routes[8]
+        )
+        self.assertDictEqual(
+            {'match': {'safe_regex': {'regex': '^/v2/items/([^/]+)/?$'}}, 'direct_response': {'status': 405}},
+            envoy_routes[9]
+        )
+        self.assertDictEqual(
+            {'cluster': 'app', 'upgrade_configs': [{'upgrade_type': 'websocket'}]},
+            envoy_routes[13]['route']
+        )
+        self.assertEqual('v1', envoy_routes[0]['route']['cluster'])
+        self.assertDictEqual({'match': {'prefix': '/'}, 'direct_response': {'status': 404}}, envoy_routes[-1])
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_path = os.path.join(output_dir, 'routes.json')
+            exit_code = main(['gateway', 'examples.gateway:versionizer', '--format', 'envoy', '--output', output_path,
+                              '--upstream', 'app', '--version-upstream', '/v1=v1'])
+            self.assertEqual(0, exit_code)
+            with open(output_path, 'r') as output_file:
+                self.assertDictEqual(envoy_config, json.load(output_file))
+
+        for version_upstream in ('v1', '/v1=', '=v1'):
+            with self.assertRaises(SystemExit) as context:
+                main(['gateway', 'examples.gateway:versionizer', '--version-upstream', version_upstream])
+            self.assertEqual(2, context.exception.code, version_upstream)
@@ -0,0 +1,51 @@
+from fastapi.testclient import TestClient
+
+from unittest import TestCase
+from examples.metrics import app, versions, metrics
+
+
+class TestMetricsExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_metrics_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (2, 0)], versions)
+
+        self.assertEqual('Item 1', test_client.get('/v1/items/1').json())
+        self.assertEqual('Item 2', test_client.get('/v1/items/2').json())
+        self.assertEqual('Item 1 (v2)', test_client.get('/v2/items/1').json())
+        self.assertEqual('Item 1 (v2)', test_client.get('/latest/items/1').json())
+        self.assertEqual(404, test_client.get('/v3/items/1').status_code)
+
+        # latest shares the series of the version it aliases
+        snapshot = {(series['version'], series['route'], series['method']): series for series in metrics.collect()}
+        self.assertSetEqual({('1', '/items/{item_id}', 'GET'), ('2', '/items/{item_id}', 'GET')}, set(snapshot))
+        v1_series = snapshot[('1', '/items/{item_id}', 'GET')]
+        self.assertEqual(2, v1_series['count'])
+        self.assertEqual(2, v1_series['buckets'][-1][1])
+        self.assertEqual([0.1, 1.0, float('inf')], [bound for bound, _ in v1_series['buckets']])
+        self.assertGreater(v1_series['sum'], 0)
+        self.assertEqual(2, snapshot[('2', '/items/{item_id}', 'GET')]['count'])
+
+        response = test_client.get('/metrics')
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.headers['content-type'].startswith('text/plain; version=0.0.4'))
+        lines = response.text.splitlines()
+        self.assertIn('# TYPE versionizer_requests_total counter', lines)
+        self.assertIn('versionizer_requests_total{version="1",route="/items/{item_id}",method="GET"} 2', lines)
+        self.assertIn('# TYPE versionizer_request_duration_seconds histogram', lines)
+        self.assertIn(
+            'versionizer_request_duration_seconds_bucket'
+            '{version="2",route="/items/{item_id}",method="GET",le="+Inf"} 2',
+            lines
+        )
+        self.assertIn(
+            'versionizer_request_duration_seconds_count{version="2",route="/items/{item_id}",method="GET"} 2',
+            lines
+        )
+
+        # The metrics route itself is not versioned
+        self.assertEqual(404, test_client.get('/v1/metrics').status_code)
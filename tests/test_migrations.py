@@ -0,0 +1,103 @@
+from typing import List
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from unittest import TestCase
+from examples.migrations import app, versions, UserV2
+from fastapi_versionizer.migrations import api_migration
+from fastapi_versionizer.versionizer import Versionizer, api_version
+
+
+class TestMigrationsExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_migrations_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (2, 0)], versions)
+
+        # v1 request bodies are validated against the v1 model and upgraded for the v2 handler
+        self.assertEqual(
+            422,
+            test_client.post('/v1/users', json={'id': 1, 'full_name': 'alex', 'age': 30}).status_code
+        )
+        self.assertDictEqual(
+            {'id': 1, 'name': 'alex', 'nickname': ''},
+            test_client.post('/v1/users', json={'id': 1, 'name': 'alex', 'nickname': 'al'}).json()
+        )
+        self.assertDictEqual(
+            {'id': 1, 'full_name': 'alex', 'age': 0},
+            test_client.get('/v2/users/1').json()
+        )
+        self.assertDictEqual(
+            {'id': 1, 'full_name': 'alex', 'age': 30},
+            test_client.post('/v2/users', json={'id': 1, 'full_name': 'alex', 'age': 30}).json()
+        )
+        self.assertDictEqual(
+            {'id': 2, 'full_name': 'zach', 'age': 40},
+            test_client.post('/latest/users', json={'id': 2, 'full_name': 'zach', 'age': 40}).json()
+        )
+
+        # v1 responses are down-converted from the v2 handlers
+        self.assertListEqual(
+            [
+                {'id': 1, 'name': 'alex', 'nickname': ''},
+                {'id': 2, 'name': 'zach', 'nickname': ''}
+            ],
+            test_client.get('/v1/users').json()
+        )
+        self.assertDictEqual(
+            {'id': 1, 'name': 'alex', 'nickname': ''},
+            test_client.get('/v1/users/1').json()
+        )
+
+        # Fields outside the response model are filtered out before down-converting
+        self.assertDictEqual(
+            {'id': 1, 'name': 'alex', 'nickname': ''},
+            test_client.get('/v1/users/1/record').json()
+        )
+        self.assertDictEqual(
+            {'id': 1, 'full_name': 'alex', 'age': 30},
+            test_client.get('/v2/users/1/record').json()
+        )
+
+        # v2
+        self.assertListEqual(
+            [
+                {'id': 1, 'full_name': 'alex', 'age': 30},
+                {'id': 2, 'full_name': 'zach', 'age': 40}
+            ],
+            test_client.get('/v2/users').json()
+        )
+        self.assertDictEqual(
+            {'id': 2, 'full_name': 'zach', 'age': 40},
+            test_client.get('/latest/users/2').json()
+        )
+
+        # docs show the old models for v1
+        v1_openapi = test_client.get('/v1/api_schema.json').json()
+        self.assertDictEqual(
+            {'$ref': '#/components/schemas/User'},
+            v1_openapi['paths']['/v1/users']['post']['requestBody']['content']['application/json']['schema']
+        )
+        v1_schemas = test_client.get('/v1/api_schema.json').json()['components']['schemas']
+        self.assertIn('User', v1_schemas)
+        self.assertNotIn('UserV2', v1_schemas)
+        v2_schemas = test_client.get('/v2/api_schema.json').json()['components']['schemas']
+        self.assertIn('UserV2', v2_schemas)
+        self.assertNotIn('User', v2_schemas)
+
+    def test_migrations_require_response_model(self) -> None:
+        invalid_app = FastAPI(title='test')
+
+        # Without the older model, the older version's docs would have no response schema
+        @api_version(2)
+        @api_migration(1, drop=['age'])
+        @invalid_app.get('/users')
+        def get_users() -> List[UserV2]:
+            return []
+
+        with self.assertRaises(ValueError):
+            Versionizer(app=invalid_app, prefix_format='/v{major}', semantic_version_format='{major}').versionize()
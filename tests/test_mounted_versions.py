@@ -0,0 +1,71 @@
+from fastapi.testclient import TestClient
+
+from unittest import TestCase
+from examples.mounted_versions import app, versionizer, versions
+from fastapi_versionizer.routing import VersionMount
+
+
+class TestMountedVersionsExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_mounted_versions_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (2, 0)], versions)
+
+        # Each version is a single route of the app
+        mounts = [route for route in app.routes if isinstance(route, VersionMount)]
+        self.assertListEqual(['/v1', '/v2', '/latest'], [mount.path for mount in mounts])
+        self.assertListEqual(
+            ['/v1/items', '/v1/items/{item_id}', '/v1/openapi.json', '/v1/docs', '/v1/docs/oauth2-redirect'],
+            [getattr(route, 'path') for route in mounts[0].app.router.routes]  # type: ignore[attr-defined]
+        )
+
+        self.assertListEqual([{'id': 1, 'name': 'laptop'}], test_client.get('/v1/items').json())
+        self.assertListEqual([{'id': 1, 'name': 'laptop', 'cost': 100}], test_client.get('/v2/items').json())
+        self.assertListEqual([{'id': 1, 'name': 'laptop', 'cost': 100}], test_client.get('/latest/items').json())
+        self.assertEqual(404, test_client.get('/v2/users').status_code)
+        self.assertEqual(404, test_client.get('/v3/items').status_code)
+        self.assertEqual(405, test_client.post('/v1/items').status_code)
+        self.assertEqual(422, test_client.get('/v1/items/abc').status_code)
+        self.assertEqual(404, test_client.get('/v1/items/', follow_redirects=False).status_code)
+        self.assertFalse(versionizer.get_route_plan()['redirect_slashes'])
+        self.assertEqual(200, test_client.get('/versions').status_code)
+
+        # The app's exception handlers are copied to each version
+        response = test_client.get('/v1/items/2')
+        self.assertEqual(404, response.status_code)
+        self.assertDictEqual({'detail': 'Item not found'}, response.json())
+
+        # Middleware added to a version only applies to it
+        self.assertEqual('Wed, 31 Dec 2025 23:59:59 GMT', test_client.get('/v1/items').headers['sunset'])
+        self.assertNotIn('sunset', test_client.get('/v2/items').headers)
+
+        # Each version caches its own schema
+        v1_app = versionizer.get_version_app('/v1')
+        assert v1_app is not None
+        v1_schema = test_client.get('/v1/openapi.json').json()
+        self.assertListEqual(['/v1/items', '/v1/items/{item_id}'], list(v1_schema['paths']))
+        self.assertIs(v1_app.openapi(), v1_app.openapi())
+        self.assertDictEqual(v1_app.openapi(), v1_schema)
+        self.assertIsNone(versionizer.get_version_app('/v3'))
+
+        # The root schema still lists every version's routes
+        self.assertListEqual(
+            [
+                '/v1/items', '/v1/items/{item_id}',
+                '/v2/items', '/v2/items/{item_id}',
+                '/latest/items', '/latest/items/{item_id}',
+                '/versions'
+            ],
+            list(test_client.get('/openapi.json').json()['paths'])
+        )
+        self.assertIn('swagger-ui', test_client.get('/v1/docs').text)
+
+        # Mounts are not listed as unversioned routes
+        self.assertListEqual(
+            ['/openapi.json', '/docs', '/docs/oauth2-redirect', '/versions'],
+            [route['path'] for route in versionizer.get_route_plan()['unversioned_routes']]
+        )
@@ -0,0 +1,107 @@
+import asyncio
+import os
+import tempfile
+from enum import Enum
+from unittest import TestCase
+from unittest.mock import patch
+
+import fastapi.openapi.utils
+from fastapi.testclient import TestClient
+import pydantic
+
+import examples.openapi_cache
+from examples.openapi_cache import app, create_app, versions
+from fastapi_versionizer.openapi import OpenAPIFileCache
+
+
+class TestOpenAPICacheExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_openapi_cache_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (2, 0)], versions)
+        self.assertEqual('test - v1', test_client.get('/v1/openapi.json').json()['info']['title'])
+
+        with tempfile.TemporaryDirectory() as openapi_cache_dir:
+            cold_app, _ = create_app(openapi_cache_dir=openapi_cache_dir)
+            cold_client = TestClient(cold_app)
+            self.assertListEqual([], os.listdir(openapi_cache_dir))
+
+            # Schemas are written to the cache in a worker thread, outside the event loop
+            put = OpenAPIFileCache.put
+            put_in_event_loop = []
+
+            def record_put(openapi_cache: OpenAPIFileCache, fingerprint: str, body: bytes) -> None:
+                try:
+                    asyncio.get_running_loop()
+                    put_in_event_loop.append(True)
+                except RuntimeError:
+                    put_in_event_loop.append(False)
+                put(openapi_cache, fingerprint, body)
+
+            with patch.object(OpenAPIFileCache, 'put', autospec=True, side_effect=record_put):
+                v1_response = cold_client.get('/v1/openapi.json')
+                v2_response = cold_client.get('/v2/openapi.json')
+            self.assertListEqual([False, False], put_in_event_loop)
+            self.assertEqual('application/json', v1_response.headers['content-type'])
+            self.assertListEqual(['/v1/items'], list(v1_response.json()['paths']))
+            self.assertIn('ItemV2', v2_response.json()['components']['schemas'])
+
+            # Stored as files named by the fingerprint of each version
+            filenames = sorted(os.listdir(openapi_cache_dir))
+            self.assertEqual(2, len(filenames))
+            for filename in filenames:
+                self.assertRegex(filename, r'^[0-9a-f]{40}\.json$')
+            with open(os.path.join(openapi_cache_dir, filenames[0]), 'rb') as schema_file:
+                self.assertIn(schema_file.read(), (v1_response.content, v2_response.content))
+
+            # After a restart, schemas are loaded rather than generated (and models are fingerprinted without
+            # generating their JSON schema)
+            model_schema_method = 'model_json_schema' if hasattr(pydantic.BaseModel, 'model_json_schema') else 'schema'
+            with patch.object(fastapi.openapi.utils, 'get_openapi', side_effect=AssertionError), \
+                    patch.object(pydantic.BaseModel, model_schema_method, side_effect=AssertionError):
+                warm_app, _ = create_app(openapi_cache_dir=openapi_cache_dir)
+                warm_client = TestClient(warm_app)
+                self.assertEqual(v1_response.content, warm_client.get('/v1/openapi.json').content)
+                self.assertEqual(v2_response.content, warm_client.get('/v2/openapi.json').content)
+            self.assertListEqual(filenames, sorted(os.listdir(openapi_cache_dir)))
+
+            # Only the version whose model changed gets a new fingerprint, and is regenerated
+            changed_model = pydantic.create_model('ItemV2', id=(int, ...), name=(str, ...), currency=(str, 'USD'))
+            get_openapi = fastapi.openapi.utils.get_openapi
+            with patch.object(examples.openapi_cache, 'ItemV2', changed_model):
+                with patch.object(fastapi.openapi.utils, 'get_openapi', wraps=get_openapi) as get_openapi_mock:
+                    changed_app, _ = create_app(openapi_cache_dir=openapi_cache_dir)
+                    changed_client = TestClient(changed_app)
+                    self.assertEqual(v1_response.content, changed_client.get('/v1/openapi.json').content)
+                    self.assertEqual(0, get_openapi_mock.call_count)
+                    v2_schema = changed_client.get('/v2/openapi.json').json()
+                    self.assertIn('currency', v2_schema['components']['schemas']['ItemV2']['properties'])
+                    self.assertEqual(1, get_openapi_mock.call_count)
+            self.assertEqual(3, len(os.listdir(openapi_cache_dir)))
+
+            # Enum members aren't part of the Enum's repr, but are part of the fingerprint
+            changed_category = Enum(  # type: ignore[misc]
+                'Category',
+                {'HARDWARE': 'hardware', 'SOFTWARE': 'software', 'SERVICE': 'service'},
+                module='examples.openapi_cache'
+            )
+            changed_model = pydantic.create_model(
+                'ItemV2',
+                __module__='examples.openapi_cache',
+                id=(int, ...),
+                name=(str, ...),
+                cost=(int, ...),
+                category=(changed_category, changed_category.HARDWARE)
+            )
+            with patch.object(examples.openapi_cache, 'ItemV2', changed_model):
+                changed_app, _ = create_app(openapi_cache_dir=openapi_cache_dir)
+                v2_schema = TestClient(changed_app).get('/v2/openapi.json').json()
+            self.assertListEqual(
+                ['hardware', 'software', 'service'],
+                v2_schema['components']['schemas']['Category']['enum']
+            )
+            self.assertEqual(4, len(os.listdir(openapi_cache_dir)))
@@ -0,0 +1,26 @@
+from fastapi.testclient import TestClient
+
+from unittest import TestCase
+from examples.postponed_annotations import app, versions
+
+
+class TestPostponedAnnotationsExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_postponed_annotations_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (2, 0)], versions)
+
+        # Wrapped endpoints (run in a thread pool, or migrated) still read their body from the model annotation
+        item = {'id': 1, 'name': 'laptop'}
+        self.assertDictEqual(item, test_client.post('/v2/items', json=item).json())
+        self.assertEqual(422, test_client.post('/v2/items', json={'id': 1}).status_code)
+        self.assertNotIn('parameters', app.openapi()['paths']['/v2/items']['post'])
+        self.assertDictEqual(item, test_client.post('/v1/items', json=item).json())
+
+        self.assertDictEqual(item, test_client.put('/v2/items/1', json=item).json())
+        self.assertDictEqual({**item, 'legacy': True}, test_client.put('/v1/items/1', json=item).json())
+        self.assertEqual(422, test_client.put('/v1/items/1', json={'id': 1}).status_code)
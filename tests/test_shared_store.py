@@ -0,0 +1,74 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from typing import Any, cast
+import fastapi.openapi.utils
+from fastapi.testclient import TestClient
+from starlette.responses import Response
+
+from examples.shared_store import app, create_app, versions
+
+
+class TestSharedStoreExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_shared_store_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (2, 0)], versions)
+        self.assertEqual('test - v1', test_client.get('/v1/openapi.json').json()['info']['title'])
+
+        with tempfile.TemporaryDirectory() as shared_store_dir:
+            first_app, _ = create_app(shared_store_dir=shared_store_dir)
+            first_client = TestClient(first_app)
+
+            # Written once, as a single file named by a fingerprint of its content
+            filenames = os.listdir(shared_store_dir)
+            self.assertEqual(1, len(filenames))
+            self.assertRegex(filenames[0], r'^[0-9a-f]{40}\.store$')
+
+            v1_response = first_client.get('/v1/openapi.json')
+            v2_response = first_client.get('/v2/openapi.json')
+            self.assertEqual('application/json', v1_response.headers['content-type'])
+            self.assertListEqual(['/v1/items'], list(v1_response.json()['paths']))
+            self.assertIn('ItemV2', v2_response.json()['components']['schemas'])
+
+            docs_response = first_client.get('/v1/docs')
+            self.assertEqual('text/html; charset=utf-8', docs_response.headers['content-type'])
+            self.assertIn('/v1/openapi.json', docs_response.text)
+            self.assertEqual(
+                304,
+                first_client.get('/v1/docs', headers={'If-None-Match': docs_response.headers['etag']}).status_code
+            )
+            versions_response = first_client.get('/versions')
+            self.assertEqual(['1', '2'], [version['version'] for version in versions_response.json()['versions']])
+
+            with open(os.path.join(shared_store_dir, filenames[0]), 'rb') as store_file:
+                store = store_file.read()
+            self.assertIn(v1_response.content, store)
+            self.assertIn(docs_response.content, store)
+
+            # Other workers map the existing file, without generating anything
+            with patch.object(fastapi.openapi.utils, 'get_openapi', side_effect=AssertionError):
+                second_app, _ = create_app(shared_store_dir=shared_store_dir)
+                second_client = TestClient(second_app)
+                self.assertEqual(v1_response.content, second_client.get('/v1/openapi.json').content)
+                self.assertEqual(v2_response.content, second_client.get('/v2/openapi.json').content)
+                self.assertEqual(docs_response.content, second_client.get('/v1/docs').content)
+                self.assertEqual(versions_response.content, second_client.get('/versions').content)
+            self.assertListEqual(filenames, os.listdir(shared_store_dir))
+
+            # Older Starlette versions only render bytes or str, rather than views of the mapped file
+            def render(response: Response, content: Any) -> bytes:
+                if content is None:
+                    return b''
+                if isinstance(content, bytes):
+                    return content
+                return cast(bytes, content.encode(response.charset))
+
+            with patch.object(Response, 'render', render):
+                self.assertEqual(v1_response.content, second_client.get('/v1/openapi.json').content)
@@ -51,6 +51,14 @@ class TestSimpleExample(TestCase):
             },
             test_client.get('/versions').json()
         )
+        versions_response = test_client.get('/versions')
+        self.assertEqual('application/json', versions_response.headers['content-type'])
+        self.assertEqual('no-cache', versions_response.headers['cache-control'])
+        not_modified_response = test_client.get(
+            '/versions', headers={'If-None-Match': versions_response.headers['etag']})
+        self.assertEqual(304, not_modified_response.status_code)
+        self.assertEqual(b'', not_modified_response.content)
+        self.assertEqual(405, test_client.post('/versions').status_code)
 
         # v1
         self.assertDictEqual(
@@ -137,6 +145,19 @@ class TestSimpleExample(TestCase):
         self.assertEqual(200, test_client.get('/v1/swagger').status_code)
         self.assertEqual(200, test_client.get('/v2/swagger').status_code)
         self.assertEqual(200, test_client.get('/latest/swagger').status_code)
+
+        # version docs pages are pre-rendered, with ETags
+        docs_response = test_client.get('/v1/swagger')
+        self.assertEqual('text/html; charset=utf-8', docs_response.headers['content-type'])
+        self.assertEqual('public, max-age=3600', docs_response.headers['cache-control'])
+        self.assertIn("url: '/v1/api_schema.json'", docs_response.text)
+        self.assertEqual(docs_response.content, test_client.get('/v1/swagger').content)
+        not_modified_response = test_client.get(
+            '/v1/swagger', headers={'If-None-Match': docs_response.headers['etag']})
+        self.assertEqual(304, not_modified_response.status_code)
+        self.assertEqual(b'', not_modified_response.content)
+        self.assertNotEqual(docs_response.headers['etag'], test_client.get('/v2/swagger').headers['etag'])
+        self.assertEqual(405, test_client.post('/v1/swagger').status_code)
         expected_response: Dict[str, Any] = {
             'openapi': '3.1.0',
             'info': {
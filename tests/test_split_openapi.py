@@ -0,0 +1,68 @@
+from fastapi.testclient import TestClient
+
+from unittest import TestCase
+from examples.split_openapi import app, versions
+
+
+class TestSplitOpenAPIExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_split_openapi_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (2, 0)], versions)
+
+        v1_schema = test_client.get('/v1/openapi.json').json()
+        v2_schema = test_client.get('/v2/openapi.json').json()
+        self.assertEqual('test - v1', v1_schema['info']['title'])
+        self.assertListEqual(['/v1/items', '/v1/orders', '/v1/users'], list(v1_schema['paths']))
+
+        # Shared models are referenced by URL
+        item_ref = v1_schema['paths']['/v1/items']['get']['responses']['200']['content']['application/json'][
+            'schema']['items']['$ref']
+        self.assertRegex(item_ref, r'^/openapi\.components\.[0-9a-f]{16}\.json#/components/schemas/Item$')
+        components_url = item_ref.split('#')[0]
+        self.assertEqual(
+            item_ref,
+            v2_schema['paths']['/v2/items']['get']['responses']['200']['content']['application/json'][
+                'schema']['items']['$ref']
+        )
+
+        # Models that differ between versions stay in each version's schema
+        self.assertEqual(
+            '#/components/schemas/User',
+            v1_schema['paths']['/v1/users']['get']['responses']['200']['content']['application/json'][
+                'schema']['items']['$ref']
+        )
+        self.assertListEqual(['User'], list(v1_schema['components']['schemas']))
+
+        # Security schemes are referenced by name rather than "$ref", so each version keeps its own
+        for version_prefix, schema in (('/v1', v1_schema), ('/v2', v2_schema)):
+            self.assertListEqual(
+                [{'OAuth2PasswordBearer': []}],
+                schema['paths'][f'{version_prefix}/orders']['get']['security']
+            )
+            self.assertDictEqual(
+                {'type': 'oauth2', 'flows': {'password': {'scopes': {}, 'tokenUrl': '/token'}}},
+                schema['components']['securitySchemes']['OAuth2PasswordBearer']
+            )
+        self.assertListEqual(['id', 'name'], list(v1_schema['components']['schemas']['User']['properties']))
+        self.assertListEqual(['id', 'name', 'age'], list(v2_schema['components']['schemas']['User']['properties']))
+
+        response = test_client.get(components_url)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('public, max-age=31536000, immutable', response.headers['cache-control'])
+        components_schema = response.json()
+        self.assertDictEqual({'title': 'test - Components', 'version': '0.1.0'}, components_schema['info'])
+        self.assertDictEqual({}, components_schema['paths'])
+        self.assertListEqual(['schemas'], list(components_schema['components']))
+        self.assertListEqual(['Item', 'Order'], list(components_schema['components']['schemas']))
+        self.assertEqual(
+            '#/components/schemas/Item',
+            components_schema['components']['schemas']['Order']['properties']['items']['items']['$ref']
+        )
+
+        self.assertEqual(404, test_client.get('/openapi.components.0000000000000000.json').status_code)
+        self.assertEqual(404, test_client.get('/openapi.json').status_code)
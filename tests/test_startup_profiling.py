@@ -0,0 +1,86 @@
+import tracemalloc
+from typing import Any
+from fastapi import FastAPI
+
+from unittest import TestCase
+from examples.startup_profiling import versionizer, versions
+from fastapi_versionizer.versionizer import Versionizer
+
+
+class TestStartupProfilingExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_startup_profiling_example(self) -> None:
+        self.assertListEqual([(1, 0), (2, 0)], versions)
+
+        report = versionizer.startup_report
+        assert report is not None
+        self.assertGreater(report['total_seconds'], 0.05)
+        self.assertIsInstance(report['total_allocated_bytes'], int)
+
+        # The expensive callback makes v2 the slowest version
+        slowest_versions = report['slowest_versions']
+        self.assertSetEqual({'/v1', '/v2', '/latest'}, {entry['version_prefix'] for entry in slowest_versions})
+        self.assertEqual('/v2', slowest_versions[0]['version_prefix'])
+        self.assertEqual('2', slowest_versions[0]['version'])
+        self.assertGreater(slowest_versions[0]['callback_seconds'], 0.05)
+        # Including docs routes
+        self.assertEqual(5, slowest_versions[0]['num_routes'])
+        for entry in slowest_versions:
+            self.assertGreater(entry['allocated_bytes'], 0)
+
+        routes = {(entry['version_prefix'], entry['path'], entry['methods']) for entry in report['slowest_routes']}
+        self.assertSetEqual(
+            {
+                ('/v1', '/items', 'GET'),
+                ('/v2', '/items', 'GET'),
+                ('/v2', '/items/{item_id}', 'GET'),
+                ('/latest', '/items', 'GET'),
+                ('/latest', '/items/{item_id}', 'GET')
+            },
+            routes
+        )
+        seconds = [entry['seconds'] for entry in report['slowest_routes']]
+        self.assertListEqual(sorted(seconds, reverse=True), seconds)
+
+        # Tracing is only started for profiling
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_startup_profiling_logs(self) -> None:
+        app = FastAPI()
+
+        @app.get('/status')
+        def get_status() -> str:
+            return 'Ok'
+
+        with self.assertLogs('fastapi_versionizer.versionizer', level='INFO') as logs:
+            Versionizer(app=app, profile_startup=True).versionize()
+
+        self.assertRegex(logs.output[0], r'Versioned app in \d+\.\d{3}s')
+        self.assertRegex(logs.output[1], r'Version 1\.0 \(/v1_0\)')
+        self.assertRegex(logs.output[2], r'Route GET /v1_0/status')
+
+    def test_startup_profiling_disabled(self) -> None:
+        app = FastAPI()
+        versionizer = Versionizer(app=app)
+        versionizer.versionize()
+        self.assertIsNone(versionizer.startup_report)
+
+    def test_startup_profiling_stops_on_error(self) -> None:
+        app = FastAPI()
+
+        @app.get('/status')
+        def get_status() -> str:
+            return 'Ok'
+
+        def fail(*args: Any) -> None:
+            raise ValueError('Invalid router')
+
+        versionizer = Versionizer(app=app, profile_startup=True, callback=fail)
+        with self.assertRaises(ValueError):
+            versionizer.versionize()
+
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertIsNone(versionizer.startup_report)
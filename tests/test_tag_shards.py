@@ -0,0 +1,88 @@
+from fastapi.testclient import TestClient
+
+from unittest import TestCase
+from examples.tag_shards import app, versions
+
+
+class TestTagShardsExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_tag_shards_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (2, 0)], versions)
+
+        # Index, with tags that have metadata listed first
+        self.assertDictEqual(
+            {
+                'shards': [
+                    {
+                        'name': 'Users',
+                        'description': 'Manage users',
+                        'url': '/v2/openapi/tags/Users.json',
+                        'operations': 1
+                    },
+                    {
+                        'name': 'Items',
+                        'description': 'Manage items',
+                        'url': '/v2/openapi/tags/Items.json',
+                        'operations': 2
+                    },
+                    {
+                        'name': 'default',
+                        'url': '/v2/openapi/tags/default.json',
+                        'operations': 1
+                    },
+                    {
+                        'name': 'Admin/Users',
+                        'url': '/v2/openapi/tags/Admin%2FUsers.json',
+                        'operations': 1
+                    }
+                ]
+            },
+            test_client.get('/v2/openapi/tags.json').json()
+        )
+        self.assertListEqual(
+            ['Items', 'default'],
+            [shard['name'] for shard in test_client.get('/v1/openapi/tags.json').json()['shards']]
+        )
+
+        # Each shard only includes its tag's paths and models
+        shard = test_client.get('/v2/openapi/tags/Users.json').json()
+        self.assertDictEqual({'title': 'test - v2', 'version': 'v2'}, shard['info'])
+        self.assertListEqual(['/v2/users'], list(shard['paths']))
+        self.assertListEqual(['User'], list(shard['components']['schemas']))
+        self.assertListEqual([{'name': 'Users', 'description': 'Manage users'}], shard['tags'])
+
+        shard = test_client.get('/v2/openapi/tags/Items.json').json()
+        self.assertListEqual(['/v2/items'], list(shard['paths']))
+        self.assertListEqual(['get', 'post'], list(shard['paths']['/v2/items']))
+        self.assertListEqual(['HTTPValidationError', 'Item', 'ValidationError'], list(shard['components']['schemas']))
+
+        shard = test_client.get('/v2/openapi/tags/default.json').json()
+        self.assertListEqual(['/v2/status'], list(shard['paths']))
+        self.assertNotIn('tags', shard)
+
+        # Tags containing slashes are served at their quoted URL
+        shard = test_client.get('/v2/openapi/tags/Admin%2FUsers.json').json()
+        self.assertListEqual(['/v2/admin/users/{user_id}'], list(shard['paths']))
+
+        self.assertEqual(404, test_client.get('/v1/openapi/tags/Users.json').status_code)
+        self.assertEqual(404, test_client.get('/v2/openapi/tags/Orders.json').status_code)
+
+        # Shards are cached independently
+        response = test_client.get('/v2/openapi/tags/Users.json')
+        self.assertEqual('no-cache', response.headers['cache-control'])
+        etag = response.headers['etag']
+        response = test_client.get('/v2/openapi/tags/Users.json', headers={'If-None-Match': etag})
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(b'', response.content)
+        self.assertNotEqual(etag, test_client.get('/v2/openapi/tags/Items.json').headers['etag'])
+
+        # The full schemas are still served
+        self.assertListEqual(
+            ['/v2/admin/users/{user_id}', '/v2/items', '/v2/status', '/v2/users'],
+            sorted(test_client.get('/v2/openapi.json').json()['paths'])
+        )
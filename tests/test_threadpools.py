@@ -0,0 +1,82 @@
+import asyncio
+import httpx
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from unittest import TestCase
+from examples.threadpools import app, versions, legacy_threadpool, current_threadpool, get_item
+from fastapi_versionizer.threadpools import VersionThreadPool
+
+
+class TestThreadpoolsExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_threadpools_example(self) -> None:
+        self.assertListEqual([(1, 0), (2, 0), (3, 0)], versions)
+
+        # Versions sharing a pool share each wrapped endpoint
+        endpoints = {
+            route.path: route.endpoint for route in app.routes
+            if isinstance(route, APIRoute) and route.path.endswith('/items/{item_id}')
+        }
+        self.assertIs(endpoints['/v1/items/{item_id}'], endpoints['/v2/items/{item_id}'])
+        self.assertIs(get_item, getattr(endpoints['/v1/items/{item_id}'], '__wrapped__'))
+        self.assertIsNot(endpoints['/v1/items/{item_id}'], endpoints['/v3/items/{item_id}'])
+
+        async def wait_for(threadpool: VersionThreadPool, borrowed_tokens: int, tasks_waiting: int) -> None:
+            while True:
+                snapshot = threadpool.collect()
+                if (snapshot['borrowed_tokens'], snapshot['tasks_waiting']) == (borrowed_tokens, tasks_waiting):
+                    return
+                await asyncio.sleep(0.001)
+
+        async def saturate_legacy() -> None:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+                running = asyncio.ensure_future(client.get('/v1/reports'))
+                await wait_for(legacy_threadpool, borrowed_tokens=1, tasks_waiting=0)
+                waiting = asyncio.ensure_future(client.get('/v2/reports'))
+                await wait_for(legacy_threadpool, borrowed_tokens=1, tasks_waiting=1)
+
+                # The current version has its own threads
+                self.assertEqual('Item 1 (v3)', (await client.get('/latest/items/1')).json())
+                self.assertEqual(1, legacy_threadpool.collect()['tasks_waiting'])
+                self.assertEqual('Report', (await client.get('/v3/reports')).json())
+
+                responses = await asyncio.gather(running, waiting)
+                self.assertListEqual(['Report', 'Report'], [response.json() for response in responses])
+
+        asyncio.run(saturate_legacy())
+        self.assertDictEqual({
+            'name': 'legacy',
+            'total_tokens': 1,
+            'borrowed_tokens': 0,
+            'tasks_waiting': 0,
+            'calls': 2,
+            'saturated_calls': 1
+        }, legacy_threadpool.collect())
+        self.assertDictEqual({
+            'name': 'current',
+            'total_tokens': 5,
+            'borrowed_tokens': 0,
+            'tasks_waiting': 0,
+            'calls': 2,
+            'saturated_calls': 0
+        }, current_threadpool.collect())
+
+        test_client = TestClient(app)
+        self.assertEqual('Item 1', test_client.get('/v2/items/1').json())
+        self.assertEqual(422, test_client.get('/v2/items/abc').status_code)
+
+        lines = test_client.get('/metrics').text.splitlines()
+        self.assertIn('# TYPE versionizer_threadpool_borrowed_tokens gauge', lines)
+        self.assertIn('versionizer_threadpool_tokens{pool="legacy",versions="1,2"} 1', lines)
+        self.assertIn('versionizer_threadpool_tokens{pool="current",versions="3"} 5', lines)
+        self.assertIn('versionizer_threadpool_calls_total{pool="legacy",versions="1,2"} 3', lines)
+        self.assertIn('versionizer_threadpool_saturated_calls_total{pool="legacy",versions="1,2"} 1', lines)
+        self.assertIn('versionizer_threadpool_waiting_tasks{pool="current",versions="3"} 0', lines)
+
+        with self.assertRaises(ValueError):
+            VersionThreadPool(name='empty', total_tokens=0)
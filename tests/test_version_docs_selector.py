@@ -0,0 +1,62 @@
+from fastapi.testclient import TestClient
+
+from unittest import TestCase
+from examples.version_docs_selector import app, versions
+
+
+class TestVersionDocsSelectorExample(TestCase):
+
+    def setUp(self) -> None:
+        self.maxDiff = None
+
+    def test_version_docs_selector_example(self) -> None:
+        test_client = TestClient(app)
+
+        self.assertListEqual([(1, 0), (2, 0)], versions)
+
+        # Per-version docs routes are not added at all
+        paths = [getattr(route, 'path') for route in app.routes]
+        for version_prefix in ('/v1', '/v2', '/latest'):
+            self.assertNotIn(f'{version_prefix}/docs', paths)
+            self.assertNotIn(f'{version_prefix}/redoc', paths)
+            self.assertNotIn(f'{version_prefix}/docs/oauth2-redirect', paths)
+            self.assertIn(f'{version_prefix}/openapi.json', paths)
+            self.assertEqual(404, test_client.get(f'{version_prefix}/docs').status_code)
+        self.assertEqual(404, test_client.get('/redoc').status_code)
+        self.assertListEqual(
+            [
+                '/openapi.json', '/v1/items', '/v1/openapi.json', '/v2/items', '/v2/openapi.json',
+                '/latest/items', '/latest/openapi.json', '/docs/oauth2-redirect', '/docs', '/versions'
+            ],
+            paths
+        )
+
+        # Single docs page, with a selector between versions
+        response = test_client.get('/docs')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('text/html; charset=utf-8', response.headers['content-type'])
+        self.assertIn('"layout": "StandaloneLayout"', response.text)
+        self.assertIn(
+            '"urls": [{"url": "/v1/openapi.json", "name": "v1"}, {"url": "/v2/openapi.json", "name": "v2"}]',
+            response.text
+        )
+        self.assertIn('"urls.primaryName": "v2"', response.text)
+        self.assertIn('swagger-ui-standalone-preset.js', response.text)
+        self.assertIn("oauth2RedirectUrl: window.location.origin + '/docs/oauth2-redirect'", response.text)
+        self.assertEqual(
+            304, test_client.get('/docs', headers={'If-None-Match': response.headers['etag']}).status_code)
+        self.assertEqual(200, test_client.get('/docs/oauth2-redirect').status_code)
+
+        # Each version's openapi route is still served
+        self.assertEqual('test - v1', test_client.get('/v1/openapi.json').json()['info']['title'])
+        self.assertEqual('test - v2', test_client.get('/v2/openapi.json').json()['info']['title'])
+
+        self.assertDictEqual(
+            {
+                'versions': [
+                    {'version': '1', 'openapi_url': '/v1/openapi.json'},
+                    {'version': '2', 'openapi_url': '/v2/openapi.json'}
+                ]
+            },
+            test_client.get('/versions').json()
+        )